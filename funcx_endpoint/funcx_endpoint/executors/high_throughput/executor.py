@@ -38,6 +38,10 @@ from funcx_endpoint.strategies.simple import SimpleStrategy
 
 fx_serializer = FuncXSerializer()
 
+# Tasks submitted directly to this executor only travel over the internal ZMQ
+# pipes, so may use the (smaller, faster) binary serialization methods
+fx_binary_serializer = FuncXSerializer(binary=True)
+
 
 # TODO: YADU There's a bug here which causes some of the log messages to write out to
 # stderr
@@ -691,26 +695,36 @@ class HighThroughputExecutor(RepresentationMixin):
     def submit(
         self, func, *args, container_id: str = "RAW", task_id: str = None, **kwargs
     ):
-        """Submits the function and it's params for execution."""
+        """Submits the function and it's params for execution.
+
+        Large buffers among the arguments (bytes, bytearrays, numpy arrays, ...)
+        are not copied into the task message, but are sent as separate zmq
+        frames; they must not be modified until the task has completed.
+        """
         self._task_counter += 1
         if task_id is None:
             task_id = self._task_counter
         task_id = str(task_id)
 
-        fn_code = fx_serializer.serialize(func)
-        ser_code = fx_serializer.pack_buffers([fn_code])
-        ser_params = fx_serializer.pack_buffers(
-            [fx_serializer.serialize(args), fx_serializer.serialize(kwargs)]
+        # the function may fall back to a text method, while the arguments are
+        # binary; pack_buffers() frames such a mix as bytes
+        buffers: list = []
+        task_buffer = fx_binary_serializer.pack_buffers(
+            [
+                fx_binary_serializer.serialize(func),
+                fx_binary_serializer.serialize(args, buffers=buffers),
+                fx_binary_serializer.serialize(kwargs, buffers=buffers),
+            ]
         )
-        payload = Task(task_id, container_id, ser_code + ser_params)
+        payload = Task(task_id, container_id, task_buffer, buffers=buffers)
 
-        self.submit_raw(payload.pack())
+        self.submit_raw(payload.pack(), buffers=payload.buffers)
         self.tasks[task_id] = HTEXFuture(self)
         self.tasks[task_id].task_id = task_id
 
         return self.tasks[task_id]
 
-    def submit_raw(self, packed_task):
+    def submit_raw(self, packed_task, buffers=()):
         """Submits work to the the outgoing_q.
 
         The outgoing_q is an external process listens on this
@@ -722,6 +736,8 @@ class HighThroughputExecutor(RepresentationMixin):
         ----------
         Packed Task (messages.Task) - A packed Task object which contains task_id,
         container_id, and serialized fn, args, kwargs packages.
+        buffers - The out-of-band buffers of the task, if any, sent (uncopied)
+        alongside the packed task.
 
         Returns:
               Submit status
@@ -731,7 +747,7 @@ class HighThroughputExecutor(RepresentationMixin):
             raise self._executor_exception
 
         # Submit task to queue
-        return self.outgoing_q.put(packed_task)
+        return self.outgoing_q.put(packed_task, buffers=buffers)
 
     def _get_block_and_job_ids(self):
         # Not using self.blocks.keys() and self.blocks.values() simultaneously
@@ -242,6 +242,8 @@ class Manager:
         self.worker_procs: dict[str, subprocess.Popen] = {}
 
         self.task_status_deltas: dict[str, list[TaskTransition]] = defaultdict(list)
+        # each worker's latest (cumulative) function cache counters
+        self.worker_function_cache: dict[bytes, dict[str, int]] = {}
 
         self._kill_event = threading.Event()
         self._result_pusher_thread = threading.Thread(
@@ -349,8 +351,10 @@ class Manager:
                 #       task_revc_counter
                 #   )
                 poll_timer = 0
-                _, pkl_msg = self.task_incoming.recv_multipart()
-                message = dill.loads(pkl_msg)
+                # frames past the pickled message are the out-of-band buffers of
+                # the tasks, in order; receive them without copying
+                _, pkl_msg, *buffers = self.task_incoming.recv_multipart(copy=False)
+                message = dill.loads(pkl_msg.bytes)
                 last_interchange_contact = time.time()
 
                 if message == "STOP":
@@ -428,10 +432,14 @@ class Manager:
                     log.debug("Got heartbeat from interchange")
 
                 else:
-                    tasks = [
-                        (rt["local_container"], Message.unpack(rt["raw_buffer"]))
-                        for rt in message
-                    ]
+                    tasks = []
+                    buffer_iter = iter(buffers)
+                    for rt in message:
+                        task = Message.unpack(rt["raw_buffer"])
+                        task.buffers = [
+                            next(buffer_iter) for _ in range(rt.get("buffer_count", 0))
+                        ]
+                        tasks.append((rt["local_container"], task))
 
                     task_recv_counter += len(tasks)
                     log.debug(
@@ -568,7 +576,7 @@ class Manager:
 
     def poll_funcx_task_socket(self, test=False):
         try:
-            w_id, m_type, message = self.funcx_task_socket.recv_multipart()
+            w_id, m_type, message, *extra = self.funcx_task_socket.recv_multipart()
             if m_type == b"REGISTER":
                 reg_info = dill.loads(message)
                 log.debug(f"Registration received from worker:{w_id} {reg_info}")
@@ -579,6 +587,8 @@ class Manager:
                 with self.task_finalization_lock:
                     log.debug(f"Result received from worker: {w_id}")
                     task_id = dill.loads(message)["task_id"]
+                    if extra:
+                        self.worker_function_cache[w_id] = json.loads(extra[0])
                     try:
                         self.remove_task(task_id)
                     except KeyError:
@@ -636,8 +646,9 @@ class Manager:
             dill.dumps(task.task_id),
             dill.dumps(task.container_id),
             task.pack(),
+            *task.buffers,
         ]
-        self.funcx_task_socket.send_multipart(to_send)
+        self.funcx_task_socket.send_multipart(to_send, copy=not task.buffers)
         self.worker_map.update_worker_idle(task_type)
         if task.task_id != "KILL":
             log.debug(f"Set task {task.task_id} to RUNNING")
@@ -660,12 +671,21 @@ class Manager:
             msg = ManagerStatusReport(
                 self.task_status_deltas,
                 self.container_switch_count,
+                self.function_cache_stats(),
             )
             log.info(f"Sending status report to interchange: {msg.task_statuses}")
             self.pending_result_queue.put(msg)
             log.info("Clearing task deltas")
             self.task_status_deltas.clear()
 
+    def function_cache_stats(self) -> dict[str, int]:
+        """The function cache counters, summed over this manager's workers"""
+        totals: dict[str, int] = defaultdict(int)
+        for stats in list(self.worker_function_cache.values()):
+            for key, value in stats.items():
+                totals[key] += value
+        return dict(totals)
+
     def push_results(self, kill_event, max_result_batch_size=1):
         """Listens on the pending_result_queue and sends out results via 0mq
 
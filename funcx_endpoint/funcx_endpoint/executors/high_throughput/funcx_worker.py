@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import logging
 import os
 import signal
 import sys
 import time
+import typing as t
+from collections import OrderedDict
 
 import dill
 import zmq
@@ -15,6 +19,8 @@ from funcx_common.tasks import ActorName, TaskState
 
 from funcx.errors import MaxResultSizeExceeded
 from funcx.serialize import FuncXSerializer
+from funcx.serialize.concretes import JSONData
+from funcx.serialize.shared import SharedArguments
 from funcx_endpoint.exception_handling import get_error_string, get_result_error_details
 from funcx_endpoint.exceptions import CouldNotExecuteUserTaskError
 from funcx_endpoint.executors.high_throughput.messages import Message
@@ -24,6 +30,76 @@ log = logging.getLogger(__name__)
 
 DEFAULT_RESULT_SIZE_LIMIT_MB = 10
 DEFAULT_RESULT_SIZE_LIMIT_B = DEFAULT_RESULT_SIZE_LIMIT_MB * 1024 * 1024
+DEFAULT_FUNCTION_CACHE_SIZE = 128
+
+
+def _is_json_payload(payload: str | bytes) -> bool:
+    # shared arguments are only sent by submitters that also read JSON
+    header = payload[: len(JSONData.identifier)]
+    if not isinstance(header, str):
+        header = bytes(header).decode("ascii", errors="replace")
+    return header in (JSONData.identifier, SharedArguments.identifier)
+
+
+class FunctionCache:
+    """A bounded LRU cache of deserialized functions, keyed by a digest of the
+    serialized function buffer.
+
+    Reconstructing a function (e.g., ``exec()``-ing the source for
+    DillCodeSource) is often far more expensive than running it, and the same
+    function is typically invoked many times on a worker.
+
+    Parameters
+    ----------
+
+    deserialize : callable
+     Used to reconstruct the function on a cache miss
+
+    maxsize : int
+     Maximum number of functions to retain; 0 disables caching
+    """
+
+    def __init__(
+        self, deserialize: t.Callable[[str | bytes], t.Callable], maxsize: int
+    ):
+        self.deserialize = deserialize
+        self.maxsize = max(0, maxsize)
+        self._cache: OrderedDict[bytes, t.Callable] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, fn_buffer: str | bytes) -> t.Callable:
+        if isinstance(fn_buffer, str):
+            key = hashlib.sha256(fn_buffer.encode()).digest()
+        else:
+            key = hashlib.sha256(fn_buffer).digest()
+
+        fn = self._cache.get(key)
+        if fn is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return fn
+
+        self.misses += 1
+        fn = self.deserialize(fn_buffer)
+        if self.maxsize:
+            self._cache[key] = fn
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+        return fn
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._cache),
+        }
 
 
 class FuncXWorker:
@@ -44,6 +120,16 @@ class FuncXWorker:
      Maximum result size allowed in Bytes
      Default = 10 MB
 
+    function_cache_size : int
+     Maximum number of deserialized functions to keep for reuse; 0 disables
+     Default = 128
+
+    result_compression_threshold : int | None
+     Compress serialized results of at least this many bytes (when worthwhile);
+     compressed results count against result_size_limit at their compressed
+     size.  The submitting SDK must be recent enough to decompress them.
+     Default = None (no compression)
+
     Funcx worker will use the REP sockets to:
          task = recv ()
          result = execute(task)
@@ -57,15 +143,24 @@ class FuncXWorker:
         port,
         worker_type="RAW",
         result_size_limit=DEFAULT_RESULT_SIZE_LIMIT_B,
+        function_cache_size=DEFAULT_FUNCTION_CACHE_SIZE,
+        result_compression_threshold=None,
     ):
         self.worker_id = worker_id
         self.address = address
         self.port = port
         self.worker_type = worker_type
-        self.serializer = FuncXSerializer()
+        self.serializer = FuncXSerializer(
+            compression_threshold=result_compression_threshold, fast_path=True
+        )
         self.serialize = self.serializer.serialize
         self.deserialize = self.serializer.deserialize
+        # for results of tasks from submitters that may not read JSON payloads
+        self.legacy_serializer = FuncXSerializer(
+            compression_threshold=result_compression_threshold, fast_path=False
+        )
         self.result_size_limit = result_size_limit
+        self.function_cache = FunctionCache(self.deserialize, function_cache_size)
 
         log.info(f"Initializing worker {worker_id}")
         log.info(f"Worker is of type: {worker_type}")
@@ -97,7 +192,11 @@ class FuncXWorker:
 
         while True:
             log.debug("Waiting for task")
-            p_task_id, p_container_id, msg = self.task_socket.recv_multipart()
+            # any frames past the task message are its out-of-band buffers,
+            # which are used in place (uncopied) by the deserializer
+            frames = self.task_socket.recv_multipart(copy=False)
+            p_task_id, p_container_id, msg = (f.bytes for f in frames[:3])
+            buffers = [f.buffer for f in frames[3:]]
             task_id: str = dill.loads(p_task_id)
             container_id: str = dill.loads(p_container_id)
             log.debug(f"Received task with task_id='{task_id}' and msg='{msg}'")
@@ -111,22 +210,31 @@ class FuncXWorker:
                 # Kill the worker after accepting death in message to manager.
                 sys.exit()
             else:
-                result = self.execute_task(task_id, msg)
+                result = self.execute_task(task_id, msg, buffers=buffers)
                 result["container_id"] = container_id
                 log.debug("Sending result")
-                # send bytes over the socket back to the manager
-                self.task_socket.send_multipart([b"TASK_RET", dill.dumps(result)])
+                # send bytes over the socket back to the manager, with the
+                # function cache counters for its status reports
+                self.task_socket.send_multipart(
+                    [
+                        b"TASK_RET",
+                        dill.dumps(result),
+                        json.dumps(self.function_cache.stats()).encode(),
+                    ]
+                )
 
         log.warning("Broke out of the loop... dying")
 
-    def execute_task(self, task_id: str, task_body: bytes) -> dict:
+    def execute_task(
+        self, task_id: str, task_body: bytes, buffers: t.Sequence = ()
+    ) -> dict:
         log.debug("executing task task_id='%s'", task_id)
         exec_start = TaskTransition(
             timestamp=time.time_ns(), state=TaskState.EXEC_START, actor=ActorName.WORKER
         )
 
         try:
-            result = self.call_user_function(task_body)
+            result = self.call_user_function(task_body, buffers=buffers)
         except Exception:
             log.exception("Caught an exception while executing user function")
             result_message: dict[
@@ -156,9 +264,18 @@ class FuncXWorker:
         )
         return result_message
 
-    def call_user_function(self, message: bytes) -> str:
+    def call_user_function(
+        self, message: bytes, buffers: t.Sequence = ()
+    ) -> str | bytes:
         """Deserialize the buffer and execute the task.
 
+        Parameters
+        ----------
+        message : bytes
+            The packed task message
+        buffers : sequence of buffers
+            The out-of-band buffers of the task's arguments, if any
+
         Returns the result or throws exception.
         """
         # try to unpack it as a messagepack message
@@ -175,11 +292,26 @@ class FuncXWorker:
             messagepack.UnrecognizedProtocolVersion,
         ):
             task = Message.unpack(message)
-            task_data = task.task_buffer.decode("utf-8")  # type: ignore[attr-defined]
+            # may be text or binary serialized; the serializer accepts bytes as-is
+            task_data = task.task_buffer  # type: ignore[attr-defined]
 
-        f, args, kwargs = self.serializer.unpack_and_deserialize(task_data)
+        unpacked = self.serializer.unpack_buffers(task_data)
+        if len(unpacked) != 3:
+            raise CouldNotExecuteUserTaskError(
+                f"Unpack expects 3 buffers, got {len(unpacked)}"
+            )
+        fn_buffer, args_buffer, kwargs_buffer = unpacked
+        f = self.function_cache.get(fn_buffer)
+        # args and kwargs consume the out-of-band buffers in order
+        oob_buffers = iter(buffers)
+        args = self.deserialize(args_buffer, buffers=oob_buffers)
+        kwargs = self.deserialize(kwargs_buffer, buffers=oob_buffers)
         result_data = f(*args, **kwargs)
-        serialized_data = self.serialize(result_data)
+        if _is_json_payload(args_buffer) or _is_json_payload(kwargs_buffer):
+            serialized_data = self.serialize(result_data)
+        else:
+            # the submitter did not send JSON, so it may be unable to read it
+            serialized_data = self.legacy_serializer.serialize(result_data)
 
         if len(serialized_data) > self.result_size_limit:
             raise MaxResultSizeExceeded(len(serialized_data), self.result_size_limit)
@@ -213,6 +345,12 @@ def cli_run():
         action="store_true",
         help="Directory path where worker log files written",
     )
+    parser.add_argument(
+        "--compression-threshold",
+        type=int,
+        default=None,
+        help="Compress results of at least this many bytes (default: never)",
+    )
     args = parser.parse_args()
 
     setup_logging(
@@ -235,6 +373,7 @@ def cli_run():
                 args.address,
                 int(args.port),
                 worker_type=args.type,
+                result_compression_threshold=args.compression_threshold,
             )
             worker.start()
         finally:
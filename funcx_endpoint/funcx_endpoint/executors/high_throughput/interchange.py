@@ -335,6 +335,7 @@ class Interchange:
         self.task_cancel_pending_trap: dict[str, str] = {}
         self.task_status_deltas: dict[str, list[TaskTransition]] = {}
         self.container_switch_count: dict[bytes, int] = {}
+        self.function_cache_stats: dict[bytes, dict[str, int]] = {}
 
     def load_config(self):
         """Load the config"""
@@ -409,7 +410,10 @@ class Interchange:
         while not kill_event.is_set():
             # We are no longer doing heartbeats on the task side.
             try:
-                raw_msg = self.task_incoming.recv()
+                # any frames after the first are the task's out-of-band buffers;
+                # they are kept as (uncopied) zmq.Frames and forwarded as-is
+                raw_frame, *buffers = self.task_incoming.recv_multipart(copy=False)
+                raw_msg = raw_frame.bytes
                 self.last_heartbeat = time.time()
             except zmq.Again:
                 log.trace(
@@ -448,6 +452,8 @@ class Interchange:
                         "container_id": msg.container_id,
                         "local_container": local_container,
                         "raw_buffer": raw_msg,
+                        "buffer_count": len(buffers),
+                        "buffers": buffers,
                     }
                 )
                 self.total_pending_task_count += 1
@@ -852,9 +858,15 @@ class Interchange:
                             str(tasks)[:50], manager
                         )
                     )
+                    # Frames can't be pickled; they follow the task list, in task
+                    # order, and are re-assigned by the manager via buffer_count
+                    buffers = []
+                    for task in tasks:
+                        buffers.extend(task.pop("buffers", ()))
                     serializd_raw_tasks_buffer = dill.dumps(tasks)
                     self.task_outgoing.send_multipart(
-                        [manager, b"", serializd_raw_tasks_buffer]
+                        [manager, b"", serializd_raw_tasks_buffer, *buffers],
+                        copy=not buffers,
                     )
 
                     for task in tasks:
@@ -899,31 +911,13 @@ class Interchange:
                     try:
                         log.debug("Trying to unpack")
                         manager_report = Message.unpack(b_messages[0])
-                        if manager_report.task_statuses:
-                            log.info(
-                                "Got manager status report: %s",
-                                manager_report.task_statuses,
-                            )
-
-                        # merge the two dicts of statuses
-                        for tid, statuses in manager_report.task_statuses.items():
-                            if tid in self.task_status_deltas.keys():
-                                self.task_status_deltas[tid] += statuses
-                            else:
-                                self.task_status_deltas[tid] = statuses
+                        self._process_status_report(manager, manager_report)
 
                         self.task_outgoing.send_multipart(
                             [manager, b"", PKL_HEARTBEAT_CODE]
                         )
                         b_messages = b_messages[1:]
                         mdata["last"] = time.time()
-                        self.container_switch_count[
-                            manager
-                        ] = manager_report.container_switch_count
-                        log.info(
-                            "Got container switch count: %s",
-                            self.container_switch_count,
-                        )
                     except Exception:
                         pass
                     if len(b_messages):
@@ -1015,6 +1009,21 @@ class Interchange:
         log.info(f"Processed {count} tasks in {delta} seconds")
         log.warning("Exiting")
 
+    def _process_status_report(self, manager: bytes, manager_report) -> None:
+        if manager_report.task_statuses:
+            log.info("Got manager status report: %s", manager_report.task_statuses)
+
+        # merge the two dicts of statuses
+        for tid, statuses in manager_report.task_statuses.items():
+            if tid in self.task_status_deltas.keys():
+                self.task_status_deltas[tid] += statuses
+            else:
+                self.task_status_deltas[tid] = statuses
+
+        self.container_switch_count[manager] = manager_report.container_switch_count
+        log.info("Got container switch count: %s", self.container_switch_count)
+        self.function_cache_stats[manager] = manager_report.function_cache
+
     def get_global_state_for_status_report(self):
         outstanding_tasks = self.get_total_tasks_outstanding()
         pending_tasks = self.total_pending_task_count
@@ -1024,6 +1033,10 @@ class Interchange:
             m["free_capacity"]["total_workers"]
             for m in self._ready_manager_queue.values()
         )
+        function_cache: dict[str, int] = collections.defaultdict(int)
+        for stats in self.function_cache_stats.values():
+            for key, value in stats.items():
+                function_cache[key] += value
 
         return {
             "managers": num_managers,
@@ -1031,6 +1044,7 @@ class Interchange:
             "idle_workers": free_capacity,
             "pending_tasks": pending_tasks,
             "outstanding_tasks": outstanding_tasks,
+            "function_cache": function_cache,
         }
 
     def scale_out(self, blocks=1, task_type=None):
@@ -86,37 +86,47 @@ class Task(Message):
     type = MessageType.TASK
 
     def __init__(
-        self, task_id: str, container_id: str, task_buffer: str | bytes, raw_buffer=None
+        self,
+        task_id: str,
+        container_id: str,
+        task_buffer: str | bytes,
+        raw_buffer=None,
+        buffers=(),
     ):
         super().__init__()
         self.task_id = task_id
         self.container_id = container_id
         self.task_buffer = task_buffer
         self.raw_buffer = raw_buffer
+        # out-of-band (pickle protocol 5) buffers referenced by task_buffer; these
+        # are not part of the packed message, but travel as separate zmq frames
+        self.buffers = list(buffers)
 
     def pack(self) -> bytes:
         if self.raw_buffer is None:
-            # a type:ignore is needed here
-            # task_buffer might be a str  or it might be a bytes (see `unpack`)
-            # and we can't tell which is correct
-            #
-            # rather than thinking hard, preserve the exact current runtime behavior
+            # task_buffer might be a str or it might be bytes (see `unpack`, and
+            # the binary serialization methods); bytes are appended as-is, so
+            # that (potentially large) binary payloads are not transcoded.
             #
             # all of this code is going to be eliminated soonish by
             # funcx_common.messagepack in part because of issues like this
-            add_ons = (
-                f"TID={self.task_id};CID={self.container_id};"  # type: ignore
-                f"{self.task_buffer}"
-            )
-            self.raw_buffer = add_ons.encode("utf-8")
+            add_ons = f"TID={self.task_id};CID={self.container_id};"
+            if isinstance(self.task_buffer, (bytes, bytearray, memoryview)):
+                self.raw_buffer = add_ons.encode("utf-8") + self.task_buffer
+            else:
+                self.raw_buffer = (add_ons + self.task_buffer).encode("utf-8")
 
         return self.type.pack() + self.raw_buffer
 
     @classmethod
     def unpack(cls, raw_buffer: bytes):
-        b_tid, b_cid, task_buf = raw_buffer.decode("utf-8").split(";", 2)
+        # only the (short) header is decoded; the task buffer remains bytes
+        b_tid, b_cid, task_buf = raw_buffer.split(b";", 2)
         return cls(
-            b_tid[4:], b_cid[4:], task_buf.encode("utf-8"), raw_buffer=raw_buffer
+            b_tid[4:].decode("utf-8"),
+            b_cid[4:].decode("utf-8"),
+            task_buf,
+            raw_buffer=raw_buffer,
         )
 
     def set_local_container(self, container_id):
@@ -215,15 +225,17 @@ class EPStatusReport(Message):
 class ManagerStatusReport(Message):
     """
     Status report sent from the Manager to the Interchange, which mostly just amounts
-    to saying which tasks are now RUNNING.
+    to saying which tasks are now RUNNING; also carries the manager's function
+    cache counters (summed over its workers).
     """
 
     type = MessageType.MANAGER_STATUS_REPORT
 
-    def __init__(self, task_statuses, container_switch_count):
+    def __init__(self, task_statuses, container_switch_count, function_cache=None):
         super().__init__()
         self.task_statuses = task_statuses
         self.container_switch_count = container_switch_count
+        self.function_cache = function_cache or {}
 
     @classmethod
     def unpack(cls, msg):
@@ -231,6 +243,10 @@ class ManagerStatusReport(Message):
         msg = msg[10:]
         jsonified = msg.decode("ascii")
         statuses = json.loads(jsonified)
+        function_cache = {}
+        if isinstance(statuses, list):
+            statuses, function_cache = statuses
+        # else: from a manager without function cache counters
         task_statuses = defaultdict(list)
         for tid, tt in statuses.items():
             for trans in tt:
@@ -241,7 +257,7 @@ class ManagerStatusReport(Message):
                         state=trans["state"],
                     )
                 )
-        return cls(task_statuses, container_switch_count)
+        return cls(task_statuses, container_switch_count, function_cache)
 
     def pack(self):
         # TODO: do better than JSON?
@@ -251,7 +267,10 @@ class ManagerStatusReport(Message):
                 statuses[tid] = statuses.get(tid, [])
                 statuses[tid].append(status.to_dict())
 
-        jsonified = json.dumps(statuses)
+        if self.function_cache:
+            jsonified = json.dumps([statuses, self.function_cache])
+        else:
+            jsonified = json.dumps(statuses)
         return (
             self.type.pack()
             + self.container_switch_count.to_bytes(10, "little")
@@ -77,7 +77,7 @@ class TasksOutgoing:
         self.poller = zmq.Poller()
         self.poller.register(self.zmq_socket, zmq.POLLOUT)
 
-    def put(self, message, max_timeout=1000):
+    def put(self, message, max_timeout=1000, buffers=()):
         """This function needs to be fast at the same time aware of the possibility of
         ZMQ pipes overflowing.
 
@@ -94,6 +94,9 @@ class TasksOutgoing:
         max_timeout : int
              Max timeout in milliseconds that we will wait for before raising an
              exception
+        buffers : sequence of buffers
+             Out-of-band buffers to send, uncopied, as additional frames of the
+             message
 
         Raises
         ------
@@ -107,7 +110,12 @@ class TasksOutgoing:
             socks = dict(self.poller.poll(timeout=timeout_ms))
             if self.zmq_socket in socks and socks[self.zmq_socket] == zmq.POLLOUT:
                 # The copy option adds latency but reduces the risk of ZMQ overflow
-                self.zmq_socket.send(message, copy=True)
+                if buffers:
+                    # large buffers only; zmq keeps a reference until sent
+                    self.zmq_socket.send(message, zmq.SNDMORE, copy=True)
+                    self.zmq_socket.send_multipart(buffers, copy=False)
+                else:
+                    self.zmq_socket.send(message, copy=True)
                 return
             else:
                 timeout_ms += 1
@@ -5,7 +5,11 @@ from unittest import mock
 from funcx_common.tasks import TaskState
 
 from funcx_endpoint.executors.high_throughput.funcx_manager import Manager as FXManager
-from funcx_endpoint.executors.high_throughput.messages import Task
+from funcx_endpoint.executors.high_throughput.messages import (
+    ManagerStatusReport,
+    Message,
+    Task,
+)
 
 
 @mock.patch("funcx_endpoint.executors.high_throughput.funcx_manager.zmq")
@@ -26,3 +30,14 @@ class TestFuncxManager:
         tt = mgr.task_status_deltas[task_id][0]
         assert time.time_ns() - tt.timestamp < 2000000000, "Expecting a timestamp"
         assert tt.state == TaskState.RUNNING
+
+    def test_function_cache_stats_summed_over_workers(self, randomstring):
+        mgr = FXManager(uid="some_uid", worker_type=randomstring())
+        mgr.worker_function_cache[b"w1"] = {"hits": 4, "misses": 1, "size": 1}
+        mgr.worker_function_cache[b"w2"] = {"hits": 2, "misses": 2, "size": 2}
+
+        stats = mgr.function_cache_stats()
+        assert stats == {"hits": 6, "misses": 3, "size": 3}
+
+        msg = ManagerStatusReport({}, 0, stats)
+        assert Message.unpack(msg.pack()).function_cache == stats
@@ -3,9 +3,14 @@ import uuid
 from unittest import mock
 
 import pytest
+import zmq
 from funcx_common import messagepack
 
-from funcx_endpoint.executors.high_throughput.funcx_worker import FuncXWorker
+from funcx.serialize import FuncXSerializer
+from funcx_endpoint.executors.high_throughput.funcx_worker import (
+    FunctionCache,
+    FuncXWorker,
+)
 from funcx_endpoint.executors.high_throughput.messages import Task
 
 
@@ -13,6 +18,10 @@ def hello_world():
     return "hello world"
 
 
+def get_length(data, suffix=b""):
+    return len(data) + len(suffix)
+
+
 def failing_function():
     x = {}
     return x["foo"]  # will fail, but in a "natural" way
@@ -41,11 +50,11 @@ def test_worker():
 def test_register_and_kill(test_worker):
     # send a kill message on the mock socket
     task = Task(task_id="KILL", container_id="RAW", task_buffer="KILL")
-    test_worker.task_socket.recv_multipart.return_value = (
-        pickle.dumps("KILL"),
-        pickle.dumps("abc"),
-        task.pack(),
-    )
+    test_worker.task_socket.recv_multipart.return_value = [
+        zmq.Frame(pickle.dumps("KILL")),
+        zmq.Frame(pickle.dumps("abc")),
+        zmq.Frame(task.pack()),
+    ]
 
     # calling worker.start begins a while loop, where first a REGISTER
     # message is sent out, then the worker receives the KILL task, which
@@ -87,6 +96,125 @@ def test_execute_hello_world(test_worker):
     assert result_data == "hello world"
 
 
+def test_execute_binary_serialized_internal_task(test_worker):
+    task_id = str(uuid.uuid1())
+    serializer = FuncXSerializer(binary=True)
+    task_body = ez_pack_function(serializer, hello_world, (), {})
+    assert isinstance(task_body, bytes), "Test prerequisite"
+
+    task_message = Task(task_id, "RAW", task_body).pack()
+
+    result = test_worker.execute_task(task_id, task_message)
+    assert "exception" not in result
+    assert test_worker.deserialize(result["data"]) == "hello world"
+
+
+@pytest.mark.parametrize("fast_path", (True, False))
+def test_execute_answers_json_only_to_json_submitters(test_worker, fast_path):
+    task_id = str(uuid.uuid1())
+    serializer = FuncXSerializer(fast_path=fast_path)
+    task_body = ez_pack_function(serializer, hello_world, (), {})
+
+    result = test_worker.execute_task(task_id, Task(task_id, "RAW", task_body).pack())
+    assert result["data"].startswith("11\n" if fast_path else "00\n")
+    assert serializer.deserialize(result["data"]) == "hello world"
+
+
+def test_execute_tasks_with_shared_arguments(test_worker):
+    from funcx.sdk.batch import Batch
+
+    serializer = FuncXSerializer()
+    data = "x" * 100_000
+    batch = Batch(serializer=serializer, share_arguments=True)
+    batch.add("fid", "eid", (data,), {"suffix": b"abc"})
+    batch.add("fid", "eid", (data,), {"suffix": b"de"})
+
+    ser_fn = serializer.serialize(get_length)
+    for (*_, payload), expected in zip(batch.tasks, (100_003, 100_002)):
+        task_id = str(uuid.uuid1())
+        task_body = serializer.pack_buffers(
+            [ser_fn, *serializer.unpack_buffers(payload)]
+        )
+        result = test_worker.execute_task(
+            task_id, Task(task_id, "RAW", task_body).pack()
+        )
+        assert serializer.deserialize(result["data"]) == expected
+        assert result["data"].startswith("11\n"), "submitter reads JSON"
+
+    assert test_worker.serializer.shared_arguments.stats()["misses"] == 1
+    assert test_worker.serializer.shared_arguments.stats()["hits"] == 1
+
+
+def test_execute_task_with_out_of_band_buffers(test_worker):
+    task_id = str(uuid.uuid1())
+    serializer = FuncXSerializer(binary=True)
+    data = bytearray(256 * 1024)
+
+    buffers = []
+    task_body = serializer.pack_buffers(
+        [
+            serializer.serialize(get_length),
+            serializer.serialize((data,), buffers=buffers),
+            serializer.serialize({"suffix": bytes(100 * 1024)}, buffers=buffers),
+        ]
+    )
+    assert len(buffers) == 2, "Test prerequisite: large buffers sent out-of-band"
+    assert len(task_body) < len(data), "Test prerequisite: data not in message"
+    task_message = Task(task_id, "RAW", task_body, buffers=buffers).pack()
+
+    # as received by the worker: read-only views of the frames' memory
+    received = [memoryview(bytes(buf)) for buf in buffers]
+    result = test_worker.execute_task(task_id, task_message, buffers=received)
+    assert "exception" not in result, result.get("exception")
+    assert test_worker.deserialize(result["data"]) == len(data) + 100 * 1024
+
+
+def test_execute_task_missing_out_of_band_buffers(test_worker):
+    task_id = str(uuid.uuid1())
+    serializer = FuncXSerializer(binary=True)
+
+    buffers = []
+    task_body = serializer.pack_buffers(
+        [
+            serializer.serialize(get_length),
+            serializer.serialize((bytearray(256 * 1024),), buffers=buffers),
+            serializer.serialize({}, buffers=buffers),
+        ]
+    )
+    task_message = Task(task_id, "RAW", task_body).pack()
+
+    result = test_worker.execute_task(task_id, task_message)
+    assert "data" not in result
+    assert "DeserializationError" in result["exception"]
+
+
+def make_csv(rows):
+    return "a,b,c\n" * rows
+
+
+def test_execute_compressed_args_and_result():
+    with mock.patch(
+        "funcx_endpoint.executors.high_throughput.funcx_worker.zmq.Context"
+    ):
+        worker = FuncXWorker("0", "127.0.0.1", 50001, result_compression_threshold=1024)
+    task_id = str(uuid.uuid1())
+    serializer = FuncXSerializer(compression_threshold=1024)
+    task_body = ez_pack_function(serializer, get_length, ("x" * 100_000,), {})
+    assert len(task_body) < 100_000, "Test prerequisite: compressed arguments"
+
+    result = worker.execute_task(task_id, Task(task_id, "RAW", task_body).pack())
+    assert worker.deserialize(result["data"]) == 100_000
+
+    result = worker.execute_task(
+        task_id,
+        Task(
+            task_id, "RAW", ez_pack_function(serializer, make_csv, (10_000,), {})
+        ).pack(),
+    )
+    assert len(result["data"]) < 10_000, "Expected compressed result"
+    assert FuncXSerializer().deserialize(result["data"]) == make_csv(10_000)
+
+
 def test_execute_failing_function(test_worker):
     task_id = uuid.uuid1()
     task_body = ez_pack_function(test_worker.serializer, failing_function, (), {})
@@ -143,3 +271,46 @@ def test_execute_function_exceeding_result_size_limit(test_worker):
     assert len(result["error_details"]) == 2
     assert result["error_details"][0] == "MaxResultSizeExceeded"
     assert result["error_details"][1].startswith("remote error: ")
+
+
+def test_function_cache_reuses_deserialized_function(test_worker):
+    task_body = ez_pack_function(test_worker.serializer, hello_world, (), {})
+    task_message = messagepack.pack(
+        messagepack.message_types.Task(
+            task_id=uuid.uuid1(), container_id=uuid.uuid1(), task_buffer=task_body
+        )
+    )
+
+    test_worker.function_cache.deserialize = mock.Mock(
+        wraps=test_worker.function_cache.deserialize
+    )
+    for i in range(5):
+        result = test_worker.execute_task(str(uuid.uuid1()), task_message)
+        assert test_worker.deserialize(result["data"]) == "hello world"
+
+    assert test_worker.function_cache.deserialize.call_count == 1
+    assert "function_cache" not in result
+    assert test_worker.function_cache.stats() == {
+        "hits": 4,
+        "misses": 1,
+        "evictions": 0,
+        "size": 1,
+    }
+
+
+def test_function_cache_is_bounded():
+    fc = FunctionCache(deserialize=lambda buf: mock.Mock(), maxsize=2)
+    fns = [fc.get(f"fn{i}") for i in range(3)]
+    assert len(fc) == 2
+    assert fc.evictions == 1
+
+    assert fc.get("fn2") is fns[2]
+    assert fc.get("fn0") is not fns[0], "Least recently used should be evicted"
+    assert fc.stats() == {"hits": 1, "misses": 4, "evictions": 2, "size": 2}
+
+
+def test_function_cache_disabled():
+    fc = FunctionCache(deserialize=lambda buf: mock.Mock(), maxsize=0)
+    assert fc.get("fn") is not fc.get("fn")
+    assert len(fc) == 0
+    assert fc.misses == 2
@@ -0,0 +1,34 @@
+from unittest import mock
+
+import pytest
+
+from funcx.serialize import FuncXSerializer
+from funcx.serialize.concretes import DillCodeBinary
+from funcx_endpoint.executors.high_throughput.executor import HighThroughputExecutor
+from funcx_endpoint.executors.high_throughput.messages import Message
+
+
+def double(x, y=1):
+    return 2 * x * y
+
+
+@pytest.mark.parametrize("code_falls_back_to_text", (False, True))
+def test_submit_packs_function_and_arguments(mocker, code_falls_back_to_text):
+    if code_falls_back_to_text:
+        mocker.patch.object(
+            DillCodeBinary, "serialize", side_effect=Exception("not by value")
+        )
+    htex = HighThroughputExecutor(address="127.0.0.1")
+    htex.submit_raw = mock.Mock()
+
+    htex.submit(double, 3, y=2, task_id="some_task_id")
+
+    (packed,), _ = htex.submit_raw.call_args
+    task = Message.unpack(packed)
+    assert task.task_id == "some_task_id"
+    fxs = FuncXSerializer()
+    fn_code, ser_args, ser_kwargs = fxs.unpack_buffers(task.task_buffer)
+    is_binary = bytes(fn_code[:3]) == DillCodeBinary.identifier.encode("ascii")
+    assert is_binary is not code_falls_back_to_text
+    fn = fxs.deserialize(fn_code)
+    assert fn(*fxs.deserialize(ser_args), **fxs.deserialize(ser_kwargs)) == 12
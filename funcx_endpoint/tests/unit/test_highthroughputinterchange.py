@@ -3,10 +3,15 @@ import uuid
 from unittest import mock
 
 import pytest
+import zmq
 from funcx_common.tasks import TaskState
 
 from funcx_endpoint.executors.high_throughput.interchange import Interchange, starter
-from funcx_endpoint.executors.high_throughput.messages import Task
+from funcx_endpoint.executors.high_throughput.messages import (
+    ManagerStatusReport,
+    Message,
+    Task,
+)
 
 # Work with linter's 88 char limit, and be uniform in this file how we do it
 mod_dot_path = "funcx_endpoint.executors.high_throughput.interchange"
@@ -22,7 +27,7 @@ class TestHighThroughputInterchange:
         packed_task = Task(task_id, "RAW", b"").pack()
 
         ix = Interchange(logdir=tmp_path, worker_ports=(1, 1))
-        ix.task_incoming.recv.return_value = packed_task
+        ix.task_incoming.recv_multipart.return_value = [zmq.Frame(packed_task)]
         ix.migrate_tasks_to_internal(mock_evt)
 
         assert task_id in ix.task_status_deltas
@@ -53,6 +58,27 @@ class TestHighThroughputInterchange:
         assert 0 <= time.time_ns() - tt.timestamp < 2000000000, "Expecting a timestamp"
         assert tt.state == TaskState.WAITING_FOR_LAUNCH
 
+    def test_function_cache_stats_in_status_report(
+        self, _mzmq, _mfn_conf, tmp_path, mocker
+    ):
+        ix = Interchange(logdir=tmp_path, worker_ports=(1, 1))
+        for manager, hits in ((b"mgr1", 4), (b"mgr2", 6)):
+            report = ManagerStatusReport({}, 0, {"hits": hits, "misses": 1})
+            ix._process_status_report(manager, Message.unpack(report.pack()))
+
+        state = ix.get_global_state_for_status_report()
+        assert state["function_cache"] == {"hits": 10, "misses": 2}
+
+    def test_status_report_from_older_manager(self, _mzmq, _mfn_conf, tmp_path, mocker):
+        ix = Interchange(logdir=tmp_path, worker_ports=(1, 1))
+        # without counters, the statuses are packed alone, as before
+        packed = ManagerStatusReport({}, 3).pack()
+        assert packed.endswith(b"{}")
+        ix._process_status_report(b"mgr", Message.unpack(packed))
+
+        assert ix.container_switch_count[b"mgr"] == 3
+        assert ix.get_global_state_for_status_report()["function_cache"] == {}
+
 
 def test_starter_sends_sentinel_upon_error(mocker):
     q = mocker.Mock()
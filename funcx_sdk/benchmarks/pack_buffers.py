@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""Micro-benchmark of FuncXSerializer.pack_buffers and unpack_buffers
+
+Packs and unpacks three buffers (function, args, kwargs; the shape of every task
+payload) for payload sizes from 1KB to 500MB, as text and as bytes, and compares
+against the previous concatenation/re-slicing implementation.
+
+    python benchmarks/pack_buffers.py
+    python benchmarks/pack_buffers.py --max-size 10MB --no-legacy
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from funcx.serialize import FuncXSerializer
+
+SIZES = ("1KB", "10KB", "100KB", "1MB", "10MB", "100MB", "500MB")
+UNITS = {"KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+
+def parse_size(size: str) -> int:
+    for unit, multiplier in UNITS.items():
+        if size.upper().endswith(unit):
+            return int(float(size[: -len(unit)]) * multiplier)
+    return int(size)
+
+
+def legacy_pack_buffers(buffers):
+    if any(isinstance(buf, bytes) for buf in buffers):
+        packed_bytes = b""
+        for buf in buffers:
+            packed_bytes += b"%d\n" % len(buf) + bytes(buf)
+        return packed_bytes
+
+    packed = ""
+    for buf in buffers:
+        s_length = str(len(buf)) + "\n"
+        packed += s_length + buf
+    return packed
+
+
+def legacy_unpack_buffers(packed_buffer):
+    newline = b"\n" if isinstance(packed_buffer, bytes) else "\n"
+    unpacked = []
+    while packed_buffer:
+        s_length, buf = packed_buffer.split(newline, 1)
+        i_length = int(s_length)
+        current, packed_buffer = buf[:i_length], buf[i_length:]
+        unpacked.extend([current])
+    return unpacked
+
+
+def make_buffers(size: int, binary: bool) -> list:
+    # a small function, and the arguments make up the bulk of the payload
+    fn, args, kwargs = "01\n" + "f" * 1024, "00\n" + "a" * size, "00\n" + "k" * 64
+    if binary:
+        return [fn.encode(), args.encode(), kwargs.encode()]
+    return [fn, args, kwargs]
+
+
+def best_of(stmt, repeat: int) -> float:
+    number = 1
+    while True:
+        elapsed = timeit.timeit(stmt, number=number)
+        if elapsed > 0.2 or number >= 10_000:
+            break
+        number *= 10
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-size", default="500MB", help="largest payload size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--no-legacy",
+        action="store_true",
+        help="skip the previous implementation (slow for large payloads)",
+    )
+    args = parser.parse_args()
+    max_size = parse_size(args.max_size)
+
+    print(f"{'size':>8} {'type':>5} {'impl':>7} {'pack':>12} {'unpack':>12}")
+    for size_name in SIZES:
+        size = parse_size(size_name)
+        if size > max_size:
+            break
+        for binary in (False, True):
+            buffers = make_buffers(size, binary)
+            impls = [("current", FuncXSerializer.pack_buffers)]
+            unpackers = {"current": FuncXSerializer.unpack_buffers}
+            if not args.no_legacy:
+                impls.append(("legacy", legacy_pack_buffers))
+                unpackers["legacy"] = legacy_unpack_buffers
+
+            for name, pack in impls:
+                packed = pack(buffers)
+                unpack = unpackers[name]
+                t_pack = best_of(lambda: pack(buffers), args.repeat)
+                t_unpack = best_of(lambda: unpack(packed), args.repeat)
+                print(
+                    f"{size_name:>8} {'bytes' if binary else 'str':>5} {name:>7} "
+                    f"{t_pack * 1e6:>10.1f}us {t_unpack * 1e6:>10.1f}us"
+                )
+            buffers = packed = None  # free large payloads before the next size
+
+
+if __name__ == "__main__":
+    main()
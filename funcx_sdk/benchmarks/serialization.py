@@ -0,0 +1,388 @@
+#!/usr/bin/env python
+"""Serialization benchmark suite
+
+Measures every serialization method (METHODS_MAP_CODE and METHODS_MAP_DATA), the
+FuncXSerializer facade (with and without the JSON fast path),
+pack_buffers/unpack_and_deserialize, Batch.add, and (if
+funcx-endpoint is installed) FuncXWorker.call_user_function, over a matrix of
+payloads: small scalars and dicts, 1MB and 100MB numpy arrays (if numpy is
+installed), and plain, closure, and decorated functions.
+
+For each benchmark and payload it reports operations per second, the bytes on
+the wire (the serialized size, including any out-of-band buffers), and the peak
+RSS growth.  Each case runs in a forked process, so that peak RSS is its own.
+
+    python benchmarks/serialization.py                      # run, print table
+    python benchmarks/serialization.py --quick              # skip 100MB payloads
+    python benchmarks/serialization.py -k Dill -k numpy_1mb # filter cases
+    python benchmarks/serialization.py --save-baseline      # store a baseline
+    python benchmarks/serialization.py --compare            # compare to baseline
+
+Timings are machine dependent: store a baseline on the machine that compares
+against it.  Sizes are not, and any change in them is reported.
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+import traceback
+import typing as t
+
+from funcx.sdk.batch import Batch
+from funcx.serialize import FuncXSerializer
+from funcx.serialize.concretes import METHODS_MAP_CODE, METHODS_MAP_DATA
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from funcx_endpoint.executors.high_throughput.funcx_worker import FuncXWorker
+    from funcx_endpoint.executors.high_throughput.messages import Task
+except ImportError:
+    FuncXWorker = None
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "serialization_baseline.json"
+)
+
+# ru_maxrss is in KiB on Linux, but in bytes on macOS
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def plain_function(x, y=2):
+    return x * y
+
+
+def make_closure():
+    factor = 3
+
+    def closure(x):
+        return x * factor
+
+    return closure
+
+
+def doubled(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return 2 * func(*args, **kwargs)
+
+    return wrapper
+
+
+@doubled
+def decorated_function(x):
+    return x + 1
+
+
+def identity(*args, **kwargs):
+    return args[0] if args else None
+
+
+DATA_PAYLOADS: dict[str, t.Callable[[], t.Any]] = {
+    "int": lambda: 42,
+    "str_1kb": lambda: "x" * 1024,
+    "dict_small": lambda: {"a": 1, "b": [1.5, 2.5], "c": "abc", "d": (None, True)},
+    "dict_10k": lambda: {str(i): [i, float(i), str(i)] for i in range(10_000)},
+}
+LARGE_PAYLOADS = {"numpy_100mb"}
+if numpy is not None:
+    DATA_PAYLOADS["numpy_1mb"] = lambda: numpy.random.random(1024**2 // 8)
+    DATA_PAYLOADS["numpy_100mb"] = lambda: numpy.random.random(100 * 1024**2 // 8)
+
+CODE_PAYLOADS: dict[str, t.Callable[[], t.Callable]] = {
+    "function": lambda: plain_function,
+    "closure": make_closure,
+    "decorated": lambda: decorated_function,
+}
+
+
+def wire_size(serialized, buffers=()) -> int:
+    size = len(serialized)
+    return size + sum(memoryview(buf).nbytes for buf in buffers)
+
+
+def method_roundtrip(method, obj) -> tuple[t.Callable[[], t.Any], int]:
+    """Benchmark one concrete serialization method (serialize + deserialize)"""
+    buffers: list = []
+    if method._out_of_band:
+        serialized = method.serialize(obj, buffers=buffers)
+
+        def run():
+            bufs: list = []
+            method.deserialize(method.serialize(obj, buffers=bufs), buffers=bufs)
+
+    else:
+        serialized = method.serialize(obj)
+
+        def run():
+            method.deserialize(method.serialize(obj))
+
+    if method._out_of_band:
+        method.deserialize(serialized, buffers=buffers)
+    else:
+        method.deserialize(serialized)
+    return run, wire_size(serialized, buffers)
+
+
+def make_method_bench(method_cls):
+    def bench(obj):
+        return method_roundtrip(method_cls(), obj)
+
+    return bench
+
+
+def facade_bench(obj, **kwargs):
+    fxs = FuncXSerializer(**kwargs)
+    buffers: list = []
+    serialized = fxs.serialize(obj, buffers=buffers)
+
+    def run():
+        bufs: list = []
+        fxs.deserialize(fxs.serialize(obj, buffers=bufs), buffers=iter(bufs))
+
+    return run, wire_size(serialized, buffers)
+
+
+def pack_unpack_bench(obj):
+    fxs = FuncXSerializer()
+    ser_fn = fxs.serialize(identity)
+
+    def pack():
+        return fxs.pack_buffers([ser_fn, fxs.serialize((obj,)), fxs.serialize({})])
+
+    packed = pack()
+
+    def run():
+        fxs.unpack_and_deserialize(pack())
+
+    return run, wire_size(packed)
+
+
+def batch_add_bench(obj):
+    serializer = FuncXSerializer()
+    batch = Batch(task_group_id="benchmark", serializer=serializer)
+    batch.add("function-id", "endpoint-id", (obj,))
+    size = wire_size(batch.tasks[0][2])
+
+    def run():
+        batch.tasks.clear()
+        batch.add("function-id", "endpoint-id", (obj,))
+
+    return run, size
+
+
+def worker_bench(obj, binary=False):
+    fxs = FuncXSerializer(binary=binary)
+    buffers: list = []
+    payload = fxs.pack_buffers(
+        [
+            fxs.serialize(identity),
+            fxs.serialize((obj,), buffers=buffers if binary else None),
+            fxs.serialize({}),
+        ]
+    )
+    message = Task("benchmark", "RAW", payload).pack()
+
+    worker = FuncXWorker("0", "127.0.0.1", 1, result_size_limit=2**40)
+    worker.call_user_function(message, buffers=buffers)
+
+    def run():
+        worker.call_user_function(message, buffers=buffers)
+
+    return run, wire_size(message, buffers)
+
+
+def benchmarks() -> dict[str, tuple[t.Callable, dict[str, t.Callable]]]:
+    """name -> (bench(obj) -> (run, wire bytes), payloads)"""
+    suite: dict[str, tuple[t.Callable, dict[str, t.Callable]]] = {}
+    for methods, payloads in (
+        (METHODS_MAP_DATA, DATA_PAYLOADS),
+        (METHODS_MAP_CODE, CODE_PAYLOADS),
+    ):
+        for identifier, method_cls in methods.items():
+            name = f"{method_cls.__name__}[{identifier.strip()}]"
+            suite[name] = (make_method_bench(method_cls), payloads)
+
+    all_payloads = {**DATA_PAYLOADS, **CODE_PAYLOADS}
+    suite["FuncXSerializer"] = (facade_bench, all_payloads)
+    suite["FuncXSerializer(binary)"] = (
+        functools.partial(facade_bench, binary=True),
+        all_payloads,
+    )
+    suite["FuncXSerializer(fast_path)"] = (
+        functools.partial(facade_bench, fast_path=True),
+        DATA_PAYLOADS,
+    )
+    suite["FuncXSerializer(compressed)"] = (
+        functools.partial(facade_bench, compression_threshold=1024),
+        DATA_PAYLOADS,
+    )
+    suite["pack_buffers+unpack_and_deserialize"] = (pack_unpack_bench, DATA_PAYLOADS)
+    suite["Batch.add"] = (batch_add_bench, DATA_PAYLOADS)
+    if FuncXWorker is not None:
+        suite["FuncXWorker.call_user_function"] = (worker_bench, DATA_PAYLOADS)
+        suite["FuncXWorker.call_user_function(binary)"] = (
+            functools.partial(worker_bench, binary=True),
+            DATA_PAYLOADS,
+        )
+    return suite
+
+
+def measure(bench, payload_factory, min_time: float) -> dict:
+    rss_start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    try:
+        run, size = bench(payload_factory())
+        run()  # warm up
+        ops, start = 0, time.perf_counter()
+        while True:
+            run()
+            ops += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}".splitlines()[0][:120]}
+
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "ops_per_sec": ops / elapsed,
+        "wire_bytes": size,
+        "peak_rss_bytes": (rss_peak - rss_start) * RSS_UNIT,
+    }
+
+
+def _measure_in_child(conn, bench, payload_factory, min_time):
+    try:
+        conn.send(measure(bench, payload_factory, min_time))
+    except BaseException:
+        conn.send({"error": traceback.format_exc().splitlines()[-1]})
+    finally:
+        conn.close()
+
+
+def measure_isolated(bench, payload_factory, min_time: float) -> dict:
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return measure(bench, payload_factory, min_time)
+
+    ctx = multiprocessing.get_context("fork")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(
+        target=_measure_in_child, args=(child_conn, bench, payload_factory, min_time)
+    )
+    proc.start()
+    child_conn.close()
+    try:
+        result = parent_conn.recv()
+    except EOFError:
+        result = {"error": f"benchmark process died (exit code {proc.exitcode})"}
+    proc.join()
+    return result
+
+
+def run_suite(args) -> dict[str, dict[str, dict]]:
+    results: dict[str, dict[str, dict]] = {}
+    for name, (bench, payloads) in benchmarks().items():
+        for payload_name, factory in payloads.items():
+            case = f"{name} {payload_name}"
+            if args.quick and payload_name in LARGE_PAYLOADS:
+                continue
+            if args.k and not any(k in case for k in args.k):
+                continue
+            result = measure_isolated(bench, factory, args.min_time)
+            results.setdefault(name, {})[payload_name] = result
+            print(format_row(name, payload_name, result), flush=True)
+    return results
+
+
+def format_row(name: str, payload_name: str, result: dict, note: str = "") -> str:
+    if "error" in result:
+        return f"{name:<42} {payload_name:<12} {'-':>12} {'-':>14} {'-':>10}  " + (
+            result["error"]
+        )
+    return (
+        f"{name:<42} {payload_name:<12} {result['ops_per_sec']:>12,.1f} "
+        f"{result['wire_bytes']:>14,} {result['peak_rss_bytes'] / 1024**2:>9.1f}M"
+        f"{note}"
+    )
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> int:
+    """Print the cases that regressed against the baseline; return their count"""
+    regressions = 0
+    print(f"\nCompared to baseline (ops/s tolerance {tolerance:.0%}):")
+    for name, cases in results.items():
+        for payload_name, result in cases.items():
+            base = baseline.get(name, {}).get(payload_name)
+            if not base:
+                continue
+            notes = []
+            if ("error" in result) != ("error" in base):
+                notes.append("now fails" if "error" in result else "now succeeds")
+            elif "error" not in result:
+                ratio = result["ops_per_sec"] / base["ops_per_sec"]
+                if ratio < 1 - tolerance:
+                    notes.append(f"ops/s {ratio:.0%} of baseline")
+                if result["wire_bytes"] != base["wire_bytes"]:
+                    notes.append(
+                        f"wire bytes {base['wire_bytes']:,} -> "
+                        f"{result['wire_bytes']:,}"
+                    )
+            if notes:
+                regressions += 1
+                print(f"  {name} {payload_name}: {'; '.join(notes)}")
+    if not regressions:
+        print("  no regressions")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", action="append", help="only run matching cases")
+    parser.add_argument("--quick", action="store_true", help="skip 100MB payloads")
+    parser.add_argument(
+        "--min-time", type=float, default=0.5, help="seconds to run each case"
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    print(
+        f"{'benchmark':<42} {'payload':<12} {'ops/s':>12} {'wire bytes':>14} "
+        f"{'peak RSS':>10}"
+    )
+    results = run_suite(args)
+    output = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    for path in (args.json, args.baseline if args.save_baseline else None):
+        if path:
+            with open(path, "w") as f:
+                json.dump(output, f, indent=2, sort_keys=True)
+                f.write("\n")
+    if args.save_baseline:
+        print(f"\nBaseline written to {args.baseline}")
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline["results"], args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
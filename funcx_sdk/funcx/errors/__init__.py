@@ -1,6 +1,7 @@
 from .error_types import (
     FuncxError,
     FuncxTaskExecutionFailed,
+    InFlightLimitExceeded,
     MaxResultSizeExceeded,
     SerializationError,
     TaskPending,
@@ -10,6 +11,7 @@ from .error_types import (
 __all__ = (
     "FuncxError",
     "FuncxTaskExecutionFailed",
+    "InFlightLimitExceeded",
     "MaxResultSizeExceeded",
     "SerializationError",
     "TaskPending",
@@ -56,6 +56,29 @@ class MaxResultSizeExceeded(Exception):
         )
 
 
+class InFlightLimitExceeded(FuncxError):
+    """The executor holds as many tasks (or task bytes) as it was configured to,
+    and no room was made within the allotted time"""
+
+    def __init__(
+        self,
+        tasks: int,
+        max_tasks: int | None,
+        nbytes: int,
+        max_bytes: int | None,
+    ):
+        self.tasks = tasks
+        self.max_tasks = max_tasks
+        self.nbytes = nbytes
+        self.max_bytes = max_bytes
+
+    def __repr__(self) -> str:
+        return (
+            f"In-flight limit reached: {self.tasks} tasks (max: {self.max_tasks}),"
+            f" {self.nbytes}B unsent (max: {self.max_bytes})"
+        )
+
+
 class FuncxTaskExecutionFailed(Exception):
     """
     Error result from the remote end, wrapped as an exception object
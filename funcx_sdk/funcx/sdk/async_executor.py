@@ -0,0 +1,656 @@
+"""
+An asyncio-native counterpart of the FuncXExecutor: tasks are batched and
+submitted, and results consumed from the AMQP service, on the caller's event
+loop rather than on threads of the executor's own.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import typing as t
+
+import pika
+from funcx_common import messagepack
+from funcx_common.messagepack.message_types import Result
+from pika.adapters.asyncio_connection import AsyncioConnection
+
+from funcx.errors import FuncxTaskExecutionFailed
+from funcx.sdk.client import FuncXClient
+from funcx.sdk.executor import (
+    DEFAULT_INLINE_DECODE_BYTES,
+    DEFAULT_MAX_UNMATCHED_BYTES,
+    DEFAULT_RESULT_PREFETCH_COUNT,
+    _SpilledResults,
+)
+
+log = logging.getLogger(__name__)
+
+if t.TYPE_CHECKING:
+    from pika.channel import Channel
+    from pika.spec import Basic, BasicProperties
+
+
+class AsyncFuncXFuture(asyncio.Future):
+    """
+    An `asyncio.Future`_ for a funcX task, with the task's UUID (``task_id``)
+    once the funcX web services have accepted the task.
+
+    .. _asyncio.Future: https://docs.python.org/3/library/asyncio-future.html#asyncio.Future
+    """  # noqa
+
+    task_id: str | None = None
+
+
+class AsyncFuncXExecutor:
+    """
+    Submit functions to an endpoint, and await their results, from an asyncio
+    application.
+
+    Like the FuncXExecutor, tasks submitted close together are sent upstream
+    in batches, and results arrive over AMQP; but batching, submission, and
+    result consumption all run as tasks on the running event loop (the loop
+    of the first ``submit()``).  Blocking calls to the web services (function
+    registration, batch submission) run in the loop's default executor.
+
+    Example use::
+
+        async def main():
+            async with AsyncFuncXExecutor(endpoint_id="some-ep-id") as fxe:
+                futs = [fxe.submit(add, i, i) for i in range(1000)]
+                async for fut in fxe.as_completed(futs):
+                    print(fut.task_id, fut.result())
+
+        asyncio.run(main())
+
+    If the AMQP connection is lost, the outstanding futures fail with the
+    connection error; reattach with the (synchronous) FuncXExecutor's
+    ``reload_tasks()``.
+
+    :param endpoint_id: id of the endpoint to which to submit tasks
+    :param container_id: id of the container in which to execute tasks
+    :param funcx_client: instance of FuncXClient to be used by the
+        executor.  If not provided, the executor will instantiate one with
+        default arguments.
+    :param task_group_id: The Task Group to which to associate tasks.  If not
+        set, one will be instantiated.
+    :param label: a label to name the executor
+    :param batch_size: the maximum number of tasks to send upstream at once
+        [min: 1, default: 128]
+    :param max_concurrent_submissions: the maximum number of batches in
+        flight to the web services at once [min: 1, default: 4]
+    :param result_prefetch_count: the maximum number of results the AMQP
+        service sends ahead of their acknowledgement; 0 for no limit.
+        [default: 1024]
+    :param max_unmatched_result_bytes: results that arrive before their
+        futures are watched are kept in memory up to this many bytes, and
+        written to a temporary file beyond that. [default: 64MiB]
+    """
+
+    def __init__(
+        self,
+        endpoint_id: str | None = None,
+        container_id: str | None = None,
+        funcx_client: FuncXClient | None = None,
+        task_group_id: str | None = None,
+        label: str = "",
+        batch_size: int = 128,
+        max_concurrent_submissions: int = 4,
+        result_prefetch_count: int = DEFAULT_RESULT_PREFETCH_COUNT,
+        max_unmatched_result_bytes: int = DEFAULT_MAX_UNMATCHED_BYTES,
+    ):
+        if not funcx_client:
+            funcx_client = FuncXClient()
+        self.funcx_client = funcx_client
+
+        self.endpoint_id = endpoint_id
+        self.container_id = container_id
+        self.label = label
+        self.task_group_id = task_group_id or funcx_client.session_task_group_id
+        self.batch_size = max(1, batch_size)
+        self.max_concurrent_submissions = max(1, max_concurrent_submissions)
+        self.result_prefetch_count = result_prefetch_count
+        self.max_unmatched_result_bytes = max_unmatched_result_bytes
+
+        self.task_count_submitted = 0
+        self._stopped = False
+        self._function_registry: dict[tuple[t.Callable, str | None], str] = {}
+        self._registrations: dict[tuple[t.Callable, str | None], asyncio.Task] = {}
+        self._pending: set[AsyncFuncXFuture] = set()
+
+        # bound to the event loop on first use; see _ensure_started()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks_to_send: asyncio.Queue | None = None
+        self._in_flight: asyncio.Semaphore | None = None
+        self._task_submitter: asyncio.Task | None = None
+        self._senders: set[asyncio.Task] = set()
+        self._result_watcher: _AsyncResultWatcher | None = None
+
+    def __repr__(self) -> str:
+        name = self.__class__.__name__
+        label = self.label and f"{self.label}, " or ""
+        ep_id = self.endpoint_id and f", ep_id:{self.endpoint_id}" or ""
+        c_id = self.container_id and f", c_id:{self.container_id}" or ""
+        tg_id = f", tg_id:{self.task_group_id}"
+        return f"{name}<{label}{self.batch_size}{ep_id}{c_id}{tg_id}>"
+
+    async def __aenter__(self) -> AsyncFuncXExecutor:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.shutdown(wait=True)
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+            self._tasks_to_send = asyncio.Queue()
+            self._in_flight = asyncio.Semaphore(self.max_concurrent_submissions)
+            self._task_submitter = loop.create_task(self._task_submitter_impl())
+        elif self._loop is not loop:
+            raise RuntimeError(f"{self!r} is bound to another event loop")
+        return loop
+
+    def _check_can_submit(self) -> None:
+        if self._stopped:
+            err_fmt = "%s is shutdown; no new functions may be executed"
+            raise RuntimeError(err_fmt % repr(self))
+        if not self.endpoint_id:
+            raise ValueError(
+                "No endpoint_id set.  Did you forget to set it at construction?"
+            )
+
+    async def register_function(
+        self, fn: t.Callable, function_id: str | None = None, **func_register_kwargs
+    ) -> str:
+        """
+        Register a task function (see ``FuncXClient.register_function()``),
+        once per function; ``submit()`` does this as needed.
+
+        :param fn: function to be registered for remote execution
+        :param function_id: if specified, associate the ``function_id`` to the
+            ``fn`` immediately, short-circuiting the upstream registration call.
+        :returns: the function's ``function_id``
+        """
+        key = (fn, self.container_id)
+        if function_id:
+            self._function_registry[key] = function_id
+            return function_id
+        if key in self._function_registry:
+            return self._function_registry[key]
+        return await asyncio.shield(self._registration(fn, **func_register_kwargs))
+
+    def _registration(self, fn: t.Callable, **func_register_kwargs) -> asyncio.Task:
+        """The (one) task registering ``fn``"""
+        key = (fn, self.container_id)
+        if key not in self._registrations:
+            loop = self._ensure_started()
+            reg_kwargs = {
+                "function_name": fn.__name__,
+                "container_uuid": self.container_id,
+            }
+            reg_kwargs.update(func_register_kwargs)
+            self._registrations[key] = loop.create_task(self._register(key, reg_kwargs))
+        return self._registrations[key]
+
+    async def _register(self, key: tuple[t.Callable, str | None], reg_kwargs) -> str:
+        fn = key[0]
+        loop = asyncio.get_running_loop()
+        try:
+            function_id = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    self.funcx_client.register_function, fn, **reg_kwargs
+                ),
+            )
+        except Exception:
+            log.error(f"Unable to register function: {fn.__name__}")
+            self._registrations.pop(key, None)  # so that it may be retried
+            raise
+        self._function_registry[key] = function_id
+        self._registrations.pop(key, None)
+        log.debug("Function registered with id: %s", function_id)
+        return function_id
+
+    def submit(self, fn: t.Callable, *args, **kwargs) -> AsyncFuncXFuture:
+        """
+        Submit a function to be executed on the executor's endpoint as
+        ``fn(*args, **kwargs)``, registering it first if needed.
+
+        Must be called from a coroutine (or callback) on the event loop.
+
+        :returns: a future to await for the result; it receives a ``.task_id``
+            when the funcX web services accept the task
+        """
+        self._check_can_submit()
+        self._ensure_started()
+        key = (fn, self.container_id)
+        function_id: str | asyncio.Task = self._function_registry.get(
+            key
+        ) or self._registration(fn)
+        return self._enqueue(function_id, args, kwargs)
+
+    def submit_to_registered_function(
+        self,
+        function_id: str,
+        args: tuple | None = None,
+        kwargs: dict | None = None,
+    ) -> AsyncFuncXFuture:
+        """
+        Request an execution of an already registered function; see
+        ``FuncXExecutor.submit_to_registered_function()``.
+
+        :returns: a future to await for the result
+        """
+        self._check_can_submit()
+        self._ensure_started()
+        return self._enqueue(function_id, args or (), kwargs or {})
+
+    def _enqueue(
+        self, function_id: str | asyncio.Task, args: tuple, kwargs: dict
+    ) -> AsyncFuncXFuture:
+        """
+        Queue a task for the submitter; ``function_id`` may still be the task
+        registering the function
+        """
+        assert self._loop is not None and self._tasks_to_send is not None
+        fut = AsyncFuncXFuture(loop=self._loop)
+        self._pending.add(fut)
+        fut.add_done_callback(self._pending.discard)
+        self._tasks_to_send.put_nowait((fut, function_id, args, kwargs))
+        return fut
+
+    async def as_completed(
+        self,
+        futures: t.Iterable[asyncio.Future] | None = None,
+        timeout: float | None = None,
+    ) -> t.AsyncIterator[asyncio.Future]:
+        """
+        Yield futures as they complete, for use with ``async for``.
+
+        :param futures: the futures to wait for [default: all of this
+            executor's futures not yet done]
+        :param timeout: the most seconds to wait for the next future
+        :raises asyncio.TimeoutError: if no future completes within ``timeout``
+        """
+        if futures is None:
+            futures = list(self._pending)
+        futures = set(futures)
+
+        completed: asyncio.Queue[asyncio.Future] = asyncio.Queue()
+        for fut in futures:
+            fut.add_done_callback(completed.put_nowait)
+        try:
+            for _ in range(len(futures)):
+                yield await asyncio.wait_for(completed.get(), timeout)
+        finally:
+            for fut in futures:
+                fut.remove_done_callback(completed.put_nowait)
+
+    async def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        """
+        Stop accepting tasks, send those already submitted, and (if ``wait``)
+        wait for their results before closing the AMQP connection.
+
+        :param wait: wait for the outstanding futures to complete
+        :param cancel_futures: cancel the outstanding futures
+        """
+        self._stopped = True
+        if self._task_submitter is not None:
+            assert self._tasks_to_send is not None
+            self._tasks_to_send.put_nowait(None)
+            await self._task_submitter
+
+        if cancel_futures:
+            for fut in list(self._pending):
+                fut.cancel()
+        if wait and self._pending:
+            await asyncio.wait(list(self._pending))
+
+        if self._result_watcher is not None:
+            await self._result_watcher.close()
+            self._result_watcher = None
+
+    async def _task_submitter_impl(self) -> None:
+        """
+        Coalesce submitted tasks, up to ``batch_size``, into batches, and
+        hand them off to be sent (up to ``max_concurrent_submissions`` at a
+        time).  Stops once it receives ``None`` (see ``shutdown()``), after the
+        batches in flight are sent.
+        """
+        assert self._tasks_to_send is not None and self._in_flight is not None
+        loop = asyncio.get_running_loop()
+        to_send = self._tasks_to_send
+        stopping = False
+        while not stopping:
+            item = await to_send.get()
+            if item is None:
+                break
+
+            items = [item]
+            await asyncio.sleep(0)  # let callbacks already scheduled submit too
+            while len(items) < self.batch_size:
+                try:
+                    item = to_send.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                items.append(item)
+
+            await self._in_flight.acquire()
+            sender = loop.create_task(self._send_batch(items))
+            self._senders.add(sender)
+            sender.add_done_callback(self._senders.discard)
+
+        if self._senders:
+            await asyncio.gather(*self._senders, return_exceptions=True)
+
+    async def _send_batch(self, items: list) -> None:
+        assert self._in_flight is not None
+        loop = asyncio.get_running_loop()
+        futs: list[AsyncFuncXFuture] = []
+        tasks: list[tuple[str, tuple, dict]] = []
+        try:
+            for fut, function_id, args, kwargs in items:
+                if fut.done():  # e.g., cancelled before it was sent
+                    continue
+                if not isinstance(function_id, str):
+                    try:
+                        function_id = await function_id
+                    except Exception as exc:
+                        if not fut.done():
+                            fut.set_exception(exc)
+                        continue
+                futs.append(fut)
+                tasks.append((function_id, args, kwargs))
+
+            if not tasks:
+                return
+
+            log.info(f"Submitting tasks to funcX: {len(tasks)}")
+            try:
+                task_ids = await loop.run_in_executor(None, self._batch_run, tasks)
+            except Exception as exc:
+                log.error(f"Error submitting {len(tasks)} tasks to funcX")
+                for fut in futs:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                return
+        finally:
+            self._in_flight.release()
+
+        self.task_count_submitted += len(task_ids)
+        for fut, task_id in zip(futs, task_ids):
+            fut.task_id = task_id
+        self._watch_futures(futs)
+
+    def _batch_run(self, tasks: list[tuple[str, tuple, dict]]) -> list[str]:
+        """Serialize and send a batch of tasks; runs in the default executor"""
+        batch = self.funcx_client.create_batch(
+            task_group_id=self.task_group_id, create_websocket_queue=True
+        )
+        for function_id, args, kwargs in tasks:
+            batch.add(function_id, self.endpoint_id, args, kwargs)
+        return self.funcx_client.batch_run(batch)
+
+    def _watch_futures(self, futs: list[AsyncFuncXFuture]) -> None:
+        if self._result_watcher is None:
+            self._result_watcher = _AsyncResultWatcher(
+                self,
+                prefetch_count=self.result_prefetch_count,
+                max_unmatched_bytes=self.max_unmatched_result_bytes,
+            )
+        self._result_watcher.watch_for_task_results(futs)
+
+
+class _AsyncResultWatcher:
+    """
+    The AsyncFuncXExecutor's AMQP result consumer: matches result messages to
+    futures on the event loop, as either arrives.  Like the _ResultWatcher,
+    messages are acknowledged in bulk, once ``ack_batch_size`` are outstanding
+    or ``ack_interval_s`` after the first of them arrived, and results of at
+    least ``inline_decode_bytes`` are deserialized in the loop's default
+    executor rather than on the loop itself.  Also like the _ResultWatcher,
+    the AMQP service sends at most ``prefetch_count`` messages (or
+    ``prefetch_size`` bytes) ahead of their acknowledgement, and results that
+    arrive before their futures are watched are kept in memory up to
+    ``max_unmatched_bytes``, and beyond that in a temporary file (see
+    ``_SpilledResults``).
+
+    The connection is opened when the first futures are watched.
+    """
+
+    def __init__(
+        self,
+        funcx_executor: AsyncFuncXExecutor,
+        prefetch_count=DEFAULT_RESULT_PREFETCH_COUNT,
+        prefetch_size=0,
+        ack_batch_size=100,
+        ack_interval_s=0.1,
+        inline_decode_bytes=DEFAULT_INLINE_DECODE_BYTES,
+        max_unmatched_bytes=DEFAULT_MAX_UNMATCHED_BYTES,
+        spill_dir: str | None = None,
+    ):
+        self.funcx_executor = funcx_executor
+        self.prefetch_count = max(0, prefetch_count)
+        self.prefetch_size = max(0, prefetch_size)
+        self.ack_batch_size = max(1, ack_batch_size)
+        if self.prefetch_count:
+            self.ack_batch_size = min(self.ack_batch_size, self.prefetch_count)
+        self.ack_interval_s = ack_interval_s
+        self.inline_decode_bytes = inline_decode_bytes
+
+        self._open_futures: dict[str, AsyncFuncXFuture] = {}
+        self._received_results: dict[str, tuple[BasicProperties, Result]] = {}
+        self._received_bytes = 0
+        self._spilled = _SpilledResults(spill_dir)
+        self.max_unmatched_bytes = max_unmatched_bytes
+        self._to_ack: list[int] = []
+        self._ack_timer: asyncio.TimerHandle | None = None
+
+        self._connection: AsyncioConnection | None = None
+        self._channel: Channel | None = None
+        self._connector: asyncio.Task | None = None
+        self._connection_closed: asyncio.Future | None = None
+        self._closing = False
+        self._failure: Exception | None = None  # why results can no longer arrive
+
+    def watch_for_task_results(self, futures: t.Iterable[AsyncFuncXFuture]) -> int:
+        """
+        Add futures to the watch list, completing right away those whose
+        results already arrived.
+
+        :returns: number of futures added to the watch list
+        """
+        added = 0
+        for fut in futures:
+            if not fut.task_id or fut.done() or fut.task_id in self._open_futures:
+                continue
+            if self._failure is not None:
+                fut.set_exception(self._failure)
+                continue
+            self._open_futures[fut.task_id] = fut
+            added += 1
+            if fut.task_id in self._received_results or fut.task_id in self._spilled:
+                self._complete(fut.task_id)
+
+        if self._connector is None and self._open_futures:
+            loop = asyncio.get_running_loop()
+            self._connector = loop.create_task(self._connect())
+        return added
+
+    async def _connect(self) -> None:
+        loop = asyncio.get_running_loop()
+        client = self.funcx_executor.funcx_client
+        try:
+            res = await loop.run_in_executor(None, client.get_result_amqp_url)
+            queue = f"{res['queue_prefix']}{self.funcx_executor.task_group_id}"
+
+            opened = loop.create_future()
+            self._connection_closed = loop.create_future()
+
+            def _on_open_failed(_conn, exc):
+                if not opened.done():
+                    opened.set_exception(
+                        exc if isinstance(exc, BaseException) else Exception(str(exc))
+                    )
+
+            self._connection = AsyncioConnection(
+                pika.URLParameters(res["connection_url"]),
+                on_open_callback=opened.set_result,
+                on_open_error_callback=_on_open_failed,
+                on_close_callback=self._on_connection_closed,
+                custom_ioloop=loop,
+            )
+            await opened
+
+            channel_opened = loop.create_future()
+            self._connection.channel(on_open_callback=channel_opened.set_result)
+            self._channel = await channel_opened
+            if self.prefetch_count or self.prefetch_size:
+                self._channel.basic_qos(
+                    prefetch_size=self.prefetch_size,
+                    prefetch_count=self.prefetch_count,
+                )
+            self._channel.basic_consume(
+                queue=queue, on_message_callback=self._on_message
+            )
+            log.debug("%r consuming results from %s", self, queue)
+        except Exception as exc:
+            log.error(f"Unable to consume results: {exc}")
+            self._fail_open_futures(exc)
+
+    def _on_connection_closed(self, _conn, exc: BaseException) -> None:
+        self._channel = None
+        if self._connection_closed and not self._connection_closed.done():
+            self._connection_closed.set_result(None)
+        if not self._closing:
+            log.warning(f"AMQP connection closed unexpectedly: {exc}")
+            self._fail_open_futures(exc)
+
+    def _fail_open_futures(self, exc: BaseException) -> None:
+        if not isinstance(exc, Exception):
+            exc = Exception(str(exc))
+        self._failure = exc
+        while self._open_futures:
+            _, fut = self._open_futures.popitem()
+            if not fut.done():
+                fut.set_exception(exc)
+
+    def _on_message(
+        self,
+        channel: Channel,
+        basic_deliver: Basic.Deliver,
+        props: BasicProperties,
+        body: bytes,
+    ) -> None:
+        msg_id: int = basic_deliver.delivery_tag
+        try:
+            res = messagepack.unpack(body)
+            if not isinstance(res, Result):
+                raise TypeError(f"Non-Result object received ({type(res)})")
+            task_id = str(res.task_id)
+        except Exception:
+            log.exception("Invalid message type queue put failed")
+            channel.basic_nack(msg_id, requeue=True)
+            return
+
+        self._to_ack.append(msg_id)
+        if task_id in self._open_futures:
+            self._received_results[task_id] = (props, res)
+            self._received_bytes += len(res.data)
+            self._complete(task_id)
+        elif self._received_bytes + len(res.data) > self.max_unmatched_bytes:
+            self._spilled.put(task_id, body, props.timestamp if props else None)
+        else:
+            self._received_results[task_id] = (props, res)
+            self._received_bytes += len(res.data)
+        self._schedule_ack()
+
+    def _complete(self, task_id: str) -> None:
+        fut = self._open_futures.pop(task_id)
+        if task_id in self._received_results:
+            props, res = self._received_results.pop(task_id)
+            self._received_bytes -= len(res.data)
+        else:
+            props, res, _arrived = self._spilled.pop(task_id)
+        if fut.done():
+            return
+
+        if res.is_error:
+            timestamp = props.timestamp if props else None
+            fut.set_exception(FuncxTaskExecutionFailed(res.data, str(timestamp or 0)))
+        elif len(res.data) < self.inline_decode_bytes:
+            self._set_result(fut, res.data)
+        else:
+            asyncio.get_running_loop().create_task(self._decode_in_executor(fut, res))
+
+    async def _decode_in_executor(self, fut: AsyncFuncXFuture, res: Result) -> None:
+        deserialize = self.funcx_executor.funcx_client.fx_serializer.deserialize
+        loop = asyncio.get_running_loop()
+        try:
+            value = await loop.run_in_executor(None, deserialize, res.data)
+        except Exception as exc:
+            self._set_malformed(fut, res.data, exc)
+        else:
+            if not fut.done():
+                fut.set_result(value)
+
+    def _set_result(self, fut: AsyncFuncXFuture, data: str) -> None:
+        deserialize = self.funcx_executor.funcx_client.fx_serializer.deserialize
+        try:
+            fut.set_result(deserialize(data))
+        except Exception as exc:
+            self._set_malformed(fut, data, exc)
+
+    @staticmethod
+    def _set_malformed(fut: AsyncFuncXFuture, data: str, exc: Exception) -> None:
+        if fut.done():
+            return
+        task_exc = Exception(f"Malformed or unexpected data structure. Data: {data}")
+        task_exc.__cause__ = exc
+        fut.set_exception(task_exc)
+
+    def _schedule_ack(self) -> None:
+        if len(self._to_ack) >= self.ack_batch_size:
+            self._ack_received()
+        elif self._ack_timer is None:
+            loop = asyncio.get_running_loop()
+            self._ack_timer = loop.call_later(self.ack_interval_s, self._on_ack_timer)
+
+    def _on_ack_timer(self) -> None:
+        self._ack_timer = None
+        self._ack_received()
+
+    def _ack_received(self) -> None:
+        """Acknowledge, in one go, all received messages not yet acknowledged"""
+        if self._to_ack and self._channel is not None and self._channel.is_open:
+            latest_msg_id = max(self._to_ack)
+            self._channel.basic_ack(latest_msg_id, multiple=True)
+            log.debug("%r Acknowledged through message: %s", self, latest_msg_id)
+        self._to_ack.clear()
+
+    async def close(self) -> None:
+        """Acknowledge outstanding messages, and close the connection"""
+        self._closing = True
+        if self._ack_timer is not None:
+            self._ack_timer.cancel()
+            self._ack_timer = None
+        if self._connector is not None and not self._connector.done():
+            self._connector.cancel()
+
+        self._ack_received()
+        self._spilled.close()
+        connection = self._connection
+        if connection is None:
+            return
+        if connection.is_open:
+            connection.close()
+        if self._connection_closed is not None and not connection.is_closed:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._connection_closed), 10)
+            except asyncio.TimeoutError:
+                log.warning("Timed out closing the AMQP connection")
+        self._connection = None
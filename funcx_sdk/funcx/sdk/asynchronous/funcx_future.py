@@ -1,11 +1,19 @@
+import threading
 import typing as t
 from concurrent.futures import Future
 
+if t.TYPE_CHECKING:
+    from funcx.sdk.task_timeline import TaskTimeline
+
 
 class FuncXFuture(Future):
     """
     Extend `concurrent.futures.Future`_ to include an optional task UUID.
 
+    A future may also be completed with a task's *serialized* result (see
+    ``set_serialized_result()``), which is then only deserialized the first time
+    ``.result()`` is called, and may be read as-is with ``result_bytes()``.
+
     .. _concurrent.futures.Future: https://docs.python.org/3/library/concurrent.futures.html#concurrent.futures.Future
     """  # noqa
 
@@ -14,6 +22,78 @@ class FuncXFuture(Future):
     not be populated immediately, but will appear later when the task is
     submitted to the FuncX services."""
 
+    timeline: t.Optional["TaskTimeline"]
+    """The stages the task went through, and when; only recorded if the
+    executor was created with ``track_latency=True``."""
+
     def __init__(self, task_id: t.Optional[str] = None):
         super().__init__()
         self.task_id = task_id
+        self.timeline = None
+
+        self._lazy = False
+        self._serialized_result: t.Union[str, bytes, None] = None
+        self._deserialize: t.Optional[t.Callable[[t.Any], t.Any]] = None
+        self._materialize_lock = threading.Lock()
+        self._materialized: t.Any = None
+        self._materialize_error: t.Optional[BaseException] = None
+
+        # (a weak reference to) the CompletionStream waiting for this future,
+        # if any; weak, so that an abandoned stream may be collected
+        self._completion_stream: t.Any = None
+
+        # the FuncXExecutor's result cache key for this task, if memoized, and
+        # whether to look up its result before the task is sent
+        self._result_cache_key: t.Optional[str] = None
+        self._result_cache_lookup = False
+
+    def set_serialized_result(
+        self, payload: t.Union[str, bytes], deserialize: t.Callable[[t.Any], t.Any]
+    ) -> None:
+        """
+        Complete the future with a serialized result, to be deserialized (with
+        ``deserialize``) on the first call to ``.result()``.  Done callbacks
+        and waiters are notified right away.
+        """
+        self._lazy = True
+        self._serialized_result = payload
+        self._deserialize = deserialize
+        super().set_result(None)
+
+    def result(self, timeout: t.Optional[float] = None) -> t.Any:
+        value = super().result(timeout)
+        if not self._lazy:
+            return value
+
+        with self._materialize_lock:
+            if self._deserialize is not None:
+                try:
+                    self._materialized = self._deserialize(self._serialized_result)
+                except Exception as exc:
+                    self._materialize_error = exc
+                # the payload is no longer needed
+                self._serialized_result = self._deserialize = None
+
+        if self._materialize_error is not None:
+            raise self._materialize_error
+        return self._materialized
+
+    def result_bytes(self, timeout: t.Optional[float] = None) -> t.Union[str, bytes]:
+        """
+        Return the task's serialized result, without deserializing it; e.g., to
+        pass it on to another task or store it.  Like ``.result()``, waits up
+        to ``timeout`` seconds for the task to complete, and raises its
+        exception if it failed.
+
+        :raises ValueError: if the future was not completed with a serialized
+            result, or if ``.result()`` was already called (which releases
+            the payload)
+        """
+        super().result(timeout)
+        with self._materialize_lock:
+            if self._serialized_result is None:
+                raise ValueError(
+                    "No serialized result available: the result was "
+                    "deserialized already"
+                )
+            return self._serialized_result
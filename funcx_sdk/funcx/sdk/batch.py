@@ -3,21 +3,51 @@ from __future__ import annotations
 import typing as t
 
 from funcx.serialize import FuncXSerializer
+from funcx.serialize.shared import SHARED_ARGUMENT_THRESHOLD, payload_digest
 
 
 class Batch:
     """Utility class for creating batch submission in funcX"""
 
-    def __init__(self, task_group_id: str | None = None, create_websocket_queue=False):
+    def __init__(
+        self,
+        task_group_id: str | None = None,
+        create_websocket_queue=False,
+        serializer: FuncXSerializer | None = None,
+        share_arguments: bool = False,
+    ):
         """
         Parameters
         ==========
 
         task_group_id : str
             UUID indicating the task group that this batch belongs to
+        serializer : FuncXSerializer
+            The serializer for the arguments; sharing one (e.g., the client's)
+            across batches lets it reuse what it learned about argument types.
+            Default: a new FuncXSerializer
+        share_arguments : bool
+            If True, large arguments (positional, or keyword values) passed to
+            several tasks of this batch are serialized only once, and
+            deserialized only once per worker: the tasks on a worker receive
+            the same object, and so must not modify it.  Arguments are shared
+            if they are the same object, or serialize identically.  This
+            saves serialization and deserialization, not upload bytes: the
+            web service delivers each task on its own, so every task still
+            carries the payloads of its arguments.  Requires endpoints recent
+            enough to read shared arguments.
+            Default: False
         """
         self.tasks: list[tuple[str, str, str]] = []
-        self.fx_serializer = FuncXSerializer()
+        # total size of the serialized task payloads, in characters
+        self.payload_size = 0
+        self.share_arguments = share_arguments
+        # id(argument) -> (argument, payload, digest), for shared arguments; the
+        # argument is kept so that its id is not reused while the batch lives
+        self._shared: dict[int, tuple[t.Any, str, str]] = {}
+        if serializer is None:
+            serializer = FuncXSerializer()
+        self.fx_serializer = serializer
         self.task_group_id = task_group_id
         self.create_websocket_queue = create_websocket_queue
 
@@ -49,11 +79,48 @@ class Batch:
             args = ()
         if kwargs is None:
             kwargs = {}
-        ser_args = self.fx_serializer.serialize(args)
-        ser_kwargs = self.fx_serializer.serialize(kwargs)
+        ser_args = ser_kwargs = None
+        if self.share_arguments:
+            ser_args = self._serialize_shared(args)
+            ser_kwargs = self._serialize_shared(kwargs)
+        if ser_args is None:
+            ser_args = self.fx_serializer.serialize(args)
+        if ser_kwargs is None:
+            ser_kwargs = self.fx_serializer.serialize(kwargs)
         payload = self.fx_serializer.pack_buffers([ser_args, ser_kwargs])
 
         self.tasks.append((function_id, endpoint_id, payload))
+        self.payload_size += len(payload)
+
+    def _serialize_argument(self, arg) -> tuple[str, str | None]:
+        known = self._shared.get(id(arg))
+        if known is not None and known[0] is arg:
+            return known[1], known[2]
+
+        payload = self.fx_serializer.serialize(arg)
+        if not isinstance(payload, str) or len(payload) < SHARED_ARGUMENT_THRESHOLD:
+            return payload, None
+        digest = payload_digest(payload)
+        self._shared[id(arg)] = (arg, payload, digest)
+        return payload, digest
+
+    def _serialize_shared(self, args: tuple | dict) -> str | None:
+        """Serialize the arguments one by one, if any is large enough to share;
+        else return None"""
+        if not args:
+            return None
+        if isinstance(args, dict):
+            keys: list[str] | None = list(args)
+            values = list(args.values())
+        else:
+            keys, values = None, list(args)
+
+        payloads = [self._serialize_argument(value) for value in values]
+        if not any(digest for _, digest in payloads):
+            return None
+        if not all(isinstance(payload, str) for payload, _ in payloads):
+            return None  # shared arguments are packed as text
+        return self.fx_serializer.shared_arguments.serialize(payloads, keys=keys)
 
     def prepare(self) -> dict[str, str | list[tuple[str, str, str]]]:
         """Prepare the payloads to be post to web service in a batch
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import json
 import logging
 import os
@@ -16,7 +17,17 @@ from funcx.sdk._environments import (
 )
 from funcx.sdk.asynchronous.funcx_task import FuncXTask
 from funcx.sdk.asynchronous.ws_polling_task import WebSocketPollingTask
+from funcx.sdk.registration_cache import (
+    REGISTRATION_CACHE_FILENAME,
+    FunctionRegistrationCache,
+)
 from funcx.sdk.search import SearchHelper
+from funcx.sdk.task_status_cache import (
+    DEFAULT_TASK_CACHE_BYTES,
+    DEFAULT_TASK_CACHE_SIZE,
+    TaskStatusCache,
+)
+from funcx.sdk.utils import chunk_by
 from funcx.sdk.web_client import FunctionRegistrationData
 from funcx.serialize import FuncXSerializer
 from funcx.version import __version__, compare_versions
@@ -28,6 +39,11 @@ logger = logging.getLogger(__name__)
 
 _FUNCX_HOME = os.path.join("~", ".funcx")
 
+# Task statuses are fetched this many task ids at a time, by up to this many
+# threads at once
+DEFAULT_BATCH_STATUS_CHUNK_SIZE = 1024
+DEFAULT_BATCH_STATUS_WORKERS = 4
+
 
 class FuncXClient:
     """Main class for interacting with the funcX service
@@ -60,6 +76,10 @@ class FuncXClient:
         fx_authorizer: t.Any = None,
         *,
         login_manager: LoginManagerProtocol | None = None,
+        use_registration_cache: bool = False,
+        task_cache_size: int | None = DEFAULT_TASK_CACHE_SIZE,
+        task_cache_bytes: int | None = DEFAULT_TASK_CACHE_BYTES,
+        task_cache_ttl: float | None = None,
         **kwargs,
     ):
         """
@@ -118,6 +138,31 @@ class FuncXClient:
             session or to reestablish FuncXExecutor futures.
             Default: None (will be auto generated)
 
+        use_registration_cache: bool
+            Remember function registrations in ``funcx_home``, so that
+            registering the same function again (also from another process)
+            reuses its function id rather than registering it upstream.
+            Registrations are remembered per authenticated identity, which is
+            looked up (once) on the first registration.
+            Default: False
+
+        task_cache_size: int
+            The most completed tasks (statuses and results) to remember, so
+            that ``get_task``, ``get_result``, and ``get_batch_result`` do not
+            fetch them again; the least recently used are forgotten first.
+            None for no limit, 0 to remember none.
+            Default: 10,000
+
+        task_cache_bytes: int
+            The most bytes of (serialized) results to remember.  None for no
+            limit.
+            Default: 256MiB
+
+        task_cache_ttl: float
+            Forget remembered tasks not asked for in this many seconds.  None to
+            forget them only to make room.
+            Default: None
+
         Keyword arguments are the same as for BaseClient.
 
         """
@@ -125,8 +170,22 @@ class FuncXClient:
         if funcx_service_address is None:
             funcx_service_address = get_web_service_url(environment)
 
-        self._task_status_table: t.Dict[str, t.Dict] = {}
+        self._task_status_table = TaskStatusCache(
+            max_entries=task_cache_size, max_bytes=task_cache_bytes, ttl=task_cache_ttl
+        )
         self.funcx_home = os.path.expanduser(funcx_home)
+        self.registration_cache: FunctionRegistrationCache | None = None
+        if use_registration_cache:
+            self.registration_cache = FunctionRegistrationCache(
+                os.path.join(self.funcx_home, REGISTRATION_CACHE_FILENAME)
+            )
+        # function_id -> (cache key, registration), of the function ids this
+        # client took from the registration cache; to register them anew if
+        # they are not found upstream
+        self._cached_registrations: dict[str, tuple[str, FunctionRegistrationData]] = {}
+        # function ids not found upstream -> the ids they were registered anew as
+        self._reregistered_functions: dict[str, str] = {}
+        self._identity_id: str | None = None
         self.session_task_group_id = (
             task_group_id and str(task_group_id) or str(uuid.uuid4())
         )
@@ -228,7 +287,7 @@ class FuncXClient:
     def _update_task_table(self, return_msg: str | t.Dict, task_id: str):
         """
         Parses the return message from the service and updates the
-        internal _task_status_table
+        internal _task_status_table (completed tasks only)
 
         Parameters
         ----------
@@ -246,6 +305,7 @@ class FuncXClient:
         r_status = r_dict.get("status", "unknown").lower()
         pending = r_status not in ("success", "failed")
         status = {"pending": pending, "status": r_status}
+        nbytes = 0
 
         if not pending:
             if "result" not in r_dict and "exception" not in r_dict:
@@ -258,12 +318,13 @@ class FuncXClient:
                     raise SerializationError("Result Object Deserialization")
                 else:
                     status.update({"result": r_obj, "completion_t": completion_t})
+                    nbytes = len(r_dict["result"])
             elif "exception" in r_dict:
                 raise FuncxTaskExecutionFailed(r_dict["exception"], completion_t)
             else:
                 raise NotImplementedError("unreachable")
 
-        self._task_status_table[task_id] = status
+        self._task_status_table.put(task_id, status, nbytes)
         return status
 
     @requires_login
@@ -280,10 +341,13 @@ class FuncXClient:
         dict
             Task block containing "status" key.
         """
-        task = self._task_status_table.get(task_id, {})
-        if task.get("pending", True) is False:
+        task = self._task_status_table.get(task_id)
+        if task is not None and "result" in task:
             return task
+        # unknown, or its result was taken by get_result()
+        return self._fetch_task(task_id)
 
+    def _fetch_task(self, task_id):
         r = self.web_client.get_task(task_id)
         logger.debug(f"Response string : {r}")
         rets = self._update_task_table(r.text, task_id)
@@ -306,7 +370,10 @@ class FuncXClient:
         ------
         Exception obj: Exception due to which the task failed
         """
-        task = self.get_task(task_id)
+        task = self._task_status_table.get(task_id, drop_result=True)
+        if task is None or "result" not in task:
+            # unknown, or the cache kept only the status once the result was read
+            task = self._fetch_task(task_id)
         if task["pending"] is True:
             raise TaskPending(task["status"])
         else:
@@ -317,43 +384,112 @@ class FuncXClient:
                 task["exception"].reraise()
 
     @requires_login
-    def get_batch_result(self, task_id_list):
-        """Request status for a batch of task_ids"""
-        assert isinstance(
-            task_id_list, list
-        ), "get_batch_result expects a list of task ids"
+    def get_batch_result(
+        self,
+        task_id_list,
+        chunk_size: int = DEFAULT_BATCH_STATUS_CHUNK_SIZE,
+        max_workers: int = DEFAULT_BATCH_STATUS_WORKERS,
+    ):
+        """Request status for a batch of task_ids
 
-        pending_task_ids = [
-            task_id
-            for task_id in task_id_list
-            if self._task_status_table.get(task_id, {}).get("pending", True) is True
-        ]
+        Parameters
+        ----------
+        task_id_list : list
+            UUIDs of the tasks
+        chunk_size : int
+            Fetch the status of this many tasks per request
+        max_workers : int
+            Fetch (and deserialize the results of) up to this many chunks at a
+            time
 
+        Returns
+        -------
+        dict
+            Task blocks (see ``get_task()``), by task id
+        """
         results = {}
+        for chunk_results in self.iter_batch_result(
+            task_id_list, chunk_size=chunk_size, max_workers=max_workers
+        ):
+            results.update(chunk_results)
+
+        # in the order asked for, as before
+        return {
+            task_id: results[task_id] for task_id in task_id_list if task_id in results
+        }
 
-        if pending_task_ids:
-            r = self.web_client.get_batch_status(pending_task_ids)
-            logger.debug(f"Response string : {r}")
-
-        pending_task_ids = set(pending_task_ids)
+    @requires_login
+    def iter_batch_result(
+        self,
+        task_id_list,
+        chunk_size: int = DEFAULT_BATCH_STATUS_CHUNK_SIZE,
+        max_workers: int = DEFAULT_BATCH_STATUS_WORKERS,
+    ) -> t.Iterator[t.Dict[str, t.Dict]]:
+        """Request status for a batch of task_ids, chunk by chunk
+
+        Like ``get_batch_result()``, but yields the task blocks of each chunk
+        of tasks as soon as it arrives (in no particular order), rather than
+        all of them after the last.  Tasks already known to be complete come
+        first, in one chunk.
+        """
+        assert isinstance(
+            task_id_list, list
+        ), "get_batch_result expects a list of task ids"
 
+        known = {}
+        pending_task_ids = []
         for task_id in task_id_list:
-            if task_id in pending_task_ids:
-                try:
-                    data = r["results"][task_id]
-                    rets = self._update_task_table(data, task_id)
-                    results[task_id] = rets
-                except KeyError:
-                    logger.debug("Task {} info was not available in the batch status")
-                except Exception:
-                    logger.exception(
-                        "Failure while unpacking results fom get_batch_result"
-                    )
+            task = self._task_status_table.get(task_id)
+            if task is None or "result" not in task:
+                # unknown, or its result was taken by get_result()
+                pending_task_ids.append(task_id)
             else:
-                results[task_id] = self._task_status_table[task_id]
+                # looked up once: the entry may be evicted before we are done
+                known[task_id] = task
+        if known:
+            yield known
+
+        chunks = list(chunk_by(pending_task_ids, max(1, chunk_size)))
+        if len(chunks) <= 1 or max_workers <= 1:
+            for chunk in chunks:
+                yield self._fetch_batch_status(chunk)
+            return
+
+        pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(max_workers, len(chunks)),
+            thread_name_prefix="FuncXClient-status",
+        )
+        fetches = [pool.submit(self._fetch_batch_status, chunk) for chunk in chunks]
+        try:
+            for fetch in concurrent.futures.as_completed(fetches):
+                yield fetch.result()
+        finally:
+            for fetch in fetches:
+                fetch.cancel()
+            pool.shutdown(wait=False)
+
+    def _fetch_batch_status(self, task_ids: t.Sequence[str]) -> t.Dict[str, t.Dict]:
+        r = self.web_client.get_batch_status(list(task_ids))
+        logger.debug(f"Response string : {r}")
 
+        results = {}
+        for task_id in task_ids:
+            try:
+                data = r["results"][task_id]
+                rets = self._update_task_table(data, task_id)
+                results[task_id] = rets
+            except KeyError:
+                logger.debug(
+                    f"Task {task_id} info was not available in the batch status"
+                )
+            except Exception:
+                logger.exception("Failure while unpacking results fom get_batch_result")
         return results
 
+    def task_cache_stats(self) -> t.Dict[str, int]:
+        """Hits, misses, evictions, and size of the completed task cache"""
+        return self._task_status_table.stats()
+
     @requires_login
     def run(self, *args, endpoint_id=None, function_id=None, **kwargs) -> str:
         """Initiate an invocation
@@ -387,7 +523,9 @@ class FuncXClient:
 
         return r[0]
 
-    def create_batch(self, task_group_id=None, create_websocket_queue=False) -> Batch:
+    def create_batch(
+        self, task_group_id=None, create_websocket_queue=False, share_arguments=False
+    ) -> Batch:
         """
         Create a Batch instance to handle batch submission in funcX
 
@@ -404,6 +542,10 @@ class FuncXClient:
             Whether to create a websocket queue for the task_group_id if
             it isn't already created
 
+        share_arguments : bool
+            Whether to serialize large arguments shared by several tasks of the
+            batch only once (each task still uploads them); see Batch
+
         Returns
         -------
         Batch instance
@@ -413,7 +555,10 @@ class FuncXClient:
             task_group_id = self.session_task_group_id
 
         return Batch(
-            task_group_id=task_group_id, create_websocket_queue=create_websocket_queue
+            task_group_id=task_group_id,
+            create_websocket_queue=create_websocket_queue,
+            serializer=self.fx_serializer,
+            share_arguments=share_arguments,
         )
 
     @requires_login
@@ -431,13 +576,21 @@ class FuncXClient:
         assert isinstance(batch, Batch), "Requires a Batch object as input"
         assert len(batch.tasks) > 0, "Requires a non-empty batch"
 
+        if self._reregistered_functions:
+            batch.tasks = [
+                (self._reregistered_functions.get(fn_id, fn_id), ep_id, payload)
+                for fn_id, ep_id, payload in batch.tasks
+            ]
         data = batch.prepare()
 
         # Send the data to funcX
         r = self.web_client.submit(data)
+        results = r["results"]
+        if self._cached_registrations:
+            results = self._resubmit_unknown_functions(batch, results)
 
         task_uuids: t.List[str] = []
-        for result in r["results"]:
+        for result in results:
             task_id = result["task_uuid"]
             task_uuids.append(task_id)
             if not (200 <= result["http_status_code"] < 300):
@@ -468,6 +621,44 @@ class FuncXClient:
 
         return task_uuids
 
+    def _resubmit_unknown_functions(
+        self, batch: Batch, results: list[dict[str, t.Any]]
+    ) -> list[dict[str, t.Any]]:
+        """
+        Resubmit the tasks rejected as not found whose function ids came from
+        the registration cache (e.g., the function was deleted upstream), after
+        evicting those ids and registering the functions anew.  Return the
+        results, with those of the resubmitted tasks replaced.
+        """
+        missing = [
+            i
+            for i, result in enumerate(results)
+            if result.get("http_status_code") == 404
+            and batch.tasks[i][0] in self._cached_registrations
+        ]
+        if not missing:
+            return results
+
+        for i in missing:
+            fn_id, ep_id, payload = batch.tasks[i]
+            if fn_id not in self._reregistered_functions:
+                cache_key, data = self._cached_registrations.pop(fn_id)
+                logger.info(f"Function {fn_id} not found; registering it again")
+                if self.registration_cache is not None:
+                    self.registration_cache.clear(fn_id)
+                new_id = self._register_upstream(data, cache_key)
+                self._reregistered_functions[fn_id] = new_id
+            batch.tasks[i] = (self._reregistered_functions[fn_id], ep_id, payload)
+
+        data = batch.prepare()
+        data["tasks"] = [batch.tasks[i] for i in missing]
+        r = self.web_client.submit(data)
+
+        results = list(results)
+        for i, result in zip(missing, r["results"]):
+            results[i] = result
+        return results
+
     @requires_login
     def register_endpoint(
         self,
@@ -634,6 +825,10 @@ class FuncXClient:
         -------
         function uuid : str
             UUID identifier for the registered function
+
+        Registrations are remembered in the client's ``registration_cache`` (if
+        enabled), and identical registrations by the same identity reuse the
+        earlier function id.
         """
         data = FunctionRegistrationData(
             function=function,
@@ -645,9 +840,42 @@ class FuncXClient:
             searchable=searchable,
             serializer=self.fx_serializer,
         )
+        cache, cache_key = self.registration_cache, None
+        identity_id = self._get_identity_id() if cache is not None else None
+        if cache is not None and identity_id is not None:
+            cache_key = cache.key(self.funcx_service_address, identity_id, data)
+            function_id = cache.get(cache_key)
+            if function_id is not None:
+                logger.debug(f"Function previously registered as {function_id}")
+                self._cached_registrations[function_id] = (cache_key, data)
+                return function_id
+
+        return self._register_upstream(data, cache_key)
+
+    def _register_upstream(
+        self, data: FunctionRegistrationData, cache_key: str | None
+    ) -> str:
         logger.info(f"Registering function : {data}")
         r = self.web_client.register_function(data)
-        return r.data["function_uuid"]
+        function_id = r.data["function_uuid"]
+        if self.registration_cache is not None and cache_key is not None:
+            self.registration_cache.put(cache_key, function_id)
+        return function_id
+
+    def _get_identity_id(self) -> str | None:
+        """The id of the authenticated identity, to key the registration cache
+        by; None (and registrations are not cached) if it cannot be found"""
+        if self._identity_id is None:
+            try:
+                userinfo = self.login_manager.get_auth_client().oauth2_userinfo()
+                self._identity_id = str(userinfo["sub"])
+            except Exception as e:
+                logger.warning(
+                    f"Unable to look up the user identity; not caching "
+                    f"function registrations: {e}"
+                )
+                self._identity_id = ""
+        return self._identity_id or None
 
     @requires_login
     def search_function(self, q, offset=0, limit=10, advanced=False):
@@ -0,0 +1,196 @@
+"""
+A stream of completed FuncXFutures, in the order they complete, fed in batches
+by the FuncXExecutor's result watcher rather than by waiters installed on every
+future (as with ``concurrent.futures.as_completed``).
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+import typing as t
+import weakref
+
+if t.TYPE_CHECKING:
+    from funcx.sdk.asynchronous.funcx_future import FuncXFuture
+
+# How many completed futures a stream holds for its consumer before the result
+# watcher stops acknowledging (and so, receiving) results
+DEFAULT_COMPLETION_BUFFER = 10_000
+
+# How long the consumer waits for a delivery before checking its futures itself
+# (e.g., for futures cancelled by the user, which are not delivered)
+_SWEEP_INTERVAL_S = 1.0
+
+FlowControlCallback = t.Callable[["CompletionStream", bool], None]
+
+
+class CompletionStream:
+    """Iterate over futures as they complete, in the order they complete.
+
+    Futures are handed to the stream by whoever completes them (see
+    ``deliver()``) -- for results, the FuncXExecutor's result watcher, once
+    per batch of received results -- and the consumer takes all those
+    buffered at once.  Iterating over the stream yields the futures one by
+    one; ``batches()`` yields them in the lists they were taken in.
+
+    Once ``max_buffered`` completed futures wait for the consumer, the
+    stream reports itself full to the deliverer, and the result watcher stops
+    acknowledging results until the consumer catches up.  The AMQP service
+    stops sending results once the executor's ``result_prefetch_count`` are
+    unacknowledged, so a slow consumer holds roughly ``max_buffered +
+    result_prefetch_count`` results.
+
+    A future belongs to at most one stream: the last one it was given to.
+    Futures only refer to their stream weakly, so a stream that is dropped
+    without being consumed or closed is collected, releasing any delivery
+    it paused.
+
+    :param futures: the futures to wait for
+    :param timeout: seconds to wait, from the start of the iteration, for all
+        futures to complete; None for no limit
+    :param max_buffered: how many completed futures to hold for the consumer
+        before delivery is paused
+    """
+
+    def __init__(
+        self,
+        futures: t.Iterable[FuncXFuture],
+        timeout: float | None = None,
+        max_buffered: int = DEFAULT_COMPLETION_BUFFER,
+    ):
+        self.timeout = timeout
+        self.max_buffered = max(1, max_buffered)
+        self.delivered = 0
+
+        self._cond = threading.Condition(threading.Lock())
+        self._buffer: list[FuncXFuture] = []
+        self._flow_control: list[FlowControlCallback] = []
+        self._closed = False
+
+        futs = list(dict.fromkeys(futures))
+        self.total = len(futs)
+        self._pending: set[FuncXFuture] = set(futs)
+        ref = weakref.ref(self)
+        for fut in futs:
+            fut._completion_stream = ref
+        # those already completed will not be delivered
+        self._put([fut for fut in futs if fut.done()])
+
+    def __repr__(self) -> str:
+        return "{}<pending={:,d}; buffered={:,d}; delivered={:,d}>".format(
+            self.__class__.__name__,
+            len(self._pending),
+            len(self._buffer),
+            self.delivered,
+        )
+
+    def __enter__(self) -> CompletionStream:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __iter__(self) -> t.Iterator[FuncXFuture]:
+        for batch in self.batches():
+            yield from batch
+
+    def batches(self) -> t.Iterator[list[FuncXFuture]]:
+        """
+        Yield lists of the futures completed since the previous list, in the
+        order they completed, until all futures have been yielded.
+
+        :raises concurrent.futures.TimeoutError: if futures are still pending
+            ``timeout`` seconds after the iteration started
+        """
+        end_time = None
+        if self.timeout is not None:
+            end_time = time.monotonic() + self.timeout
+
+        try:
+            while True:
+                with self._cond:
+                    while not self._buffer and self._pending:
+                        wait_s = _SWEEP_INTERVAL_S
+                        if end_time is not None:
+                            wait_s = min(wait_s, end_time - time.monotonic())
+                            if wait_s <= 0:
+                                raise concurrent.futures.TimeoutError(
+                                    f"{len(self._pending)} (of {self.total}) "
+                                    "futures unfinished"
+                                )
+                        if not self._cond.wait(wait_s):
+                            self._sweep()
+                    if not self._buffer:
+                        return
+                    batch, self._buffer = self._buffer, []
+                    flow_control, self._flow_control = self._flow_control, []
+
+                for resume in flow_control:
+                    resume(self, False)
+                self.delivered += len(batch)
+                yield batch
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop waiting for the remaining futures, and release any paused delivery"""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._buffer.clear()
+            flow_control, self._flow_control = self._flow_control, []
+        for resume in flow_control:
+            resume(self, False)
+
+    def _sweep(self) -> None:
+        # with self._cond held
+        done = [fut for fut in self._pending if fut.done()]
+        self._pending.difference_update(done)
+        self._buffer.extend(done)
+
+    def _put(
+        self,
+        futs: t.Iterable[FuncXFuture],
+        flow_control: FlowControlCallback | None = None,
+    ) -> None:
+        """
+        Buffer the given completed futures for the consumer.  If the buffer is
+        then full, ``flow_control(self, True)`` is called, and, once the
+        consumer has emptied the buffer, ``flow_control(self, False)``.
+        """
+        with self._cond:
+            pending = self._pending
+            for fut in futs:
+                if fut in pending:
+                    pending.remove(fut)
+                    self._buffer.append(fut)
+            self._cond.notify()
+
+            if (
+                flow_control is not None
+                and not self._closed
+                and len(self._buffer) >= self.max_buffered
+                and flow_control not in self._flow_control
+            ):
+                self._flow_control.append(flow_control)
+                flow_control(self, True)
+
+
+def deliver(
+    futures: t.Iterable[FuncXFuture],
+    flow_control: FlowControlCallback | None = None,
+) -> None:
+    """
+    Hand completed futures to the streams they belong to, if any, with one
+    hand-off per stream.  (See ``CompletionStream._put()`` for
+    ``flow_control``.)
+    """
+    by_stream: dict[CompletionStream, list[FuncXFuture]] = {}
+    for fut in futures:
+        ref = getattr(fut, "_completion_stream", None)
+        stream = ref() if ref is not None else None
+        if stream is not None:
+            by_stream.setdefault(stream, []).append(fut)
+    for stream, futs in by_stream.items():
+        stream._put(futs, flow_control)
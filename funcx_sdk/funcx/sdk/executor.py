@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import collections
 import concurrent.futures
+import contextlib
 import logging
 import os
 import queue
 import random
 import sys
+import tempfile
 import threading
 import time
 import typing as t
 import uuid
 import warnings
+import weakref
 
 if sys.version_info >= (3, 8):
     from concurrent.futures import InvalidStateError
@@ -24,9 +29,29 @@ import pika
 from funcx_common import messagepack
 from funcx_common.messagepack.message_types import Result
 
-from funcx.errors import FuncxTaskExecutionFailed
+from funcx.errors import FuncxTaskExecutionFailed, InFlightLimitExceeded
 from funcx.sdk.asynchronous.funcx_future import FuncXFuture
-from funcx.sdk.client import FuncXClient
+from funcx.sdk.batch import Batch
+from funcx.sdk.client import (
+    DEFAULT_BATCH_STATUS_CHUNK_SIZE,
+    DEFAULT_BATCH_STATUS_WORKERS,
+    FuncXClient,
+)
+from funcx.sdk.completion_stream import (
+    DEFAULT_COMPLETION_BUFFER,
+    CompletionStream,
+    deliver,
+)
+from funcx.sdk.result_cache import ResultCache, result_key
+from funcx.sdk.task_timeline import (
+    BATCH_POSTED,
+    DESERIALIZED,
+    RESULT_ARRIVED,
+    SUBMITTED,
+    TASK_ID_ASSIGNED,
+    LatencyRecorder,
+    TaskTimeline,
+)
 from funcx.sdk.utils import chunk_by
 
 log = logging.getLogger(__name__)
@@ -40,6 +65,18 @@ if t.TYPE_CHECKING:
 
 _REGISTERED_FXEXECUTORS: dict[int, t.Any] = {}
 
+DEFAULT_MAX_BATCH_BYTES = 8 * 1024 * 1024
+
+# Results at least this large are deserialized off the AMQP ioloop
+DEFAULT_INLINE_DECODE_BYTES = 64 * 1024
+
+# How many result messages AMQP may send ahead of their acknowledgement
+DEFAULT_RESULT_PREFETCH_COUNT = 1024
+
+# Results received before their futures are kept in memory up to this many
+# bytes, and then written to disk
+DEFAULT_MAX_UNMATCHED_BYTES = 64 * 1024 * 1024
+
 
 def __funcxexecutor_atexit():
     threading.main_thread().join()
@@ -52,6 +89,28 @@ def __funcxexecutor_atexit():
 threading.Thread(target=__funcxexecutor_atexit).start()
 
 
+def _run_map_chunk(fn_payload, items):
+    """
+    Run on the endpoint for ``FuncXExecutor.map()``: call the serialized
+    function once per item of arguments, and return a list of ``[True, result]``
+    or ``[False, traceback]`` pairs, one per item.
+
+    Serialized by source, so must be self-contained.
+    """
+    import traceback
+
+    from funcx.serialize import FuncXSerializer
+
+    fn = FuncXSerializer().deserialize(fn_payload)
+    results = []
+    for args in items:
+        try:
+            results.append([True, fn(*args)])
+        except Exception:
+            results.append([False, traceback.format_exc()])
+    return results
+
+
 class TaskSubmissionInfo:
     def __init__(
         self,
@@ -78,6 +137,215 @@ class TaskSubmissionInfo:
         )
 
 
+def _payload_size(batch: Batch) -> int:
+    # unknown (0) for batch-like objects other than Batch
+    size = getattr(batch, "payload_size", 0)
+    return size if isinstance(size, int) else 0
+
+
+class BatchSizePolicy:
+    """
+    Chooses how large the next batch of tasks may be, as a fraction (``scale``)
+    of the maximum task count (the executor's ``batch_size``) and of
+    ``max_bytes``.  A batch is closed once it holds the target count of tasks,
+    or once its serialized payloads reach the target size (so it exceeds that
+    by at most one task; a single larger task is sent on its own).
+
+    The scale starts at 1, and adapts to how the web services respond: after
+    a submission that took longer than ``target_latency_s``, or that failed, it
+    is halved (but the targets are never less than 1 task and ``min_bytes``);
+    after a timely submission, it grows again by half, up to 1.
+
+    :param max_bytes: the maximum (soft) payload size of a batch
+    :param min_bytes: the payload size below which the target never shrinks
+    :param target_latency_s: submissions slower than this shrink the batches
+    :param history_size: the number of recent batches kept for ``stats()``
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        min_bytes: int = 64 * 1024,
+        target_latency_s: float = 2.0,
+        history_size: int = 32,
+    ):
+        self.max_bytes = max(1, max_bytes)
+        self.min_bytes = min_bytes
+        self.target_latency_s = target_latency_s
+        self.scale = 1.0
+
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.tasks = 0
+        self.bytes = 0
+        self.errors = 0
+        self.latency_s = 0.0
+        self.history: collections.deque[tuple[int, int, float]] = collections.deque(
+            maxlen=history_size
+        )
+
+    def target_count(self, max_count: int) -> int:
+        return max(1, round(max_count * self.scale))
+
+    @property
+    def target_bytes(self) -> int:
+        return max(
+            min(self.min_bytes, self.max_bytes), int(self.max_bytes * self.scale)
+        )
+
+    def is_full(self, count: int, nbytes: int, max_count: int) -> bool:
+        """Whether a batch of ``count`` tasks and ``nbytes`` is complete"""
+        return count >= self.target_count(max_count) or nbytes >= self.target_bytes
+
+    def record(self, count: int, nbytes: int, elapsed_s: float, error=False) -> None:
+        """Adapt the targets to the outcome of submitting a batch"""
+        with self._lock:
+            self.batches += 1
+            self.tasks += count
+            self.bytes += nbytes
+            self.errors += bool(error)
+            self.latency_s += elapsed_s
+            self.history.append((count, nbytes, elapsed_s))
+
+            if error or elapsed_s > self.target_latency_s:
+                self.scale = max(self.scale / 2, 1 / 1024)
+            else:
+                self.scale = min(self.scale * 1.5, 1.0)
+
+    def stats(self, max_count: int) -> dict[str, t.Any]:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "tasks": self.tasks,
+                "bytes": self.bytes,
+                "errors": self.errors,
+                "mean_latency_s": self.latency_s / self.batches if self.batches else 0,
+                "target_count": self.target_count(max_count),
+                "target_bytes": self.target_bytes,
+                "recent_batches": [
+                    {"tasks": c, "bytes": b, "latency_s": e} for c, b, e in self.history
+                ],
+            }
+
+
+class InFlightLimit:
+    """
+    Bounds how much work an executor holds on behalf of its caller: the tasks
+    submitted but not yet complete (up to ``max_tasks``), and the bytes of
+    serialized tasks not yet sent upstream (up to ``max_bytes``).  While
+    either limit is reached, ``acquire()`` waits.
+
+    A task is counted from ``acquire()`` until its future completes (or is
+    cancelled).  Task payloads are only serialized on the task submission
+    thread, so bytes are counted from then (``charge()``) until their batch
+    is sent (``discharge()``); the byte limit is therefore checked against
+    the tasks serialized so far, and may be exceeded by the tasks waiting to
+    be serialized.
+
+    :param max_tasks: the most tasks in flight; None for no limit
+    :param max_bytes: the most serialized, unsent bytes; None for no limit
+    """
+
+    def __init__(self, max_tasks: int | None = None, max_bytes: int | None = None):
+        self.max_tasks = max_tasks if max_tasks is None else max(1, max_tasks)
+        self.max_bytes = max_bytes if max_bytes is None else max(1, max_bytes)
+
+        self._cond = threading.Condition(threading.Lock())
+        self._closed = False
+        self.tasks = 0
+        self.bytes = 0
+        self.waits = 0
+        self.wait_s = 0.0
+
+    def __repr__(self) -> str:
+        return "{}<tasks={:,d}/{}; bytes={:,d}/{}>".format(
+            self.__class__.__name__,
+            self.tasks,
+            self.max_tasks,
+            self.bytes,
+            self.max_bytes,
+        )
+
+    def _is_full(self) -> bool:
+        # with self._cond held
+        return (self.max_tasks is not None and self.tasks >= self.max_tasks) or (
+            self.max_bytes is not None and self.bytes >= self.max_bytes
+        )
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Wait until there is room for another task, or for ``timeout`` seconds.
+
+        :returns: whether there is room (or the limit was closed)
+        """
+        with self._cond:
+            return self._wait(timeout)
+
+    def _wait(self, timeout: float | None) -> bool:
+        # with self._cond held
+        if self._closed or not self._is_full():
+            return True
+        start = time.monotonic()
+        self.waits += 1
+        try:
+            return self._cond.wait_for(
+                lambda: self._closed or not self._is_full(), timeout
+            )
+        finally:
+            self.wait_s += time.monotonic() - start
+
+    def acquire(self, fut: FuncXFuture, timeout: float | None = None) -> None:
+        """
+        Count ``fut``'s task as in flight, until ``fut`` is done; first waiting
+        up to ``timeout`` seconds (None for no limit) for room.
+
+        :raises InFlightLimitExceeded: if there is still no room after
+            ``timeout`` seconds
+        """
+        with self._cond:
+            if not self._wait(timeout):
+                raise InFlightLimitExceeded(
+                    self.tasks, self.max_tasks, self.bytes, self.max_bytes
+                )
+            self.tasks += 1
+        fut.add_done_callback(self._release)
+
+    def _release(self, _fut: FuncXFuture) -> None:
+        with self._cond:
+            self.tasks -= 1
+            # waiters in wait() take no slot, so wake every waiter, lest only
+            # a wait() be woken while an acquire() keeps waiting for room
+            self._cond.notify_all()
+
+    def charge(self, nbytes: int) -> None:
+        """Count ``nbytes`` of serialized tasks"""
+        with self._cond:
+            self.bytes += nbytes
+
+    def discharge(self, nbytes: int) -> None:
+        """Uncount ``nbytes`` of serialized tasks, once sent"""
+        with self._cond:
+            self.bytes -= nbytes
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Stop waiting; e.g., for the executor to raise that it is shut down"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, t.Any]:
+        with self._cond:
+            return {
+                "tasks": self.tasks,
+                "max_tasks": self.max_tasks,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "waits": self.waits,
+                "wait_s": self.wait_s,
+            }
+
+
 class AtomicController:
     """This is used to synchronize between the FuncXExecutor which starts
     WebSocketPollingTasks and the WebSocketPollingTask which closes itself when there
@@ -132,6 +400,17 @@ class FuncXExecutor(concurrent.futures.Executor):
         task_group_id: str | None = None,
         label: str = "",
         batch_size: int = 128,
+        max_concurrent_submissions: int = 4,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        share_arguments: bool = False,
+        result_prefetch_count: int = DEFAULT_RESULT_PREFETCH_COUNT,
+        max_unmatched_result_bytes: int = DEFAULT_MAX_UNMATCHED_BYTES,
+        lazy_results: bool = False,
+        result_cache: ResultCache | None = None,
+        max_in_flight_tasks: int | None = None,
+        max_in_flight_bytes: int | None = None,
+        submit_timeout: float | None = None,
+        track_latency: bool = False,
         **kwargs,
     ):
         """
@@ -146,6 +425,61 @@ class FuncXExecutor(concurrent.futures.Executor):
             logging and advanced needs with multiple executors.
         :param batch_size: the maximum number of tasks to coalesce before
             sending upstream [min: 1, default: 128]
+        :param max_concurrent_submissions: the maximum number of batches in
+            flight to the web services at once; the next batch is serialized
+            while earlier batches are being sent.  Set to 1 to send batches
+            strictly one after the other. [min: 1, default: 4]
+        :param max_batch_bytes: the (soft) maximum size of the serialized tasks
+            in a batch; a batch is sent once it reaches this size, even if it
+            holds fewer than ``batch_size`` tasks.  Both limits adapt to how
+            long the web services take to accept batches; see
+            ``BatchSizePolicy`` and ``submission_stats()``. [default: 8MiB]
+        :param share_arguments: serialize large arguments passed to several
+            tasks (e.g., a model in a parameter sweep) once per batch, and have
+            workers deserialize them once; tasks receive the same object, so
+            must not modify it.  This saves CPU, not upload bytes: every task
+            still carries its arguments.  Requires recent endpoints.
+            [default: False]
+        :param result_prefetch_count: the maximum number of results the AMQP
+            service sends ahead of their acknowledgement; 0 for no limit.
+            [default: 1024]
+        :param max_unmatched_result_bytes: results that arrive before their
+            futures (e.g., when reattaching to a large Task Group, see
+            ``reload_tasks()``) are kept in memory up to this many bytes, and
+            written to a temporary file beyond that. [default: 64MiB]
+        :param lazy_results: complete futures with the serialized results, and
+            only deserialize a result when first read with ``.result()``;
+            ``.result_bytes()`` returns it undeserialized (e.g., to forward
+            it).  Results never read are never deserialized. [default: False]
+        :param result_cache: memoize invocations: a repeated invocation (same
+            function, endpoint, and serialized arguments) of one that succeeded
+            earlier is completed from this cache, without a round-trip to the
+            web services; e.g., a ``MemoryResultCache`` or, to reuse results
+            across runs, a ``DiskResultCache``.  Only use this for functions
+            without side effects.  See ``bypass_result_cache()``.
+            [default: None, no memoization]
+        :param max_in_flight_tasks: the most tasks submitted but not yet
+            complete; ``.submit()`` waits for earlier tasks to complete beyond
+            this, so that a producer loop does not get ahead of the endpoint.
+            Do not submit from a future's done callback with this set: the
+            callback would wait for results that it is holding up.
+            [default: None, no limit]
+        :param max_in_flight_bytes: the most bytes of serialized tasks waiting
+            to be sent upstream; ``.submit()`` waits for them to be sent
+            beyond this.  Tasks are serialized by the submission thread, not
+            by ``.submit()``, so this is a soft limit: the tasks queued but
+            not yet serialized are not counted, and may take the bytes in
+            flight past it.  See ``InFlightLimit``. [default: None, no limit]
+        :param submit_timeout: how long ``.submit()`` waits, when either
+            in-flight limit is reached, before raising
+            ``InFlightLimitExceeded``; 0 to raise right away.  See also
+            ``wait_for_capacity()``. [default: None, wait indefinitely]
+        :param track_latency: record each task's timeline (``.timeline`` of its
+            future) -- when it was submitted, posted upstream, and assigned a
+            task id, the transitions reported by the endpoint, and when its
+            result arrived and was deserialized -- and collect histograms of
+            the time between stages; see ``latency_stats()``.
+            [default: False]
         :param batch_interval: [DEPRECATED; unused] number of seconds to coalesce tasks
             before submitting upstream
         :param batch_enabled: [DEPRECATED; unused] whether to batch results
@@ -169,8 +503,23 @@ class FuncXExecutor(concurrent.futures.Executor):
         self.container_id = container_id
         self.label = label
         self.batch_size = max(1, batch_size)
+        self.max_concurrent_submissions = max(1, max_concurrent_submissions)
+        self.batch_policy = BatchSizePolicy(max_bytes=max_batch_bytes)
+        self.share_arguments = share_arguments
+        self.result_prefetch_count = result_prefetch_count
+        self.max_unmatched_result_bytes = max_unmatched_result_bytes
+        self.lazy_results = lazy_results
+        self.result_cache = result_cache
+        self._result_cache_bypass = threading.local()
+        self.in_flight = InFlightLimit(max_in_flight_tasks, max_in_flight_bytes)
+        self.submit_timeout = submit_timeout
+        self.latency: LatencyRecorder | None = None
+        if track_latency:
+            self.latency = LatencyRecorder()
 
         self.task_count_submitted = 0
+        self._submission_lock = threading.Lock()
+        self._submission_error: Exception | None = None
         self._task_counter: int = 0
         self._task_group_id: str = task_group_id or str(uuid.uuid4())
         self._tasks_to_send: queue.Queue[
@@ -244,7 +593,9 @@ class FuncXExecutor(concurrent.futures.Executor):
 
         If a function has already been registered (perhaps in a previous
         iteration), the upstream API call may be avoided by specifying the known
-        ``function_id``.
+        ``function_id``.  Otherwise, the ``FuncXClient`` also avoids the call if
+        its persistent registration cache already holds an identical
+        registration (e.g., from a previous run of the same script).
 
         If a function already exists in the Executor's cache, this method will
         raise a ValueError to help track down the errant double registration
@@ -400,6 +751,21 @@ class FuncXExecutor(concurrent.futures.Executor):
         if kwargs is None:
             kwargs = {}
 
+        fut = FuncXFuture()
+        if self.result_cache is not None:
+            # looked up once the task is serialized; see _memoize()
+            bypass = getattr(self._result_cache_bypass, "active", False)
+            fut._result_cache_lookup = not bypass
+
+        self.in_flight.acquire(fut, self.submit_timeout)
+        if self.latency is not None:
+            fut.timeline = TaskTimeline()
+            fut.timeline.stamp(SUBMITTED)
+        if self._stopped:
+            fut.cancel()
+            err_fmt = "%s is shutdown; no new functions may be executed"
+            raise RuntimeError(err_fmt % repr(self))
+
         self._task_counter += 1
 
         task = TaskSubmissionInfo(
@@ -410,33 +776,250 @@ class FuncXExecutor(concurrent.futures.Executor):
             kwargs=kwargs,
         )
 
-        fut = FuncXFuture()
         self._tasks_to_send.put((fut, task))
         return fut
 
-    def map(self, fn: t.Callable, *iterables, timeout=None, chunksize=1) -> t.Iterator:
+    def wait_for_capacity(self, timeout: float | None = None) -> bool:
         """
-        FuncX does not currently implement the `.map()`_ method of the `Executor
-        interface`_.  In a naive implementation, this method would merely be
-        syntactic sugar for bulk use of the ``.submit()`` method.  For example::
+        Wait until a task may be submitted without waiting for the in-flight
+        limits (see ``max_in_flight_tasks`` and ``max_in_flight_bytes``).
 
-            def map(fxexec, fn, *fn_args_kwargs):
-                return [fxexec.submit(fn, *a, **kw) for a, kw in fn_args_kwargs]
+        :param timeout: the most seconds to wait; None for no limit
+        :returns: whether there is room for a task
+        """
+        return self.in_flight.wait(timeout)
+
+    async def wait_for_capacity_async(self, timeout: float | None = None) -> bool:
+        """
+        ``wait_for_capacity()``, for asyncio applications: waits on a thread of
+        the event loop's default executor rather than blocking the loop.  For
+        example::
+
+            async def produce(fxe: FuncXExecutor, items):
+                for item in items:
+                    await fxe.wait_for_capacity_async()
+                    fxe.submit(process, item)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.wait_for_capacity, timeout)
 
-        This naive implementation ignores a number of potential optimizations, so
-        we have decided to look at this at a future date if there is interest.
+    @contextlib.contextmanager
+    def bypass_result_cache(self) -> t.Iterator[None]:
+        """
+        Within this context, tasks submitted (by this thread) are executed even
+        if the ``result_cache`` holds a result for them; their results then
+        replace those cached.  For example::
+
+            >>> fxe = FuncXExecutor(endpoint_id=ep_id, result_cache=MemoryResultCache())
+            >>> fut = fxe.submit(simulate, 1)  # executed
+            >>> fut = fxe.submit(simulate, 1)  # from the cache (once received)
+            >>> with fxe.bypass_result_cache():
+            ...     fut = fxe.submit(simulate, 1)  # executed again
+        """
+        prior = getattr(self._result_cache_bypass, "active", False)
+        self._result_cache_bypass.active = True
+        try:
+            yield
+        finally:
+            self._result_cache_bypass.active = prior
+
+    def _memoize(self, fut: FuncXFuture, batch: Batch) -> bool:
+        """
+        Key ``fut`` by its task, as just serialized into ``batch``; then, unless
+        the cache is bypassed, complete ``fut`` with the cached result, if there
+        is one, and take the task back out of ``batch``.
+
+        :returns: whether ``fut`` was completed from the cache
+        """
+        function_id, endpoint_id, payload = batch.tasks[-1]
+        fut._result_cache_key = result_key(function_id, str(endpoint_id), payload)
+        if not fut._result_cache_lookup or not self._complete_from_cache(fut):
+            return False
+
+        batch.tasks.pop()
+        batch.payload_size -= len(payload)
+        deliver((fut,))
+        return True
+
+    def _complete_from_cache(self, fut: FuncXFuture) -> bool:
+        """Complete ``fut`` with its cached result, if there is one"""
+        assert self.result_cache is not None
+        payload = self.result_cache.get(fut._result_cache_key)
+        if payload is None:
+            return False
+
+        deserialize = self.funcx_client.fx_serializer.deserialize
+        if self.lazy_results:
+            fut.set_serialized_result(payload, deserialize)
+            return True
+        try:
+            fut.set_result(deserialize(payload))
+        except Exception as e:
+            log.warning(f"Unable to deserialize cached result; resubmitting: {e}")
+            return False
+        return True
+
+    def map(self, fn: t.Callable, *iterables, timeout=None, chunksize=1) -> t.Iterator:
+        """
+        Execute ``fn(*args)`` for every ``args`` drawn from ``zip(*iterables)``,
+        as with the `.map()`_ method of the `Executor interface`_.
+
+        All invocations are submitted immediately, but the results are returned
+        lazily, in order, as they arrive.  If an invocation raised an exception,
+        that exception is raised when its result would have been returned (as
+        a ``FuncxTaskExecutionFailed`` carrying the remote traceback, as for
+        ``.submit()``).
+
+        For many small invocations, use ``chunksize`` to send ``chunksize``
+        invocations as a single task, which the endpoint runs one after the
+        other; this spreads the per-task overhead (e.g., in the web services and
+        on the endpoint) over the invocations.  An exception in one invocation
+        does not affect the others in its chunk.  Note that the results of a
+        chunk count as one task result against the endpoint's result size
+        limit.  Example use::
+
+            >>> def add(a: int, b: int) -> int: return a + b
+            >>> with FuncXExecutor(endpoint_id="some-ep-id") as fxe:
+            ...     sums = fxe.map(add, range(10_000), range(10_000), chunksize=500)
+            ...     print(sum(sums))
+            99990000
+
+        :param fn: Python function to execute on the endpoint
+        :param iterables: iterables of arguments for ``fn``; one per parameter
+        :param timeout: the maximum number of seconds to wait for results, from
+            the time of the call; if exceeded, ``TimeoutError`` is raised by the
+            iterator [default: None, no limit]
+        :param chunksize: the number of invocations of ``fn`` per task [min: 1,
+            default: 1]
+        :returns: an iterator over the results, in the order of the arguments
 
         .. _.map(): https://docs.python.org/3/library/concurrent.futures.html#concurrent.futures.Executor.map
         .. _Executor interface: https://docs.python.org/3/library/concurrent.futures.html#executor-objects
-
-        Raises
-        ------
-        NotImplementedError
-          always raised
         """  # noqa
-        raise NotImplementedError()
+        if chunksize < 1:
+            raise ValueError("chunksize must be >= 1")
+
+        end_time = None if timeout is None else timeout + time.monotonic()
+
+        if chunksize == 1:
+            futures = [self.submit(fn, *args) for args in zip(*iterables)]
+            return self._map_results(futures, end_time, chunked=False)
+
+        # the runner is registered once; the mapped function travels as an
+        # argument, serialized as for registration
+        fn_cache_key = self._fn_cache_key(_run_map_chunk)
+        if fn_cache_key not in self._function_registry:
+            self.register_function(_run_map_chunk)
+        runner_id = self._function_registry[fn_cache_key]
+        fn_payload = self.funcx_client.fx_serializer.serialize(fn)
 
-    def reload_tasks(self) -> t.Iterable[FuncXFuture]:
+        futures = [
+            self.submit_to_registered_function(
+                runner_id, args=(fn_payload, [list(args) for args in chunk])
+            )
+            for chunk in chunk_by(zip(*iterables), chunksize)
+        ]
+        return self._map_results(futures, end_time, chunked=True)
+
+    @staticmethod
+    def _map_results(
+        futures: list[FuncXFuture], end_time: float | None, chunked: bool
+    ) -> t.Iterator:
+        # like the standard library: remaining futures are cancelled if the
+        # consumer stops early (or on timeout)
+        try:
+            futures.reverse()
+            while futures:
+                fut = futures.pop()
+                if end_time is None:
+                    result = fut.result()
+                else:
+                    result = fut.result(end_time - time.monotonic())
+                if not chunked:
+                    yield result
+                    continue
+
+                for succeeded, value in result:
+                    if not succeeded:
+                        raise FuncxTaskExecutionFailed(value)
+                    yield value
+        finally:
+            for fut in futures:
+                fut.cancel()
+
+    def as_completed(
+        self,
+        futures: t.Iterable[FuncXFuture],
+        timeout: float | None = None,
+        max_buffered: int = DEFAULT_COMPLETION_BUFFER,
+    ) -> CompletionStream:
+        """
+        Iterate over the given futures as they complete, in the order their
+        results arrive; like ``concurrent.futures.as_completed()``, but fed
+        directly by the result watcher, in batches, instead of by a waiter on
+        every future.  Better suited to many futures, for example::
+
+            >>> futures = [fxe.submit(some_func, i) for i in range(100_000)]
+            >>> for fut in fxe.as_completed(futures):
+            ...     process(fut.result())
+
+        The returned ``CompletionStream`` also yields the futures in batches,
+        as they were received, with ``.batches()``.  It holds a future only
+        until it is yielded; to not hold all results in memory at once, do not
+        keep other references to the futures.
+
+        :param futures: the futures, from this executor, to wait for
+        :param timeout: seconds to wait for all futures to complete; None for
+            no limit.  If exceeded, the iteration raises
+            ``concurrent.futures.TimeoutError``.
+        :param max_buffered: how many completed futures to hold for a slow
+            consumer; once reached, results stop being acknowledged -- and so
+            received, beyond ``result_prefetch_count`` -- until the consumer
+            catches up. [default: 10,000]
+        :returns: an iterable of the completed futures
+        """
+        return CompletionStream(futures, timeout=timeout, max_buffered=max_buffered)
+
+    def submission_stats(self) -> dict[str, t.Any]:
+        """
+        Statistics of the batches submitted so far: counts of batches, tasks,
+        payload bytes, and failed submissions; the mean submission latency;
+        the current batch size targets (see ``BatchSizePolicy``); the sizes
+        and latencies of the most recent batches; and, under ``in_flight``,
+        the tasks and bytes in flight, and how often and how long
+        ``.submit()`` waited for them (see ``InFlightLimit``).
+        """
+        stats = self.batch_policy.stats(max(1, self.batch_size))
+        stats["in_flight"] = self.in_flight.stats()
+        return stats
+
+    def latency_stats(self) -> dict[str, dict[str, t.Any]]:
+        """
+        Histograms of the time tasks spent between consecutive stages (keyed
+        as ``"<stage>-><stage>"``, with ``"total"`` for the whole timeline),
+        over the tasks completed so far: counts, mean, minimum, maximum,
+        estimated percentiles, and the non-empty buckets (as ``(upper bound,
+        count)``, the last bound being ``"+Inf"``), all in seconds.  The
+        result is plain, standard JSON data; e.g., to export it,
+        ``json.dumps()`` it.  Requires ``track_latency``.  For example::
+
+            >>> fxe = FuncXExecutor(endpoint_id=ep_id, track_latency=True)
+            >>> ... # submit tasks and wait for results
+            >>> stats = fxe.latency_stats()
+            >>> stats["execution-start->execution-end"]["p90_s"]
+            0.0512
+
+        See ``funcx.sdk.task_timeline.STAGE_ORDER`` for the stages.
+        """
+        if self.latency is None:
+            return {}
+        return self.latency.stats()
+
+    def reload_tasks(
+        self,
+        chunk_size: int = DEFAULT_BATCH_STATUS_CHUNK_SIZE,
+        max_workers: int = DEFAULT_BATCH_STATUS_WORKERS,
+    ) -> list[FuncXFuture]:
         """
         .. _reload_tasks():
 
@@ -445,7 +1028,13 @@ class FuncXExecutor(concurrent.futures.Executor):
         nominally intended to "reattach" to a previously initiated session, based on
         the Task Group ID.
 
-        :returns: An iterable of futures.
+        The tasks' statuses are fetched ``chunk_size`` tasks per request, up to
+        ``max_workers`` requests at a time; to receive the futures as their
+        statuses arrive, see ``iter_reload_tasks()``.
+
+        :param chunk_size: number of tasks whose status to fetch per request
+        :param max_workers: number of requests to have in flight at a time
+        :returns: A list of futures, in Task Group order.
         :raises ValueError: if the server response is incorrect or invalid
         :raises KeyError: the server did not return an expected response
         :raises various: the usual (unhandled) request errors (e.g., no connection;
@@ -455,6 +1044,35 @@ class FuncXExecutor(concurrent.futures.Executor):
         -----
         Any previous futures received from this executor will be cancelled.
         """  # noqa
+        task_ids, fetches = self._start_reload(chunk_size, max_workers)
+        order = {task_id: i for i, task_id in enumerate(task_ids)}
+        futures = list(self._reloaded_futures(fetches))
+        futures.sort(key=lambda fut: order.get(fut.task_id, len(order)))
+        return futures
+
+    def iter_reload_tasks(
+        self,
+        chunk_size: int = DEFAULT_BATCH_STATUS_CHUNK_SIZE,
+        max_workers: int = DEFAULT_BATCH_STATUS_WORKERS,
+    ) -> t.Iterator[FuncXFuture]:
+        """
+        Like `reload_tasks()`_, but return an iterator of the futures, which
+        yields them chunk by chunk as the statuses arrive (so not necessarily
+        in Task Group order), rather than a list after the last.
+
+        The tasks' statuses are fetched in the background; futures of completed
+        tasks are already done when yielded, and the others are watched for
+        results.  The tasks are reloaded whether or not the iterator is
+        consumed.  Errors fetching task statuses are raised while iterating.
+        """
+        _task_ids, fetches = self._start_reload(chunk_size, max_workers)
+        return self._reloaded_futures(fetches)
+
+    def _start_reload(
+        self, chunk_size: int, max_workers: int
+    ) -> tuple[list[str], list[concurrent.futures.Future]]:
+        """Start fetching the statuses of this Task Group's tasks, in chunks;
+        return the task ids, and the fetches of each chunk's futures"""
         # step 1: cleanup!
         if self._result_watcher:
             self._result_watcher.shutdown(wait=False, cancel_futures=True)
@@ -471,60 +1089,69 @@ class FuncXExecutor(concurrent.futures.Executor):
             )
             raise ValueError(msg)
 
-        # step 3: create the associated set of futures
+        # step 3: fetch the statuses, and create the associated futures
         task_ids: list[str] = [task["id"] for task in r.get("tasks", [])]
-        futures: list[FuncXFuture] = []
+        if not task_ids:
+            log.warning(f"Received no tasks for Task Group ID: {task_group_id}")
+            return task_ids, []
 
-        if task_ids:
-            # Complete the futures that already have results.
-            pending: list[FuncXFuture] = []
-            deserialize = self.funcx_client.fx_serializer.deserialize
-            chunk_size = 1024
-            num_chunks = len(task_ids) // chunk_size + 1
-            for chunk_no, id_chunk in enumerate(
-                chunk_by(task_ids, chunk_size), start=1
-            ):
-                if num_chunks > 1:
-                    log.debug(
-                        "Large task group (%s tasks; %s chunks); retrieving chunk %s"
-                        " (%s tasks)",
-                        len(task_ids),
-                        num_chunks,
-                        chunk_no,
-                        len(id_chunk),
-                    )
+        chunks = list(chunk_by(task_ids, max(1, chunk_size)))
+        if len(chunks) > 1:
+            log.debug(
+                "Large task group (%s tasks); retrieving %s chunks",
+                len(task_ids),
+                len(chunks),
+            )
+        pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(chunks))),
+            thread_name_prefix="FuncXExecutor-reload",
+        )
+        fetches = [pool.submit(self._reload_chunk, id_chunk) for id_chunk in chunks]
+        pool.shutdown(wait=False)
+        return task_ids, fetches
+
+    @staticmethod
+    def _reloaded_futures(
+        fetches: list[concurrent.futures.Future],
+    ) -> t.Iterator[FuncXFuture]:
+        for fetch in concurrent.futures.as_completed(fetches):
+            yield from fetch.result()
+
+    def _reload_chunk(self, id_chunk: t.Sequence[str]) -> list[FuncXFuture]:
+        """
+        Fetch the statuses of a chunk of tasks, and make their futures: complete
+        those that have results (deserializing them on this thread), and watch
+        for the results of the others.
+        """
+        res = self.funcx_client.web_client.get_batch_status(id_chunk)
+        deserialize = self.funcx_client.fx_serializer.deserialize
 
-                res = self.funcx_client.web_client.get_batch_status(id_chunk)
-                for task_id, task in res.data.get("results", {}).items():
-                    fut = FuncXFuture(task_id)
-                    futures.append(fut)
-                    completed_t = task.get("completion_t")
-                    if not completed_t:
-                        pending.append(fut)
+        futures: list[FuncXFuture] = []
+        pending: list[FuncXFuture] = []
+        for task_id, task in res.data.get("results", {}).items():
+            fut = FuncXFuture(task_id)
+            futures.append(fut)
+            completed_t = task.get("completion_t")
+            if not completed_t:
+                pending.append(fut)
+            else:
+                try:
+                    if task.get("status") == "success" and self.lazy_results:
+                        fut.set_serialized_result(task["result"], deserialize)
+                    elif task.get("status") == "success":
+                        fut.set_result(deserialize(task["result"]))
                     else:
-                        try:
-                            if task.get("status") == "success":
-                                fut.set_result(deserialize(task["result"]))
-                            else:
-                                exc = FuncxTaskExecutionFailed(
-                                    task["exception"], completed_t
-                                )
-                                fut.set_exception(exc)
-                        except Exception as exc:
-                            funcx_err = FuncxTaskExecutionFailed(
-                                "Failed to set result or exception"
-                            )
-                            funcx_err.__cause__ = exc
-                            fut.set_exception(funcx_err)
-
-            if pending:
-                self._result_watcher = _ResultWatcher(self)
-                self._result_watcher.watch_for_task_results(pending)
-                self._result_watcher.start()
-        else:
-            log.warning(f"Received no tasks for Task Group ID: {task_group_id}")
+                        exc = FuncxTaskExecutionFailed(task["exception"], completed_t)
+                        fut.set_exception(exc)
+                except Exception as exc:
+                    funcx_err = FuncxTaskExecutionFailed(
+                        "Failed to set result or exception"
+                    )
+                    funcx_err.__cause__ = exc
+                    fut.set_exception(funcx_err)
 
-        # step 5: the goods for the consumer
+        if pending:
+            self._watch_futures(pending)
         return futures
 
     def shutdown(self, wait=True, *, cancel_futures=False):
@@ -543,6 +1170,7 @@ class FuncXExecutor(concurrent.futures.Executor):
 
         with self._shutdown_lock:
             self._stopped = True
+            self.in_flight.close()  # release any .submit() waiting for room
             if self._result_watcher:
                 self._result_watcher.shutdown(wait=wait, cancel_futures=cancel_futures)
                 self._result_watcher = None
@@ -559,75 +1187,91 @@ class FuncXExecutor(concurrent.futures.Executor):
     def _task_submitter_impl(self) -> None:
         """
         Coalesce tasks from the interthread queue (``_tasks_to_send``), up to
-        ``self.batch_size``, submit them, and then send the futures to the
-        ResultWatcher.
+        ``self.batch_size``, serialize them, and hand them off to be submitted;
+        once submitted, the futures are sent to the ResultWatcher.
 
         The main job of this method is to loop forever, forwarding task
         requests upstream and the associated futures to the ResultWatcher.
+        Up to ``self.max_concurrent_submissions`` batches are sent upstream
+        concurrently (see ``_send_batch()``), by a pool of threads sharing the
+        FuncXClient's connections, so that the next batch is serialized while
+        earlier ones are in flight.
 
         This thread stops when it receives a poison-pill of ``(None, None)``
-        in the queue.  (See ``shutdown()``.)
+        in the queue.  (See ``shutdown()``.)  If a batch fails to submit, the
+        executor is shut down, and this thread raises the error.
         """
         log.debug(
             "%s: task submission thread started (%s)", self, threading.get_ident()
         )
         to_send = self._tasks_to_send  # cache lookup
         futs: list[FuncXFuture] = []  # for mypy/the exception branch
+        in_flight = threading.BoundedSemaphore(self.max_concurrent_submissions)
+        senders = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrent_submissions,
+            thread_name_prefix="TaskSubmitter-send",
+        )
         try:
             fut: FuncXFuture | None = FuncXFuture()  # just start the loop; please
             while fut is not None:
                 futs = []
                 tasks: list[TaskSubmissionInfo] = []
+                batch: Batch | None = None
                 task_count = 0
+                nbytes = 0
                 try:
                     fut, task = to_send.get()  # Block; wait for first result ...
                     task_count += 1
                     bs = max(1, self.batch_size)  # May have changed while waiting
                     while task is not None:
                         assert fut is not None  # Come on mypy; contextually clear!
-                        tasks.append(task)
-                        futs.append(fut)
-                        if not (len(tasks) < bs):
-                            break
+                        if batch is None:
+                            batch = self._new_batch()
+                        self._add_to_batch(batch, task)  # serializes the task
+                        if self.result_cache is not None and self._memoize(fut, batch):
+                            task_count -= 1  # completed from the cache; not sent
+                            to_send.task_done()
+                        else:
+                            tasks.append(task)
+                            futs.append(fut)
+                            nbytes, prev_nbytes = _payload_size(batch), nbytes
+                            self.in_flight.charge(nbytes - prev_nbytes)
+                            if self.batch_policy.is_full(len(tasks), nbytes, bs):
+                                break
                         fut, task = to_send.get(block=False)  # ... don't block again
                         task_count += 1
                 except queue.Empty:
                     pass
 
+                if self._submission_error:
+                    raise self._submission_error
+
                 if not tasks:
                     continue
+                assert batch is not None
+
+                in_flight.acquire()  # wait for a free sender
+                if self._submission_error:
+                    in_flight.release()
+                    raise self._submission_error
 
                 log.info(f"Submitting tasks to funcX: {len(tasks)}")
-                self._submit_tasks(futs, tasks)
-
-                with self._shutdown_lock:
-                    if self._stopped:
-                        continue
-
-                    if not (self._result_watcher and self._result_watcher.is_alive()):
-                        # Don't initialize the result watcher unless at least
-                        # one batch has been sent
-                        self._result_watcher = _ResultWatcher(self)
-                        self._result_watcher.start()
-                    try:
-                        self._result_watcher.watch_for_task_results(futs)
-                    except self._result_watcher.__class__.ShuttingDownError:
-                        log.debug("Waiting for previous ResultWatcher to shutdown")
-                        self._result_watcher.join()
-                        self._result_watcher = _ResultWatcher(self)
-                        self._result_watcher.start()
-                        self._result_watcher.watch_for_task_results(futs)
-
-                # important to clear futures; else a legitimately early-shutdown
-                # request (e.g., __exit__()) can cancel these (finally block,
-                # below) before the result comes back, even though _result_watcher
-                # is already watching them.
-                futs.clear()
+                senders.submit(self._send_and_watch, futs, tasks, batch, in_flight)
+
+                # the sender now owns these futures; else a legitimately
+                # early-shutdown request (e.g., __exit__()) can cancel these
+                # (finally block, below) before the result comes back
+                futs = []
 
                 while task_count:
                     task_count -= 1
                     to_send.task_done()
 
+            # let the batches in flight complete (or fail)
+            senders.shutdown(wait=True)
+            if self._submission_error:
+                raise self._submission_error
+
         except Exception as exc:
             self._stopped = True
             self._stopped_in_error = True
@@ -645,6 +1289,7 @@ class FuncXExecutor(concurrent.futures.Executor):
             log.debug("%s: task submission thread dies", self)
             raise
         finally:
+            senders.shutdown(wait=False)
             if sys.exc_info() != (None, None, None):
                 time.sleep(0.1)  # give any in-flight Futures a chance to be .put() ...
             while not self._tasks_to_send.empty():
@@ -655,6 +1300,7 @@ class FuncXExecutor(concurrent.futures.Executor):
             for fut in futs:
                 fut.cancel()
                 fut.set_running_or_notify_cancel()
+            deliver(futs)
             try:
                 while True:
                     self._tasks_to_send.task_done()
@@ -662,40 +1308,189 @@ class FuncXExecutor(concurrent.futures.Executor):
                 pass
             log.debug("%s: task submission thread complete", self)
 
-    def _submit_tasks(self, futs: list[FuncXFuture], tasks: list[TaskSubmissionInfo]):
+    def _send_and_watch(
+        self,
+        futs: list[FuncXFuture],
+        tasks: list[TaskSubmissionInfo],
+        batch: Batch,
+        in_flight: threading.BoundedSemaphore,
+    ) -> None:
         """
-        Submit a batch of tasks to the webservice, destined for self.endpoint_id.
-        Upon success, update the futures with their associated task_id.
-
-        :param futs: a list of FuncXFutures; will have their task_id attribute
-            set when function completes successfully.
-        :param tasks: a list of tasks to submit upstream in a batch.
+        Run by the sender threads: submit one batch, and then send its futures
+        to the ResultWatcher.  On error, the batch's futures are cancelled, and
+        the error is raised by the task submission thread, which shuts down the
+        executor.
         """
-        batch = self.funcx_client.create_batch(
+        try:
+            self._send_batch(futs, tasks, batch)
+            self._watch_futures(futs)
+        except Exception as exc:
+            if self._submission_error is None:
+                self._submission_error = exc
+            for fut in futs:
+                fut.cancel()
+                fut.set_running_or_notify_cancel()
+            deliver(futs)
+            self._tasks_to_send.put((None, None))  # wake the submission thread
+        finally:
+            self.in_flight.discharge(_payload_size(batch))
+            in_flight.release()
+
+    def _watch_futures(self, futs: list[FuncXFuture]) -> None:
+        with self._shutdown_lock:
+            if self._stopped:
+                return
+
+            if not (self._result_watcher and self._result_watcher.is_alive()):
+                # Don't initialize the result watcher unless at least
+                # one batch has been sent
+                self._result_watcher = self._new_result_watcher()
+                self._result_watcher.start()
+            try:
+                self._result_watcher.watch_for_task_results(futs)
+            except self._result_watcher.__class__.ShuttingDownError:
+                log.debug("Waiting for previous ResultWatcher to shutdown")
+                self._result_watcher.join()
+                self._result_watcher = self._new_result_watcher()
+                self._result_watcher.start()
+                self._result_watcher.watch_for_task_results(futs)
+
+    def _new_result_watcher(self) -> _ResultWatcher:
+        return _ResultWatcher(
+            self,
+            prefetch_count=self.result_prefetch_count,
+            max_unmatched_bytes=self.max_unmatched_result_bytes,
+            lazy_results=self.lazy_results,
+            result_cache=self.result_cache,
+            latency=self.latency,
+        )
+
+    def _new_batch(self) -> Batch:
+        return self.funcx_client.create_batch(
             task_group_id=self.task_group_id,
             create_websocket_queue=True,
+            share_arguments=self.share_arguments,
         )
-        for task in tasks:
-            batch.add(task.function_id, task.endpoint_id, task.args, task.kwargs)
-            log.debug("Added task to funcX batch: %s", task)
 
+    @staticmethod
+    def _add_to_batch(batch: Batch, task: TaskSubmissionInfo) -> None:
+        batch.add(task.function_id, task.endpoint_id, task.args, task.kwargs)
+        log.debug("Added task to funcX batch: %s", task)
+
+    def _send_batch(
+        self, futs: list[FuncXFuture], tasks: list[TaskSubmissionInfo], batch: Batch
+    ):
+        """
+        Submit a batch of tasks to the webservice.  Upon success, update the
+        futures with their associated task_id.
+
+        :param futs: a list of FuncXFutures; will have their task_id attribute
+            set when function completes successfully.
+        :param tasks: the list of tasks in the batch
+        :param batch: the tasks, serialized (see ``_add_to_batch()``)
+        """
+        payload_size = _payload_size(batch)
+        if self.latency is not None:
+            posted = time.time()
+            for fut in futs:
+                if fut.timeline is not None:
+                    fut.timeline.stamp(BATCH_POSTED, posted)
+        start = time.monotonic()
         try:
             batch_tasks = self.funcx_client.batch_run(batch)
         except Exception:
             log.error(f"Error submitting {len(tasks)} tasks to funcX")
+            self.batch_policy.record(
+                len(tasks), payload_size, time.monotonic() - start, error=True
+            )
             raise
+        self.batch_policy.record(len(tasks), payload_size, time.monotonic() - start)
 
-        self.task_count_submitted += len(batch_tasks)
+        with self._submission_lock:
+            self.task_count_submitted += len(batch_tasks)
+            task_count_submitted = self.task_count_submitted
         log.debug(
             "Batch submitted to task_group: %s - %s",
             self.task_group_id,
-            self.task_count_submitted,
+            task_count_submitted,
         )
 
+        if self.latency is not None:
+            assigned = time.time()
+            for fut in futs:
+                if fut.timeline is not None:
+                    fut.timeline.stamp(TASK_ID_ASSIGNED, assigned)
         for fut, task_uuid in zip(futs, batch_tasks):
             fut.task_id = task_uuid
 
 
+class _SpilledResults:
+    """
+    Result messages kept in a temporary file rather than in memory, by task id;
+    only their offsets are kept in memory.  The file is created on first use,
+    and emptied whenever the last result is taken out of it.
+
+    Not thread-safe: used by the _ResultWatcher's ioloop only.
+
+    :param directory: where to create the file [default: the system's
+        temporary directory]
+    """
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory
+        self._file: t.BinaryIO | None = None
+        # task_id -> (offset, length, AMQP timestamp, time received)
+        self._index: dict[str, tuple[int, int, int | None, float | None]] = {}
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._index
+
+    def keys(self) -> t.KeysView[str]:
+        return self._index.keys()
+
+    def put(
+        self,
+        task_id: str,
+        body: bytes,
+        timestamp: int | None,
+        arrived: float | None = None,
+    ) -> None:
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(
+                prefix="funcx-results-", dir=self.directory
+            )
+        if task_id in self._index:
+            self.nbytes -= self._index[task_id][1]
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(body)
+        self._index[task_id] = (offset, len(body), timestamp, arrived)
+        self.nbytes += len(body)
+
+    def pop(self, task_id: str) -> tuple[BasicProperties, Result, float | None]:
+        """The result of ``task_id``, and when it was received (if given)"""
+        assert self._file is not None
+        offset, length, timestamp, arrived = self._index.pop(task_id)
+        self.nbytes -= length
+        self._file.seek(offset)
+        body = self._file.read(length)
+        if not self._index:
+            self._file.seek(0)
+            self._file.truncate()
+        props = pika.BasicProperties(timestamp=timestamp)
+        return props, messagepack.unpack(body), arrived
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._index.clear()
+        self.nbytes = 0
+
+
 class _ResultWatcher(threading.Thread):
     """
     _ResultWatcher is an internal SDK class meant for consumption by the
@@ -718,10 +1513,21 @@ class _ResultWatcher(threading.Thread):
     will opportunistically shutdown; the caller must handle this scenario
     if new futures arrive, and create a new _ResultWatcher instance.
 
+    Results are matched to futures as soon as either arrives: when a result
+    message is received (see ``_on_message()``), or when its future is watched
+    (see ``watch_for_task_results()``).  Results that arrive before their
+    futures are kept in memory up to ``max_unmatched_bytes``, and beyond that
+    in a temporary file (see ``_SpilledResults``).  Received messages are
+    acknowledged upstream in bulk, once ``ack_batch_size`` are outstanding or
+    at most ``ack_interval_s`` after the first of them was received.  Completed
+    futures are handed to their completion streams (see
+    ``FuncXExecutor.as_completed()``) once per network read; while a stream's
+    consumer is behind, acknowledgements are held back.
+
     :param funcx_executor: A FuncXExecutor instance
     :param poll_period_s: [default: 0.5] how frequently to check for and
-        handle events.  For example, if the thread should stop due to user
-        request or if there are results to match.
+        handle events that are not otherwise signalled to the ioloop; for
+        example, if the thread should stop due to user request.
     :param connect_attempt_limit: [default: 3] how many times to attempt
         connecting to the AMQP server before bailing.
     :param channel_close_window_s: [default: 10] how large a window to
@@ -729,6 +1535,32 @@ class _ResultWatcher(threading.Thread):
     :param channel_close_window_limit: [default: 3] how many reopen
         attempts to allow within the tally window before concluding
         there is an external error and shutting down the watcher.
+    :param decode_workers: [default: 2] how many threads deserialize large
+        results, so that the AMQP ioloop (heartbeats, acks, and other results)
+        is not held up meanwhile.
+    :param inline_decode_bytes: [default: 64KiB] results smaller than this
+        are deserialized directly on the ioloop, as handing them off to a
+        thread would take longer.
+    :param ack_batch_size: [default: 100] acknowledge received messages once
+        this many are outstanding
+    :param ack_interval_s: [default: 0.1] acknowledge received messages at
+        most this long after receiving them
+    :param prefetch_count: [default: 1024] how many messages the AMQP service
+        may send ahead of their acknowledgement; 0 for no limit
+    :param prefetch_size: [default: 0] how many bytes of messages the AMQP
+        service may send ahead of their acknowledgement; 0 for no limit.  (Not
+        supported by RabbitMQ.)
+    :param max_unmatched_bytes: [default: 64MiB] how many bytes of results
+        without a watched future to keep in memory; more are written to disk
+    :param spill_dir: [default: None] where to write results beyond
+        ``max_unmatched_bytes``; None for the system's temporary directory
+    :param lazy_results: [default: False] complete futures with the serialized
+        results, to be deserialized when first read (see
+        ``FuncXFuture.set_serialized_result()``)
+    :param result_cache: [default: None] where to store the serialized results
+        of futures submitted with a result cache key
+    :param latency: [default: None] where to record the timelines of futures
+        that have one, once complete
     """
 
     class ShuttingDownError(Exception):
@@ -741,6 +1573,17 @@ class _ResultWatcher(threading.Thread):
         connect_attempt_limit=5,
         channel_close_window_s=10,
         channel_close_window_limit=3,
+        decode_workers=2,
+        inline_decode_bytes=DEFAULT_INLINE_DECODE_BYTES,
+        ack_batch_size=100,
+        ack_interval_s=0.1,
+        prefetch_count=DEFAULT_RESULT_PREFETCH_COUNT,
+        prefetch_size=0,
+        max_unmatched_bytes=DEFAULT_MAX_UNMATCHED_BYTES,
+        spill_dir: str | None = None,
+        lazy_results=False,
+        result_cache: ResultCache | None = None,
+        latency: LatencyRecorder | None = None,
     ):
         super().__init__()
         self.funcx_executor = funcx_executor
@@ -756,15 +1599,33 @@ class _ResultWatcher(threading.Thread):
 
         self._open_futures: dict[str, FuncXFuture] = {}
         self._received_results: dict[str, tuple[BasicProperties, Result]] = {}
+        self._received_bytes = 0
+        # task_id -> when its result message arrived, for the unmatched results
+        # in _received_results, if tracking latency (the spilled results keep
+        # theirs on file); so bounded as those are
+        self._arrived: dict[str, float] = {}
+        self._spilled = _SpilledResults(spill_dir)
+        self.max_unmatched_bytes = max_unmatched_bytes
+        self.prefetch_count = max(0, prefetch_count)
+        self.prefetch_size = max(0, prefetch_size)
 
         self._open_futures_empty = threading.Event()
         self._open_futures_empty.set()
         self._time_to_stop = False
 
         # how often to check for work; every `poll_period_s`, the `_event_watcher`
-        # method will invoke to match results to tasks, ack upstream, and see if
-        # it's time to shut down the connection and thread.
+        # method will invoke to see if it's time to shut down the connection and
+        # thread.  (It also matches results and acks, in case those were missed.)
         self.poll_period_s = poll_period_s
+
+        # received messages are acked once this many are outstanding, or this
+        # long after the first of them arrived
+        self.ack_batch_size = max(1, ack_batch_size)
+        if self.prefetch_count:
+            # else the service would wait for acks we wait to send
+            self.ack_batch_size = min(self.ack_batch_size, self.prefetch_count)
+        self.ack_interval_s = ack_interval_s
+        self._ack_timer: object | None = None
         self._connection_tries = 0  # count of connection events; reset on success
 
         # how many times to attempt connection before giving up and shutting
@@ -785,6 +1646,32 @@ class _ResultWatcher(threading.Thread):
         # window before giving up and shutting down the thread
         self.channel_close_window_limit = channel_close_window_limit
 
+        # large results are deserialized by a pool of threads, started on demand
+        self.decode_workers = max(1, decode_workers)
+        self.inline_decode_bytes = inline_decode_bytes
+        self.lazy_results = lazy_results
+        self.result_cache = result_cache
+        # results are stored in the result cache by a thread, off the ioloop
+        self._cache_writer: concurrent.futures.ThreadPoolExecutor | None = None
+        self.latency = latency
+        self._decoder: concurrent.futures.ThreadPoolExecutor | None = None
+        self._decode_lock = threading.Lock()
+        self._decode_queue_depth = 0
+        self._decoded = 0
+        self._decoded_bytes = 0
+        self._decode_s = 0.0
+        self._decode_max_s = 0.0
+
+        # futures completed on the ioloop, not yet handed to completion streams
+        self._completed: list[FuncXFuture] = []
+        self._delivery_scheduled = False
+        # completion streams whose consumer is behind (by id), with finalizers
+        # to release their holds should they be dropped unconsumed; see
+        # as_completed().  Reentrant: a finalizer may run on any thread, at
+        # any point, including while the lock is held.
+        self._ack_holds: dict[int, weakref.finalize] = {}
+        self._ack_holds_lock = threading.RLock()
+
     def __repr__(self):
         return "{}<{}; pid={}; fut={:,d}; res={:,d}; qp={}>".format(
             self.__class__.__name__,
@@ -837,11 +1724,22 @@ class _ResultWatcher(threading.Thread):
                             "SDK thread quit unexpectedly."
                         )
 
+                    failed = []
                     while self._open_futures:
                         _, fut = self._open_futures.popitem()
                         fut.set_exception(self._cancellation_reason)
+                        failed.append(fut)
                         log.debug("Cancelled: %s", fut.task_id)
                     self._open_futures_empty.set()
+                    deliver(failed)
+
+        if self._decoder:
+            # results already matched to futures are still delivered
+            self._decoder.shutdown(wait=True)
+        if self._cache_writer:
+            self._cache_writer.shutdown(wait=True)
+        self._arrived.clear()
+        self._spilled.close()
         log.debug("%r AMQP thread complete.", self)
 
     def shutdown(self, wait=True, *, cancel_futures=False):
@@ -849,6 +1747,7 @@ class _ResultWatcher(threading.Thread):
             return
 
         self._closed = True  # No more futures will be accepted
+        self._release_ack_holds()  # the remaining results must still arrive
 
         if threading.get_ident() == self._thread_id:
             self._stop_ioloop()
@@ -857,11 +1756,14 @@ class _ResultWatcher(threading.Thread):
             # External thread called this method
             if cancel_futures:
                 with self._new_futures_lock:
+                    cancelled = []
                     while self._open_futures:
                         _, fut = self._open_futures.popitem()
                         fut.cancel()
                         fut.set_running_or_notify_cancel()
+                        cancelled.append(fut)
                     self._open_futures_empty.set()
+                deliver(cancelled)
 
             # N.B. Per Python Executor documentation, the whole program can't
             # exit() until all futures are complete, regardless of the `wait`
@@ -913,50 +1815,260 @@ class _ResultWatcher(threading.Thread):
 
             if self._open_futures:  # futures as an empty list is acceptable
                 self._open_futures_empty.clear()
-                if self._received_results:
-                    # no sense is setting the event if there are not yet
-                    # any results
-                    self._time_to_check_results.set()
+            # no sense in matching if none of the results are already here.
+            # (Iterating over to_watch; the others may change meanwhile.)
+            results_waiting = any(
+                tid in self._received_results or tid in self._spilled
+                for tid in to_watch
+            )
+            if results_waiting:
+                self._time_to_check_results.set()
+
+        if results_waiting:
+            self._wake_ioloop()
         return len(to_watch)
 
-    def _match_results_to_futures(self):
+    def _store_result(self, key: str, data: str) -> None:
+        assert self.result_cache is not None
+        try:
+            self.result_cache.put(key, data)
+        except Exception:
+            log.exception("%r Unable to store result in the result cache", self)
+
+    def _wake_ioloop(self):
+        """
+        Have the ioloop match results to futures now, rather than at its next
+        poll; safe to call from any thread.
+        """
+        connection = self._connection
+        if connection is None or self._closed:
+            return
+        try:
+            connection.ioloop.add_callback_threadsafe(self._check_results)
+        except Exception:
+            # e.g., the connection is closing; the next poll will do
+            log.debug("%r Unable to wake the ioloop", self, exc_info=True)
+
+    def _check_results(self):
+        if self._time_to_check_results.is_set():
+            self._time_to_check_results.clear()
+            self._match_results_to_futures()
+
+    def _match_results_to_futures(self, task_ids: t.Iterable[str] | None = None):
         """
         Match the internal ``_received_results`` and ``_open_futures`` on their
         keys, and complete the associated futures.  All matching items will,
         after processing, be forgotten (i.e., ``.pop()``).
 
+        If ``task_ids`` is given, only those tasks are considered (rather than
+        every open future).
+
+        Small results are deserialized here; large results (see
+        ``inline_decode_bytes``) are handed to the decoding threads, and their
+        futures completed there.
+
         This method will set the _open_futures_empty event if there are no open
         futures *at the time of processing*.
         """
-        deserialize = self.funcx_executor.funcx_client.fx_serializer.deserialize
         with self._new_futures_lock:
-            futures_to_complete = [
-                self._open_futures.pop(tid)
-                for tid in self._open_futures.keys() & self._received_results.keys()
-            ]
+            if task_ids is None:
+                to_match = self._open_futures.keys() & self._received_results.keys()
+                if self._spilled:
+                    to_match |= self._open_futures.keys() & self._spilled.keys()
+            else:
+                to_match = {
+                    tid
+                    for tid in task_ids
+                    if tid in self._open_futures
+                    and (tid in self._received_results or tid in self._spilled)
+                }
+            futures_to_complete = [self._open_futures.pop(tid) for tid in to_match]
             if not self._open_futures:
                 self._open_futures_empty.set()
 
         for fut in futures_to_complete:
-            props, res = self._received_results.pop(fut.task_id)
+            if fut.task_id in self._received_results:
+                props, res = self._received_results.pop(fut.task_id)
+                self._received_bytes -= len(res.data)
+                arrived = self._arrived.pop(fut.task_id, None)
+            else:
+                props, res, arrived = self._spilled.pop(fut.task_id)
+
+            if fut.timeline is not None:
+                fut.timeline.stamp(RESULT_ARRIVED, arrived)
+                fut.timeline.add_transitions(res.task_statuses)
 
             if res.is_error:
+                self._record_timeline(fut)
                 fut.set_exception(
                     FuncxTaskExecutionFailed(res.data, str(props.timestamp or 0))
                 )
-            else:
+                self._completed.append(fut)
+                continue
+
+            if fut._result_cache_key and self.result_cache is not None:
+                if self._cache_writer is None:
+                    self._cache_writer = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="ResultWatcher-cache"
+                    )
+                self._cache_writer.submit(
+                    self._store_result, fut._result_cache_key, res.data
+                )
+
+            if self.lazy_results:
+                deserialize = self.funcx_executor.funcx_client.fx_serializer.deserialize
+                self._record_timeline(fut)
                 try:
-                    fut.set_result(deserialize(res.data))
+                    fut.set_serialized_result(res.data, deserialize)
                 except InvalidStateError as err:
                     log.error(
                         f"Unable to set future state ({err}) for task: {fut.task_id}"
                     )
-                except Exception as exc:
-                    task_exc = Exception(
-                        f"Malformed or unexpected data structure. Data: {res.data}",
+                self._completed.append(fut)
+            elif len(res.data) < self.inline_decode_bytes:
+                self._complete_future(fut, res)
+                self._completed.append(fut)
+            else:
+                if self._decoder is None:
+                    self._decoder = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.decode_workers,
+                        thread_name_prefix="ResultWatcher-decode",
                     )
-                    task_exc.__cause__ = exc
-                    fut.set_exception(task_exc)
+                with self._decode_lock:
+                    self._decode_queue_depth += 1
+                self._decoder.submit(self._complete_future, fut, res, queued=True)
+
+        if self._completed:
+            self._schedule_delivery()
+
+    def _schedule_delivery(self):
+        """
+        Hand the completed futures to their completion streams: on the ioloop,
+        once the results of the current network read are all matched, so that
+        streams receive them in batches.
+        """
+        if self._connection is None or threading.get_ident() != self._thread_id:
+            self._deliver_completed()
+        elif not self._delivery_scheduled:
+            self._delivery_scheduled = True
+            self._connection.ioloop.call_later(0, self._deliver_completed)
+
+    def _deliver_completed(self):
+        self._delivery_scheduled = False
+        completed, self._completed = self._completed, []
+        deliver(completed, self._on_stream_flow_control)
+
+    def _on_stream_flow_control(self, stream: CompletionStream, full: bool):
+        """
+        While a completion stream's consumer is behind (``full``), received
+        results are not acknowledged, so the AMQP service stops sending more
+        once ``prefetch_count`` are outstanding.
+        """
+        key = id(stream)
+        with self._ack_holds_lock:
+            if full:
+                if key not in self._ack_holds and not self._closed:
+                    log.debug("%r Consumer behind; holding acknowledgements", self)
+                    self._ack_holds[key] = weakref.finalize(
+                        stream, self._on_held_stream_collected, key
+                    )
+                return
+            hold = self._ack_holds.pop(key, None)
+        if hold is not None:
+            hold.detach()
+            self._resume_acks()
+
+    def _on_held_stream_collected(self, key: int):
+        log.debug("%r Completion stream dropped; releasing its hold", self)
+        with self._ack_holds_lock:
+            self._ack_holds.pop(key, None)
+        self._resume_acks()
+
+    def _release_ack_holds(self):
+        with self._ack_holds_lock:
+            holds, self._ack_holds = self._ack_holds, {}
+        for hold in holds.values():
+            hold.detach()
+        if holds:
+            self._resume_acks(closing=True)
+
+    def _resume_acks(self, closing=False):
+        """Acknowledge the received results, unless a stream still holds them"""
+        with self._ack_holds_lock:
+            held = bool(self._ack_holds)
+        connection = self._connection
+        if held or connection is None or (self._closed and not closing):
+            return
+        try:
+            connection.ioloop.add_callback_threadsafe(self._ack_received)
+        except Exception:
+            # e.g., the connection is closing; the next poll will do
+            log.debug("%r Unable to wake the ioloop", self, exc_info=True)
+
+    def _complete_future(self, fut: FuncXFuture, res: Result, queued=False):
+        deserialize = self.funcx_executor.funcx_client.fx_serializer.deserialize
+        start = time.monotonic()
+        try:
+            result = deserialize(res.data)
+            if fut.timeline is not None:
+                fut.timeline.stamp(DESERIALIZED)
+            self._record_timeline(fut)
+            fut.set_result(result)
+        except InvalidStateError as err:
+            log.error(f"Unable to set future state ({err}) for task: {fut.task_id}")
+        except Exception as exc:
+            task_exc = Exception(
+                f"Malformed or unexpected data structure. Data: {res.data}",
+            )
+            task_exc.__cause__ = exc
+            self._record_timeline(fut)
+            fut.set_exception(task_exc)
+        finally:
+            if queued:
+                deliver((fut,), self._on_stream_flow_control)
+            elapsed = time.monotonic() - start
+            with self._decode_lock:
+                if queued:
+                    self._decode_queue_depth -= 1
+                self._decoded += 1
+                self._decoded_bytes += len(res.data)
+                self._decode_s += elapsed
+                self._decode_max_s = max(self._decode_max_s, elapsed)
+
+    def _record_timeline(self, fut: FuncXFuture) -> None:
+        # before the future is completed, so that its waiters see the stats
+        if fut.timeline is not None and self.latency is not None:
+            self.latency.record(fut.timeline)
+
+    def buffer_stats(self) -> dict[str, int]:
+        """
+        The number and bytes of results received before their futures, in
+        memory and on disk
+        """
+        return {
+            "received": len(self._received_results),
+            "received_bytes": self._received_bytes,
+            "spilled": len(self._spilled),
+            "spilled_bytes": self._spilled.nbytes,
+        }
+
+    def decode_stats(self) -> dict[str, t.Any]:
+        """
+        Statistics of result deserialization: the number of large results
+        waiting for (or being) deserialized off the ioloop, the number and
+        bytes of results deserialized so far, and the mean and longest time to
+        deserialize one.
+        """
+        with self._decode_lock:
+            return {
+                "queue_depth": self._decode_queue_depth,
+                "decoded": self._decoded,
+                "bytes": self._decoded_bytes,
+                "mean_decode_s": self._decode_s / self._decoded
+                if self._decoded
+                else 0.0,
+                "max_decode_s": self._decode_max_s,
+            }
 
     def _event_watcher(self):
         """
@@ -978,21 +2090,41 @@ class _ResultWatcher(threading.Thread):
             return
 
         try:
-            if self._to_ack:
-                self._to_ack.sort()  # no change in the happy path
-                latest_msg_id = self._to_ack[-1]
-                self._channel.basic_ack(latest_msg_id, multiple=True)
-                self._to_ack.clear()
-                log.debug("%r Acknowledged through message: %s", self, latest_msg_id)
+            self._ack_received()
 
             if self._time_to_check_results.is_set():
-                self._time_to_check_results.clear()
-                self._match_results_to_futures()
+                self._check_results()
                 if not (self._open_futures or self._received_results):
                     log.debug("%r Idle; no outstanding results or futures.", self)
         finally:
             self._connection.ioloop.call_later(self.poll_period_s, self._event_watcher)
 
+    def _ack_received(self, force=False):
+        """
+        Acknowledge, in one go, all received messages not yet acknowledged;
+        unless a completion stream's consumer is behind, and not ``force``.
+        """
+        with self._ack_holds_lock:
+            held = bool(self._ack_holds)
+        if self._to_ack and (force or not held):
+            self._to_ack.sort()  # no change in the happy path
+            latest_msg_id = self._to_ack[-1]
+            self._channel.basic_ack(latest_msg_id, multiple=True)
+            self._to_ack.clear()
+            log.debug("%r Acknowledged through message: %s", self, latest_msg_id)
+
+    def _schedule_ack(self):
+        if len(self._to_ack) >= self.ack_batch_size:
+            self._ack_received()
+        elif self._ack_timer is None and self._connection is not None:
+            self._ack_timer = self._connection.ioloop.call_later(
+                self.ack_interval_s, self._on_ack_timer
+            )
+
+    def _on_ack_timer(self):
+        self._ack_timer = None
+        self._ack_received()
+
     def _on_message(
         self,
         channel: Channel,
@@ -1005,13 +2137,17 @@ class _ResultWatcher(threading.Thread):
         (ioloop) when a new Result message has arrived from upstream.  This
         method will attempt to unpack the bytes so as to minimally verify that
         the message is a valid Result object, and then store the unpacked
-        object in self._received_results for later processing and set the
-        ``_time_to_check_results`` event.
+        object in self._received_results.  If the result's future is already
+        watched, it is completed right away; otherwise, the result waits for
+        its future (and the ``_time_to_check_results`` event is set), in
+        memory or, beyond ``max_unmatched_bytes``, on disk.  The
+        message is acknowledged with the next bulk acknowledgement.
 
         If the received message is *not* a result, then immediately NACK the
         message to AMQP service -- the responsibility to handle invalid messages
         is not with this class.
         """
+        arrived = time.time()
         msg_id: int = basic_deliver.delivery_tag
         log.debug("Received message %s: [%s] %s", msg_id, props, body)
 
@@ -1020,14 +2156,41 @@ class _ResultWatcher(threading.Thread):
             if not isinstance(res, Result):
                 raise TypeError(f"Non-Result object received ({type(res)})")
 
-            self._received_results[str(res.task_id)] = (props, res)
-            self._to_ack.append(msg_id)
-            self._time_to_check_results.set()
+            task_id = str(res.task_id)
         except Exception:
             # No sense in waiting for the RMQ default 30m timeout; let it know
             # *now* that this message failed.
             log.exception("Invalid message type queue put failed")
             channel.basic_nack(msg_id, requeue=True)
+            return
+
+        self._to_ack.append(msg_id)
+        if self.latency is None:
+            arrived = None
+        if task_id in self._open_futures:
+            self._received_results[task_id] = (props, res)
+            self._received_bytes += len(res.data)
+            self._set_arrived(task_id, arrived)
+            self._match_results_to_futures((task_id,))
+        else:
+            if self._received_bytes + len(res.data) > self.max_unmatched_bytes:
+                timestamp = props.timestamp if props else None
+                self._spilled.put(task_id, body, timestamp, arrived)
+                self._arrived.pop(task_id, None)  # superseded, if held
+            else:
+                if task_id in self._received_results:  # superseded
+                    self._received_bytes -= len(self._received_results[task_id][1].data)
+                self._received_results[task_id] = (props, res)
+                self._received_bytes += len(res.data)
+                self._set_arrived(task_id, arrived)
+            self._time_to_check_results.set()
+        self._schedule_ack()
+
+    def _set_arrived(self, task_id: str, arrived: float | None):
+        if arrived is None:
+            self._arrived.pop(task_id, None)
+        else:
+            self._arrived[task_id] = arrived
 
     def _stop_ioloop(self):
         """
@@ -1044,6 +2207,7 @@ class _ResultWatcher(threading.Thread):
             if self._connection.is_open:
                 if self._channel:
                     if self._channel.is_open:
+                        self._ack_received(force=True)
                         self._channel.close()
                     elif self._channel.is_closed:
                         self._channel = None
@@ -1138,6 +2302,10 @@ class _ResultWatcher(threading.Thread):
             self.shutdown()
 
     def _start_consuming(self):
+        if self.prefetch_count or self.prefetch_size:
+            self._channel.basic_qos(
+                prefetch_size=self.prefetch_size, prefetch_count=self.prefetch_count
+            )
         self._consumer_tag = self._channel.basic_consume(
             queue=f"{self._queue_prefix}{self.funcx_executor.task_group_id}",
             on_message_callback=self._on_message,
@@ -0,0 +1,121 @@
+"""
+A persistent cache of function registrations, so that processes registering the
+same function (e.g., repeated runs of a job script) reuse its ``function_id``
+rather than registering it with the web service again.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+import typing as t
+
+from funcx.sdk.web_client import FunctionRegistrationData
+
+logger = logging.getLogger(__name__)
+
+REGISTRATION_CACHE_FILENAME = "function_registrations.db"
+
+
+class FunctionRegistrationCache:
+    """Maps registrations to the ``function_id`` the web service returned for them,
+    in a SQLite database (by default, next to the other funcX files in
+    ``funcx_home``).
+
+    Registrations are keyed by a digest of the web service address, of the
+    authenticated identity, and of everything sent upstream: the packed
+    function code, ``container_uuid``, entry point, description, and sharing
+    settings.  A changed function (or different registration arguments, or
+    another user) is therefore registered anew.
+
+    The cache never fails a registration: if the database cannot be read or
+    written, the registration goes upstream as usual.  If a cached function was
+    deleted upstream, ``FuncXClient`` removes its entry (see ``clear()``) when
+    a submission is rejected as not found, and registers the function again.
+
+    :param filename: path of the SQLite database; created on first use
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        service_address: str, identity_id: str, data: FunctionRegistrationData
+    ) -> str:
+        blob = json.dumps(
+            [service_address, identity_id, data.to_dict()], sort_keys=True
+        )
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    @contextlib.contextmanager
+    def _connect(self) -> t.Iterator[sqlite3.Connection]:
+        # one short-lived connection per operation: registrations are rare, and
+        # this is safe across threads and concurrent processes
+        dirname = os.path.dirname(self.filename)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        conn = sqlite3.connect(self.filename, timeout=10)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS function_registrations ("
+                    " key TEXT PRIMARY KEY,"
+                    " function_id TEXT NOT NULL,"
+                    " registered_at REAL NOT NULL)"
+                )
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached ``function_id`` for ``key``, if any"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT function_id FROM function_registrations WHERE key = ?",
+                    (key,),
+                ).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Unable to read function registration cache: {e}")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, function_id: str) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO function_registrations"
+                    " (key, function_id, registered_at) VALUES (?, ?, ?)",
+                    (key, function_id, time.time()),
+                )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Unable to write function registration cache: {e}")
+
+    def clear(self, function_id: str | None = None) -> None:
+        """Forget all registrations, or only those of ``function_id``"""
+        try:
+            with self._connect() as conn:
+                if function_id is None:
+                    conn.execute("DELETE FROM function_registrations")
+                else:
+                    conn.execute(
+                        "DELETE FROM function_registrations WHERE function_id = ?",
+                        (function_id,),
+                    )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Unable to clear function registration cache: {e}")
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,331 @@
+"""
+Caches of task results, keyed by the function and payload of the task, so
+that FuncXExecutor can resolve a repeated invocation (e.g., a retried sweep, or
+a re-run notebook) locally, rather than executing it again.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+
+# these were added to stdlib typing in 3.8, so the import must be conditional
+# mypy and other tools expect and document a sys.version_info check
+if sys.version_info >= (3, 8):
+    from typing import Protocol, runtime_checkable
+else:
+    from typing_extensions import Protocol, runtime_checkable
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_FILENAME = "task_results.db"
+
+DEFAULT_RESULT_CACHE_SIZE = 10_000
+DEFAULT_RESULT_CACHE_BYTES = 256 * 1024 * 1024
+
+SerializedResult = t.Union[str, bytes]
+
+
+def result_key(function_id: str, endpoint_id: str, payload: str | bytes) -> str:
+    """
+    The cache key of an invocation: a digest of the function, the endpoint, and
+    the task's payload (its packed, serialized arguments), as submitted.
+    Arguments that serialize identically are therefore considered the same.
+    """
+    h = hashlib.sha256()
+    for part in (function_id, endpoint_id, payload):
+        h.update(part.encode() if isinstance(part, str) else part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+@runtime_checkable
+class ResultCache(Protocol):
+    """What FuncXExecutor requires of a result cache: a mapping of keys (see
+    ``result_key()``) to serialized results.  ``put()`` is called from the
+    executor's result watcher, so must be safe to use from several threads."""
+
+    def get(self, key: str) -> SerializedResult | None:
+        ...
+
+    def put(self, key: str, payload: SerializedResult) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def stats(self) -> dict[str, int]:
+        ...
+
+
+class MemoryResultCache:
+    """Keeps serialized results in memory, evicting the least recently used.
+
+    An entry is evicted when more than ``max_entries`` results, or more than
+    ``max_bytes`` of serialized results, are cached; and is dropped when read
+    more than ``ttl`` seconds after the result was stored.
+
+    :param max_entries: the most results to keep; None for no limit
+    :param max_bytes: the most serialized bytes to keep; None for no limit
+    :param ttl: seconds a result may be reused; None for no limit
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = DEFAULT_RESULT_CACHE_SIZE,
+        max_bytes: int | None = DEFAULT_RESULT_CACHE_BYTES,
+        ttl: float | None = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        # key -> (payload, time stored)
+        self._entries: OrderedDict[str, tuple[SerializedResult, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> SerializedResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            payload, stored = entry
+            if self.ttl is not None and time.monotonic() - stored > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key: str, payload: SerializedResult) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (payload, time.monotonic())
+            self.nbytes += len(payload)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _remove(self, key: str) -> None:
+        payload, _ = self._entries.pop(key)
+        self.nbytes -= len(payload)
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "bytes": self.nbytes,
+            }
+
+
+class DiskResultCache:
+    """Keeps serialized results in a SQLite database, so that they outlive the
+    process (e.g., next to the other funcX files, in
+    ``os.path.join(funcx_client.funcx_home, RESULT_CACHE_FILENAME)``).
+
+    Eviction is as with ``MemoryResultCache``, the least recently read results
+    first; ``ttl`` is measured in wall-clock time, so applies across runs.  The
+    entries and bytes held are counted when the database is opened, and then
+    kept as results are stored and removed, so results written concurrently by
+    another process are only accounted for on the next open.
+
+    Like the function registration cache, this cache never fails a task: if
+    the database cannot be read or written, the task is submitted as usual.
+
+    :param filename: path of the SQLite database; created on first use
+    :param max_entries: the most results to keep; None for no limit
+    :param max_bytes: the most serialized bytes to keep; None for no limit
+    :param ttl: seconds a result may be reused; None for no limit
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_entries: int | None = DEFAULT_RESULT_CACHE_SIZE,
+        max_bytes: int | None = DEFAULT_RESULT_CACHE_BYTES,
+        ttl: float | None = None,
+    ):
+        self.filename = filename
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        # results are written as they arrive, so keep one connection (unlike
+        # the registration cache), shared by the submitting and result threads
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._count = 0
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # with self._lock held
+        if self._conn is None:
+            dirname = os.path.dirname(self.filename)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            conn = sqlite3.connect(self.filename, timeout=10, check_same_thread=False)
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS task_results ("
+                    " key TEXT PRIMARY KEY,"
+                    " payload BLOB NOT NULL,"
+                    " nbytes INTEGER NOT NULL,"
+                    " stored_at REAL NOT NULL,"
+                    " read_at REAL NOT NULL)"
+                )
+            self._count, self.nbytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM task_results"
+            ).fetchone()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> SerializedResult | None:
+        now = time.time()
+        row = None
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn:
+                    row = conn.execute(
+                        "SELECT payload, stored_at, nbytes FROM task_results"
+                        " WHERE key = ?",
+                        (key,),
+                    ).fetchone()
+                    if row is not None:
+                        if self.ttl is not None and now - row[1] > self.ttl:
+                            conn.execute(
+                                "DELETE FROM task_results WHERE key = ?", (key,)
+                            )
+                            self._count -= 1
+                            self.nbytes -= row[2]
+                            self.expirations += 1
+                            row = None
+                        else:
+                            conn.execute(
+                                "UPDATE task_results SET read_at = ? WHERE key = ?",
+                                (now, key),
+                            )
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Unable to read task result cache: {e}")
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, payload: SerializedResult) -> None:
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                count, nbytes = self._count, self.nbytes
+                with conn:
+                    old = conn.execute(
+                        "SELECT nbytes FROM task_results WHERE key = ?", (key,)
+                    ).fetchone()
+                    if old is None:
+                        count += 1
+                    else:
+                        nbytes -= old[0]
+                    nbytes += len(payload)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO task_results"
+                        " (key, payload, nbytes, stored_at, read_at)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (key, payload, len(payload), now, now),
+                    )
+                    evicted, count, nbytes = self._evict(conn, count, nbytes)
+                # only once committed
+                self._count, self.nbytes = count, nbytes
+                self.evictions += evicted
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Unable to write task result cache: {e}")
+
+    def _evict(
+        self, conn: sqlite3.Connection, count: int, nbytes: int
+    ) -> tuple[int, int, int]:
+        def over() -> bool:
+            return (self.max_entries is not None and count > self.max_entries) or (
+                self.max_bytes is not None and nbytes > self.max_bytes
+            )
+
+        if not over():
+            return 0, count, nbytes
+
+        to_evict = []
+        rows = conn.execute("SELECT key, nbytes FROM task_results ORDER BY read_at")
+        for key, size in rows:
+            if not over():
+                break
+            to_evict.append((key,))
+            count -= 1
+            nbytes -= size
+        conn.executemany("DELETE FROM task_results WHERE key = ?", to_evict)
+        return len(to_evict), count, nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.execute("DELETE FROM task_results")
+                self._count = self.nbytes = 0
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Unable to clear task result cache: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": self._count,
+            "bytes": self.nbytes,
+        }
@@ -0,0 +1,157 @@
+"""
+A bounded cache of completed task statuses (and their deserialized results), so
+that FuncXClient does not fetch a completed task again, without keeping every
+task it has ever seen in memory.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+
+DEFAULT_TASK_CACHE_SIZE = 10_000
+DEFAULT_TASK_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class TaskStatusCache:
+    """Maps task ids to completed task statuses, as returned by
+    ``FuncXClient.get_task``, evicting the least recently used entries.
+
+    Only completed tasks are kept; pending tasks are always asked for anew, so
+    there is nothing to gain from remembering them.  An entry is evicted when
+    more than ``max_entries`` tasks, or more than ``max_bytes`` of results
+    (estimated from the size of their serialized payloads), are cached, or when
+    it was not read for ``ttl`` seconds.  An evicted task is simply fetched
+    again from the web service if asked for.
+
+    A reader that takes the result (``get(..., drop_result=True)``, as
+    ``FuncXClient.get_result()`` does) leaves only the status cached, so a
+    later read returns a status without ``"result"``, and ``FuncXClient``
+    fetches the result again if needed.
+
+    The cache is safe to use from several threads.
+
+    :param max_entries: the most tasks to keep; None for no limit, and 0 to
+        cache nothing
+    :param max_bytes: the most result bytes to keep; None for no limit
+    :param ttl: seconds an unread entry is kept; None to keep entries until
+        the size limits evict them
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = DEFAULT_TASK_CACHE_SIZE,
+        max_bytes: int | None = DEFAULT_TASK_CACHE_BYTES,
+        ttl: float | None = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        # task_id -> (status, nbytes, last access)
+        self._entries: OrderedDict[str, tuple[dict, int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._entries
+
+    def get(
+        self, task_id: str, default: t.Any = None, drop_result: bool = False
+    ) -> t.Any:
+        """Return the cached status of ``task_id``, or ``default``
+
+        :param drop_result: keep only the status cached, as the caller takes
+            the result
+        """
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            status, nbytes, accessed = entry
+            now = time.monotonic()
+            if self.ttl is not None and now - accessed > self.ttl:
+                self._remove(task_id)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            if drop_result and "result" in status:
+                # the caller now holds the result; keep only the status
+                kept = {k: v for k, v in status.items() if k != "result"}
+                self._entries[task_id] = (kept, 0, now)
+                self.nbytes -= nbytes
+            else:
+                self._entries[task_id] = (status, nbytes, now)
+            self._entries.move_to_end(task_id)
+            return status
+
+    def put(self, task_id: str, status: dict, nbytes: int = 0) -> None:
+        """Cache the status of ``task_id`` if it is complete
+
+        :param task_id: the task's id
+        :param status: the task's status, as built by ``FuncXClient``
+        :param nbytes: the (estimated) size of the task's result
+        """
+        with self._lock:
+            if task_id in self._entries:
+                self._remove(task_id)
+            if status.get("pending", True) is not False or self.max_entries == 0:
+                return
+
+            self._entries[task_id] = (status, nbytes, time.monotonic())
+            self.nbytes += nbytes
+            self._evict()
+
+    def update(self, statuses: t.Mapping[str, dict]) -> None:
+        for task_id, status in statuses.items():
+            self.put(task_id, status)
+
+    def pop(self, task_id: str, default: t.Any = None) -> t.Any:
+        with self._lock:
+            if task_id not in self._entries:
+                return default
+            return self._remove(task_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _remove(self, task_id: str) -> dict:
+        status, nbytes, _ = self._entries.pop(task_id)
+        self.nbytes -= nbytes
+        return status
+
+    def _evict(self) -> None:
+        # the most recent entry is kept even if larger than max_bytes alone:
+        # its caller is about to read it
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            task_id = next(iter(self._entries))
+            self._remove(task_id)
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "bytes": self.nbytes,
+            }
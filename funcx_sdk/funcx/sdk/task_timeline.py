@@ -0,0 +1,190 @@
+"""
+Per-task latency timelines -- the SDK's own timestamps, merged with the task
+transitions recorded by the endpoint (interchange, manager, and worker) -- and
+running histograms of the time spent between each pair of consecutive stages.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+import typing as t
+
+if t.TYPE_CHECKING:
+    from funcx_common.messagepack.message_types import TaskTransition
+
+# SDK-side stages, stamped by the FuncXExecutor
+SUBMITTED = "submitted"
+BATCH_POSTED = "batch-posted"
+TASK_ID_ASSIGNED = "task-id-assigned"
+RESULT_ARRIVED = "result-arrived"
+DESERIALIZED = "deserialized"
+
+# The order in which a task passes through the stages, SDK-side and remote
+# (``TaskState`` values); timestamps from different hosts are not compared
+# to order them, as their clocks may disagree
+STAGE_ORDER = (
+    SUBMITTED,
+    BATCH_POSTED,
+    TASK_ID_ASSIGNED,
+    "received",
+    "waiting-for-ep",
+    "waiting-for-nodes",
+    "waiting-for-launch",
+    "running",
+    "execution-start",
+    "execution-end",
+    "result-received",
+    "result-enqueued",
+    RESULT_ARRIVED,
+    DESERIALIZED,
+)
+_STAGE_RANK = {stage: rank for rank, stage in enumerate(STAGE_ORDER)}
+
+# Histogram bucket upper bounds, in seconds: 100us, doubling up to ~28 minutes
+_BUCKET_BOUNDS = tuple(1e-4 * 2**i for i in range(25))
+
+
+class TaskTimeline:
+    """The stages a task went through, and when (as seconds since the epoch).
+
+    SDK-side stages are stamped by the executor (see ``STAGE_ORDER``); the
+    remote transitions arrive with the task's result.  Remote timestamps are
+    from the endpoint's clock, so durations between SDK-side and remote
+    stages include any clock skew between the hosts.
+    """
+
+    __slots__ = ("stages", "transitions")
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self.transitions: list[TaskTransition] = []
+
+    def __repr__(self) -> str:
+        return "{}<{}>".format(
+            self.__class__.__name__, ", ".join(s for s, _ in self.ordered())
+        )
+
+    def stamp(self, stage: str, when: float | None = None) -> None:
+        """Record that the task reached ``stage`` (only the first time)"""
+        if stage not in self.stages:
+            self.stages[stage] = time.time() if when is None else when
+
+    def add_transitions(self, transitions: t.Iterable[TaskTransition] | None):
+        if transitions:
+            self.transitions.extend(transitions)
+
+    def ordered(self) -> list[tuple[str, float]]:
+        """
+        The known stages and their times, in the order of ``STAGE_ORDER``; of
+        repeated remote states, the first.  States not in ``STAGE_ORDER``
+        are omitted.
+        """
+        stages = dict(self.stages)
+        for tt in sorted(self.transitions, key=lambda tt: tt.timestamp):
+            state = getattr(tt.state, "value", tt.state)
+            if state in _STAGE_RANK and state not in stages:
+                stages[state] = tt.timestamp / 1e9
+        return sorted(stages.items(), key=lambda item: _STAGE_RANK[item[0]])
+
+    def durations(self) -> dict[str, float]:
+        """
+        Seconds between each pair of consecutive known stages (as
+        ``"<stage>-><stage>"``), and from the first to the last (``"total"``).
+        Negative durations (from clock skew) are reported as 0.
+        """
+        ordered = self.ordered()
+        durations = {
+            f"{a}->{b}": max(0.0, t_b - t_a)
+            for (a, t_a), (b, t_b) in zip(ordered, ordered[1:])
+        }
+        if len(ordered) > 1:
+            durations["total"] = max(0.0, ordered[-1][1] - ordered[0][1])
+        return durations
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "stages": dict(self.ordered()),
+            "transitions": [tt.to_dict() for tt in self.transitions],
+        }
+
+
+class LatencyHistogram:
+    """A running histogram of durations, in exponentially sized buckets
+    (from 100us, doubling).  Percentiles are estimated as the upper bound of
+    the bucket in which they fall (but no more than the maximum seen).
+
+    ``stats()`` is JSON-serializable: the last bucket, of durations beyond
+    the largest bound, is reported with the bound ``"+Inf"``, and the mean,
+    minimum, and percentiles of an empty histogram as None."""
+
+    __slots__ = ("counts", "count", "sum_s", "min_s", "max_s")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.sum_s = 0.0
+        self.min_s = float("inf")
+        self.max_s = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum_s += seconds
+        self.min_s = min(self.min_s, seconds)
+        self.max_s = max(self.max_s, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Estimate the ``q``-th (0-100) percentile"""
+        if not self.count:
+            return 0.0
+        rank = max(1, round(self.count * q / 100))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                if i < len(_BUCKET_BOUNDS):
+                    return min(_BUCKET_BOUNDS[i], self.max_s)
+                break
+        return self.max_s
+
+    def stats(self) -> dict[str, t.Any]:
+        bounds: tuple[float | str, ...] = _BUCKET_BOUNDS + ("+Inf",)
+        empty = not self.count
+        return {
+            "count": self.count,
+            "mean_s": None if empty else self.sum_s / self.count,
+            "min_s": None if empty else self.min_s,
+            "max_s": self.max_s,
+            "p50_s": None if empty else self.percentile(50),
+            "p90_s": None if empty else self.percentile(90),
+            "p99_s": None if empty else self.percentile(99),
+            "buckets": [(le, n) for le, n in zip(bounds, self.counts) if n],
+        }
+
+
+class LatencyRecorder:
+    """Collects the durations of completed tasks' timelines, into a
+    ``LatencyHistogram`` per pair of consecutive stages (see
+    ``TaskTimeline.durations()``).  Safe to use from several threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: dict[str, LatencyHistogram] = {}
+
+    def record(self, timeline: TaskTimeline) -> None:
+        durations = timeline.durations()
+        with self._lock:
+            for stage, seconds in durations.items():
+                hist = self.histograms.get(stage)
+                if hist is None:
+                    hist = self.histograms[stage] = LatencyHistogram()
+                hist.record(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+
+    def stats(self) -> dict[str, dict[str, t.Any]]:
+        with self._lock:
+            return {stage: h.stats() for stage, h in self.histograms.items()}
@@ -17,6 +17,17 @@ class DeserializationError(Exception):
 class SerializeBase(metaclass=ABCMeta):
     """Shared functionality for all serializer implementations"""
 
+    # binary serializers produce (and consume) ``bytes`` rather than ``str``
+    _binary = False
+
+    # out-of-band serializers also produce (and consume) a list of buffers that
+    # travel alongside the payload; see DillDataOutOfBand
+    _out_of_band = False
+
+    # fast-path serializers are cheap to attempt and handle only some values;
+    # they are always tried before the other methods; see JSONData
+    _fast_path = False
+
     @property
     @abstractmethod
     def identifier(self):
@@ -30,6 +41,14 @@ class SerializeBase(metaclass=ABCMeta):
         payload : str
             Payload blob
         """
+        if isinstance(payload, (bytes, bytearray, memoryview)):
+            id_length = len(self.identifier)
+            if bytes(payload[:id_length]) != self.identifier.encode("ascii"):
+                raise DeserializationError(
+                    f"Buffer does not start with identifier:{self.identifier}"
+                )
+            return payload[id_length:]
+
         s_id, payload = payload.split("\n", 1)
         if (s_id + "\n") != self.identifier:
             raise DeserializationError(
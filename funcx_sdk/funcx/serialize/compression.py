@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import codecs
+import logging
+import lzma
+import typing as t
+import zlib
+from collections import OrderedDict
+
+from funcx.serialize.base import DeserializationError, SerializeBase
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Payloads smaller than this are not worth the time to compress
+DEFAULT_COMPRESSION_THRESHOLD = 64 * 1024
+
+# Keep the compressed payload only if it is at most this fraction of the original
+DEFAULT_COMPRESSION_MAX_RATIO = 0.9
+
+# Payloads larger than this are first probed with a sample of this size, so that
+# incompressible data (e.g., random or already compressed) is not compressed in
+# full only to be thrown away
+COMPRESSION_SAMPLE_SIZE = 256 * 1024
+
+
+class Codec:
+    """A named pair of compress/decompress functions over bytes"""
+
+    def __init__(
+        self,
+        name: str,
+        compress: t.Callable[[bytes], bytes],
+        decompress: t.Callable[[bytes], bytes],
+    ):
+        self.name = name
+        self.compress = compress
+        self.decompress = decompress
+
+    def __repr__(self):
+        return f"Codec({self.name})"
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+CODECS: OrderedDict[str, Codec] = OrderedDict(
+    [
+        ("zlib", Codec("zlib", lambda d: zlib.compress(d, 6), zlib.decompress)),
+        ("lzma", Codec("lzma", lzma.compress, lzma.decompress)),
+    ]
+)
+if lz4_frame is not None:
+    CODECS["lz4"] = Codec("lz4", lz4_frame.compress, lz4_frame.decompress)
+if zstandard is not None:
+    CODECS["zstd"] = Codec("zstd", _zstd_compress, _zstd_decompress)
+
+
+class CompressedPayload(SerializeBase):
+    """A codec stage over already serialized (text) payloads.
+
+    Unlike the serialization methods, this does not serialize objects: it
+    wraps the payload of another method, and unwraps it again.  Text payloads
+    stay text (the compressed bytes are base64 encoded), so compressed payloads
+    may travel over the web service and AMQP; see CompressedPayloadBinary for
+    ``bytes`` payloads.
+
+    Payloads are only compressed if at least ``threshold`` bytes long, and only
+    kept compressed if that shrinks them to ``max_ratio`` of their size.
+
+    The decompressing side must have the codec available; zlib and lzma are
+    always available, while lz4 and zstd require their (optional) packages.
+    """
+
+    identifier = "08\n"
+    _for_code = False
+
+    def __init__(
+        self,
+        codec: str = "zlib",
+        threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        max_ratio: float = DEFAULT_COMPRESSION_MAX_RATIO,
+    ):
+        super().__init__()
+        if codec not in CODECS:
+            raise ValueError(
+                f"Unknown or unavailable compression codec: {codec} "
+                f"(available: {', '.join(CODECS)})"
+            )
+        self.codec = CODECS[codec]
+        self.threshold = threshold
+        self.max_ratio = max_ratio
+
+    def _wrap(self, header: str, compressed: bytes) -> str:
+        return header + codecs.encode(compressed, "base64").decode()
+
+    def _unwrap(self, payload: str) -> tuple[str, str]:
+        name, encoded = self.chomp(payload).split("\n", 1)
+        return name, encoded
+
+    def _decode(self, encoded: str) -> bytes:
+        return codecs.decode(encoded.encode(), "base64")
+
+    def _small_enough(self, compressed: bytes, original: bytes) -> bool:
+        # text payloads pay for base64 (4/3) on the way out
+        size = len(compressed) if self._binary else len(compressed) * 4 / 3
+        return size <= len(original) * self.max_ratio
+
+    def _worth_compressing(self, raw: bytes) -> bool:
+        if len(raw) <= COMPRESSION_SAMPLE_SIZE:
+            return True
+        sample = raw[:COMPRESSION_SAMPLE_SIZE]
+        return self._small_enough(self.codec.compress(sample), sample)
+
+    def serialize(self, data: str | bytes) -> str | bytes:
+        """Compress a serialized payload, if worthwhile
+
+        Parameters
+        ----------
+        data : str | bytes
+            A payload, as returned by one of the serialization methods
+
+        Returns the compressed payload, or ``data`` itself if it was too small or
+        did not compress well enough.
+        """
+        if len(data) < self.threshold:
+            return data
+
+        raw = bytes(data) if self._binary else data.encode("ascii")
+        if not self._worth_compressing(raw):
+            return data
+
+        compressed = self.codec.compress(raw)
+        if not self._small_enough(compressed, raw):
+            logger.debug(
+                "Not compressing payload with %s; ratio %.2f is too high",
+                self.codec.name,
+                len(compressed) / len(raw),
+            )
+            return data
+
+        return self._wrap(self.identifier + self.codec.name + "\n", compressed)
+
+    def deserialize(self, payload: str | bytes) -> str | bytes:
+        """Decompress a payload, returning the original serialized payload"""
+        name, encoded = self._unwrap(payload)
+        if name not in CODECS:
+            raise DeserializationError(
+                f"compression codec {name} is not available; is it installed?"
+            )
+        raw = CODECS[name].decompress(self._decode(encoded))
+        return raw if self._binary else raw.decode("ascii")
+
+
+class CompressedPayloadBinary(CompressedPayload):
+    """Binary counterpart of CompressedPayload, for ``bytes`` payloads (e.g., of
+    the binary serialization methods); the compressed bytes are carried as-is.
+    """
+
+    identifier = "09\n"
+    _binary = True
+
+    def _wrap(self, header: str, compressed: bytes) -> bytes:
+        return header.encode("ascii") + compressed
+
+    def _unwrap(self, payload: bytes) -> tuple[str, bytes]:
+        name, compressed = bytes(self.chomp(payload)).split(b"\n", 1)
+        return name.decode("ascii"), compressed
+
+    def _decode(self, encoded: bytes) -> bytes:
+        return encoded
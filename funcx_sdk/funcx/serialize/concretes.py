@@ -2,8 +2,14 @@ from __future__ import annotations
 
 import codecs
 import inspect
+import io
+import json
 import logging
+import math
 import pickle
+import sys
+import typing as t
+import weakref
 from collections import OrderedDict
 
 import dill
@@ -139,6 +145,207 @@ class DillCode(SerializeBase):
         return function
 
 
+class DillDataBinary(SerializeBase):
+    """Binary counterpart of DillDataBase64: the dill pickle is carried as raw
+    bytes, skipping the base64 inflation (~33%) and the encode/decode passes.
+
+    Only suitable for transports that can carry ``bytes`` (e.g., the internal
+    ZMQ pipes of the endpoint); the web service and AMQP messages are text.
+    """
+
+    identifier = "05\n"
+    _for_code = False
+    _binary = True
+
+    def __init__(self):
+        super().__init__()
+
+    def serialize(self, data) -> bytes:
+        return self.identifier.encode("ascii") + dill.dumps(data)
+
+    def deserialize(self, payload: bytes):
+        chomped = self.chomp(payload)
+        data = dill.loads(chomped)
+        return data
+
+
+class DillCodeBinary(SerializeBase):
+    """Binary counterpart of DillCode; see DillDataBinary.
+
+    Code from interpreter/main        : No
+    Code from notebooks               : Yes
+    Works with mismatching py versions: No
+    Decorated fns                     : Yes
+    """
+
+    identifier = "06\n"
+    _for_code = True
+    _binary = True
+
+    def __init__(self):
+        super().__init__()
+
+    def serialize(self, data) -> bytes:
+        return self.identifier.encode("ascii") + dill.dumps(data)
+
+    def deserialize(self, payload: bytes):
+        chomped = self.chomp(payload)
+        function = dill.loads(chomped)
+        return function
+
+
+# Buffers smaller than this are left in the pickle stream; out-of-band frames only
+# pay off once the copy they save outweighs the cost of an extra message part.
+OUT_OF_BAND_THRESHOLD = 64 * 1024
+
+
+class _OutOfBandPickler(dill.Pickler):
+    """A dill Pickler that also hands large ``bytes`` and ``bytearray`` objects
+    to the buffer callback (numpy arrays, etc. already support protocol 5)"""
+
+    def __init__(self, *args, threshold: int = OUT_OF_BAND_THRESHOLD, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._threshold = threshold
+
+    def reducer_override(self, obj):
+        if type(obj) in (bytes, bytearray) and len(obj) >= self._threshold:
+            return type(obj), (pickle.PickleBuffer(obj),)
+        return NotImplemented
+
+
+class DillDataOutOfBand(SerializeBase):
+    """Binary data serializer that uses pickle protocol 5 to keep large buffers
+    (bytes, bytearrays, numpy arrays, ...) out of the pickle stream.
+
+    The buffers are appended, uncopied, to the caller-supplied ``buffers`` list
+    so that they may be sent as separate (zero-copy) message frames; the
+    payload only records how many buffers it consumed.  On deserialization,
+    the same buffers must be supplied, in order.  Objects rebuilt on top of
+    received frames (e.g., numpy arrays) share their memory, and are read-only
+    if the frames are; ``bytes`` and ``bytearray`` objects are copied once.
+    """
+
+    identifier = "07\n"
+    _for_code = False
+    _binary = True
+    _out_of_band = True
+
+    def __init__(self, threshold: int = OUT_OF_BAND_THRESHOLD):
+        super().__init__()
+        self.threshold = threshold
+
+    def serialize(self, data, buffers: list | None = None) -> bytes:
+        if sys.version_info < (3, 8):
+            raise NotImplementedError("Pickle protocol 5 requires Python 3.8+")
+        if buffers is None:
+            raise ValueError("Out-of-band serialization requires a buffers list")
+
+        out_of_band: list[memoryview] = []
+
+        def _buffer_callback(pickle_buffer) -> bool:
+            raw = pickle_buffer.raw()
+            if raw.nbytes < self.threshold:
+                return True  # keep it in-band
+            out_of_band.append(raw)
+            return False
+
+        stream = io.BytesIO()
+        _OutOfBandPickler(
+            stream,
+            protocol=5,
+            buffer_callback=_buffer_callback,
+            threshold=self.threshold,
+        ).dump(data)
+
+        buffers.extend(out_of_band)
+        header = self.identifier.encode("ascii") + b"%d\n" % len(out_of_band)
+        return header + stream.getvalue()
+
+    def deserialize(self, payload: bytes, buffers: t.Iterable | None = None):
+        chomped = bytes(self.chomp(payload))
+        s_count, stream = chomped.split(b"\n", 1)
+        count = int(s_count)
+
+        received = []
+        if count:
+            if buffers is None:
+                raise DeserializationError(
+                    f"payload expects {count} out-of-band buffers, none supplied"
+                )
+            buffers = iter(buffers)
+            for _ in range(count):
+                try:
+                    received.append(next(buffers))
+                except StopIteration:
+                    raise DeserializationError(
+                        f"payload expects {count} out-of-band buffers, "
+                        f"got {len(received)}"
+                    )
+
+        return dill.loads(stream, buffers=received)
+
+
+_JSON_SCALAR_TYPES = frozenset((str, int, bool, type(None)))
+
+
+def _is_exact_json(obj) -> bool:
+    """Whether obj survives a JSON round trip unchanged, including its types"""
+    cls = type(obj)
+    if cls in _JSON_SCALAR_TYPES:
+        return True
+    if cls is float:
+        return math.isfinite(obj)
+    if cls is list:
+        return all(_is_exact_json(item) for item in obj)
+    if cls is dict:
+        return all(
+            type(key) is str and _is_exact_json(value) for key, value in obj.items()
+        )
+    return False
+
+
+class JSONData(SerializeBase):
+    """This method encodes plain data as JSON, without pickling.
+
+    Only values that JSON represents exactly are accepted: None, bool, int,
+    finite float, str, and lists and str-keyed dicts of those; tuples, sets,
+    subclasses (e.g., OrderedDict), non-str keys, NaN and infinity are rejected
+    so that the next method is used instead.  As an exception, a top-level tuple
+    (e.g., the positional arguments of a task) is recorded as such.
+
+    Payloads do not depend on the Python or dill version of either side.
+    """
+
+    identifier = "11\n"
+    _for_code = False
+    _fast_path = True
+
+    # the first character of the payload records the type of the top-level value
+    _VALUE = "j"
+    _TUPLE = "t"
+
+    def __init__(self):
+        super().__init__()
+
+    def serialize(self, data) -> str:
+        if type(data) is tuple:
+            kind, value = self._TUPLE, list(data)
+        else:
+            kind, value = self._VALUE, data
+        if not _is_exact_json(value):
+            raise TypeError(f"{type(data).__name__} is not exactly JSON serializable")
+        return self.identifier + kind + json.dumps(value, separators=(",", ":"))
+
+    def deserialize(self, payload: str):
+        chomped = self.chomp(payload)
+        kind, encoded = chomped[:1], chomped[1:]
+        if kind == self._TUPLE:
+            return tuple(json.loads(encoded))
+        if kind == self._VALUE:
+            return json.loads(encoded)
+        raise DeserializationError(f"unknown JSON payload kind {kind!r}")
+
+
 class CombinedCode(SerializeBase):
     """This method uses multiple methods to serialize a function
 
@@ -147,10 +354,25 @@ class CombinedCode(SerializeBase):
     Code from notebooks               : Yes
     Works with mismatching py versions: Yes
     Decorated fns                     : Yes
+
+    The combined encoding of a function is computed once per function object
+    and reused (until the function is garbage collected, or its code or
+    defaults are replaced); changes to globals it references are not seen, so
+    call clear_cache() after changing those.
     """
 
     identifier = "10\n"
 
+    def __init__(self):
+        super().__init__()
+        self._methods = {
+            id: METHODS_MAP_CODE[id]() for id in COMBINED_SERIALIZE_METHODS
+        }
+        self._cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def clear_cache(self):
+        self._cache.clear()
+
     def get_multiple_payloads(self, payload: str) -> tuple[tuple[str, str], ...]:
         parts: list[str] = self.chomp(payload).split(COMBINED_SEPARATOR)
         assert len(parts) == 2 * len(COMBINED_SERIALIZE_METHODS)
@@ -159,15 +381,55 @@ class CombinedCode(SerializeBase):
         # ie. ((04\n', 'gACQ...'), ('01\n', 'sAAbk2...'), ...)
         return tuple(zip(ai, ai))
 
+    def iter_payloads(self, payload: str) -> t.Iterator[tuple[str, str]]:
+        """Like get_multiple_payloads, but lazily: each (serial_id, encoded)
+        pair is only sliced out of the payload when it is reached"""
+        if not payload.startswith(self.identifier):
+            raise DeserializationError(
+                f"Buffer does not start with identifier:{self.identifier}"
+            )
+        start = len(self.identifier)
+        end = len(payload)
+        while start < end:
+            id_end = payload.find(COMBINED_SEPARATOR, start)
+            if id_end < 0:
+                raise DeserializationError("Truncated combined payload")
+            encoded_end = payload.find(COMBINED_SEPARATOR, id_end + 1)
+            if encoded_end < 0:
+                encoded_end = end
+            yield payload[start:id_end], payload[id_end + 1 : encoded_end]
+            start = encoded_end + 1
+
+    @staticmethod
+    def _fingerprint(data) -> tuple:
+        # the replaceable attributes of a function (__closure__ is read-only)
+        return tuple(
+            getattr(data, attr, None)
+            for attr in ("__code__", "__defaults__", "__kwdefaults__")
+        )
+
     def serialize(self, data) -> str:
+        try:
+            fingerprint, serialized = self._cache[data]
+            if all(a is b for a, b in zip(fingerprint, self._fingerprint(data))):
+                return serialized
+        except (KeyError, TypeError):
+            # not cached, or not weak-referenceable
+            pass
+
         chunks = []
-        for id in COMBINED_SERIALIZE_METHODS:
-            method = METHODS_MAP_CODE[id]()
+        for id, method in self._methods.items():
             serialized = method.serialize(data)
             id_length = len(id)
             chunks.append(serialized[:id_length])
             chunks.append(serialized[id_length:])
-        return self.identifier + COMBINED_SEPARATOR.join(chunks)
+        serialized = self.identifier + COMBINED_SEPARATOR.join(chunks)
+
+        try:
+            self._cache[data] = (self._fingerprint(data), serialized)
+        except TypeError:
+            pass
+        return serialized
 
     def deserialize(self, payload: str, variation: int = 0):
         """
@@ -180,7 +442,7 @@ class CombinedCode(SerializeBase):
         the .identifier/serial_id of the method like 04\n or 01\n
         """
         count = 0
-        for serial_id, encoded_func in self.get_multiple_payloads(payload):
+        for serial_id, encoded_func in self.iter_payloads(payload):
             count += 1
             if variation == 0 or count == variation:
                 if serial_id in METHODS_MAP_CODE:
@@ -228,12 +490,16 @@ METHODS_MAP_CODE = OrderedDict(
         (DillCodeTextInspect.identifier, DillCodeTextInspect),
         (PickleCode.identifier, PickleCode),
         (CombinedCode.identifier, CombinedCode),
+        (DillCodeBinary.identifier, DillCodeBinary),
     ]
 )
 
 
 METHODS_MAP_DATA = OrderedDict(
     [
+        (JSONData.identifier, JSONData),
         (DillDataBase64.identifier, DillDataBase64),
+        (DillDataBinary.identifier, DillDataBinary),
+        (DillDataOutOfBand.identifier, DillDataOutOfBand),
     ]
 )
@@ -1,15 +1,74 @@
+from __future__ import annotations
+
 import logging
+import weakref
 
+from funcx.serialize.compression import CompressedPayload, CompressedPayloadBinary
 from funcx.serialize.concretes import METHODS_MAP_CODE, METHODS_MAP_DATA
+from funcx.serialize.shared import SharedArguments
 
 logger = logging.getLogger(__name__)
 
 
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+
 class FuncXSerializer:
     """Wraps several serializers for one uniform interface"""
 
-    def __init__(self):
-        """Instantiate the appropriate classes"""
+    def __init__(
+        self,
+        binary: bool = False,
+        compression_threshold: int | None = None,
+        compression_codec: str = "zlib",
+        fast_path: bool = False,
+    ):
+        """Instantiate the appropriate classes
+
+        Parameters
+        ----------
+        binary : bool
+            If True, prefer the binary (``bytes``) serialization methods, and
+            fall back to the text methods.  If False (the default), only the
+            text methods are used for serialization, as required by the web
+            service.  Either way, payloads of all methods may be deserialized.
+        compression_threshold : int | None
+            If set, serialized payloads of at least this many bytes are
+            compressed, when that makes them meaningfully smaller.  None (the
+            default) disables compression.  Compressed payloads are always
+            decompressed on deserialization.
+        compression_codec : str
+            The codec used for compression: "zlib" (the default) or "lzma", or
+            "lz4" or "zstd" if the corresponding package is installed.  The
+            receiving side must support the codec too.
+        fast_path : bool
+            If True, plain data (e.g., ints, strings, and lists and dicts of
+            those) is first attempted as JSON, and only pickled if that fails.
+            False by default, as endpoints older than this SDK cannot
+            deserialize JSON payloads; enable it only when the receiving side
+            is known to be recent enough.
+        """
+        self.binary = binary
+        self.fast_path = fast_path
+
+        # compressed payloads are wrapped in a text or binary codec stage, to
+        # match the payload; decompression reads the codec from the payload
+        self.compressors = {}
+        if compression_threshold is not None:
+            self.compressors = {
+                binary: cls(codec=compression_codec, threshold=compression_threshold)
+                for binary, cls in (
+                    (False, CompressedPayload),
+                    (True, CompressedPayloadBinary),
+                )
+            }
+        self.decompressors = {
+            cls.identifier: cls()
+            for cls in (CompressedPayload, CompressedPayloadBinary)
+        }
+
+        # task arguments packed one by one, some shared across tasks; see Batch
+        self.shared_arguments = SharedArguments()
 
         # Do we want to do a check on header size here ? Probably overkill
         headers = list(METHODS_MAP_CODE.keys()) + list(METHODS_MAP_DATA.keys())
@@ -23,28 +82,127 @@ class FuncXSerializer:
         for key in METHODS_MAP_DATA:
             self.methods_for_data[key] = METHODS_MAP_DATA[key]()
 
+        # the order in which methods are attempted by serialize()
+        self._code_strategies = self._order_strategies(self.methods_for_code)
+        self._data_strategies = self._order_strategies(self.methods_for_data)
+
+        # only attempted when the caller can carry the out-of-band buffers
+        self._out_of_band_strategies = [
+            m for m in self.methods_for_data.values() if m._out_of_band
+        ]
+        fast = [m for m in self._data_strategies if m._fast_path]
+        self._out_of_band_data_strategies = (
+            fast
+            + self._out_of_band_strategies
+            + [m for m in self._data_strategies if not m._fast_path]
+        )
+
+        # the method that last serialized a callable (by identity) or a data type;
+        # it is tried first next time, so known failures are not re-attempted
+        self._callable_strategy: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._data_strategy: dict = {}
+        self.strategy_hits = 0
+        self.strategy_misses = 0
+
+    def _order_strategies(self, methods: dict) -> list:
+        in_band = [m for m in methods.values() if not m._out_of_band]
+        fast = [m for m in in_band if m._fast_path]
+        in_band = [m for m in in_band if not m._fast_path]
+        binary = [m for m in in_band if m._binary]
+        text = [m for m in in_band if not m._binary]
+        if not self.fast_path:
+            fast = []
+        if self.binary:
+            return fast + binary + text
+        return fast + text
+
     def _list_methods(self):
         return self.methods_for_code, self.methods_for_data
 
-    def serialize(self, data):
+    def _get_strategy(self, data, out_of_band: bool):
+        try:
+            if callable(data):
+                return self._callable_strategy.get(data)
+            return self._data_strategy.get((type(data), out_of_band))
+        except TypeError:
+            # not weak-referenceable, or not hashable; not memoized
+            return None
+
+    def _set_strategy(self, data, out_of_band: bool, method) -> None:
+        try:
+            if callable(data):
+                self._callable_strategy[data] = method
+            else:
+                self._data_strategy[(type(data), out_of_band)] = method
+        except TypeError:
+            pass
+
+    def strategy_stats(self) -> dict[str, int]:
+        """How often the remembered serialization method was tried first and
+        succeeded (hits), or had to be found (misses)"""
+        return {
+            "hits": self.strategy_hits,
+            "misses": self.strategy_misses,
+            "size": len(self._callable_strategy) + len(self._data_strategy),
+        }
+
+    def serialize(self, data, buffers: list | None = None):
+        """
+        Parameters
+        ----------
+        data : object
+           Function or data object to be serialized
+        buffers : list
+           If given (and this is a binary serializer), data may be serialized
+           with pickle protocol 5, and its large buffers appended to this list
+           rather than copied into the payload.  The buffers must be passed,
+           in order, to ``deserialize``.
+        """
         serialized = None
         last_exception = None
 
+        out_of_band = self.binary and buffers is not None
         if callable(data):
-            stype, methods = "Callable", self.methods_for_code.values()
+            stype, methods = "Callable", self._code_strategies
         else:
-            stype, methods = "Data", self.methods_for_data.values()
-        err_msg = f"{stype} Serialization Method {{}} failed with: {{}}"
+            stype, methods = "Data", self._data_strategies
+            if out_of_band:
+                methods = self._out_of_band_data_strategies
+
+        remembered = self._get_strategy(data, out_of_band)
+        if remembered is not None and not remembered._fast_path:
+            # fast paths stay first: whether they apply depends on the value
+            # (e.g., a list of ints, or of tuples), not only on its type
+            fast = [m for m in methods if m._fast_path]
+            methods = (
+                fast
+                + [remembered]
+                + [m for m in methods if m is not remembered and not m._fast_path]
+            )
 
         for method in methods:
             try:
-                serialized = method.serialize(data)
+                if method._out_of_band:
+                    serialized = method.serialize(data, buffers=buffers)
+                else:
+                    serialized = method.serialize(data)
                 break
             except Exception as e:
-                logger.debug(err_msg.format(method, e))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{stype} Serialization Method {method} failed with: {e}"
+                    )
                 last_exception = e
                 continue
 
+        if serialized is not None and not method._fast_path:
+            # fast paths are always tried first anyway, so are not remembered
+            if method is remembered:
+                self.strategy_hits += 1
+            else:
+                self.strategy_misses += 1
+                self._set_strategy(data, out_of_band, method)
+
         if serialized is None:
             if not last_exception:
                 last_exception = NotImplementedError(
@@ -52,72 +210,131 @@ class FuncXSerializer:
                 )
             raise last_exception
 
+        if self.compressors:
+            is_bytes = isinstance(serialized, _BYTES_TYPES)
+            serialized = self.compressors[is_bytes].serialize(serialized)
+
         return serialized
 
-    def deserialize(self, payload):
+    def deserialize(self, payload, buffers=None):
         """
         Parameters
         ----------
-        payload : str
+        payload : str | bytes
            Payload object to be deserialized
+        buffers : iterable of buffers
+           The out-of-band buffers collected by ``serialize``.  Pass the same
+           iterator to consecutive calls to deserialize several payloads
+           serialized into a single buffers list.
 
         """
         header = payload[0 : self.header_size]
+        is_bytes = isinstance(payload, _BYTES_TYPES)
+        if is_bytes:
+            header = bytes(header).decode("ascii", errors="replace")
+
         if header in self.methods_for_code:
-            result = self.methods_for_code[header].deserialize(payload)
+            method = self.methods_for_code[header]
         elif header in self.methods_for_data:
-            result = self.methods_for_data[header].deserialize(payload)
+            method = self.methods_for_data[header]
+        elif header in self.decompressors:
+            method = self.decompressors[header]
+        elif header == self.shared_arguments.identifier:
+            method = self.shared_arguments
         else:
             raise Exception(f"Invalid header: {header} in data payload")
 
-        return result
+        if is_bytes and not method._binary:
+            # text methods are base64/ascii; e.g., unpacked from a bytes buffer
+            payload = bytes(payload).decode("ascii")
+
+        if header in self.decompressors:
+            # the codec stage unwraps the payload of the actual method
+            return self.deserialize(method.deserialize(payload), buffers=buffers)
+
+        if method is self.shared_arguments:
+            return method.deserialize(payload, self.deserialize)
+        if method._out_of_band:
+            return method.deserialize(payload, buffers=buffers)
+        return method.deserialize(payload)
 
     @staticmethod
     def pack_buffers(buffers):
         """
         Parameters
         ----------
-        buffers : list of \n terminated strings
+        buffers : list of \n terminated strings, or of bytes
+
+        Each buffer is framed by its length and a newline, e.g. "5\nabcde".
+        If any of the buffers is bytes, the packed result is bytes (text
+        buffers are ascii-encoded); otherwise the result is a string.
         """
-        packed = ""
-        for buf in buffers:
-            s_length = str(len(buf)) + "\n"
-            packed += s_length + buf
+        if any(isinstance(buf, _BYTES_TYPES) for buf in buffers):
+            parts = []
+            for buf in buffers:
+                if isinstance(buf, str):
+                    buf = buf.encode("ascii")
+                buf = memoryview(buf).cast("B")
+                parts.append(b"%d\n" % buf.nbytes)
+                parts.append(buf)
+            return b"".join(parts)
 
-        return packed
+        parts = []
+        for buf in buffers:
+            parts.append(f"{len(buf)}\n")
+            parts.append(buf)
+        return "".join(parts)
 
     @staticmethod
     def unpack_buffers(packed_buffer):
         """
         Parameters
         ----------
-        packed_buffer : packed buffer as string
-        """
-        unpacked = []
-        while packed_buffer:
-            s_length, buf = packed_buffer.split("\n", 1)
-            i_length = int(s_length)
-            current, packed_buffer = buf[:i_length], buf[i_length:]
-            unpacked.extend([current])
+        packed_buffer : packed buffer as string or bytes
 
-        return unpacked
+        The buffers are located by offset, in a single pass.  The buffers
+        unpacked from bytes are memoryviews into packed_buffer (no copies).
+        """
+        return list(_iter_buffers(packed_buffer))
 
     def unpack_and_deserialize(self, packed_buffer):
         """Unpacks a packed buffer and returns the deserialized contents
         Parameters
         ----------
-        packed_buffer : packed buffer as string
+        packed_buffer : packed buffer as string or bytes
         """
-        unpacked = []
-        while packed_buffer:
-            s_length, buf = packed_buffer.split("\n", 1)
-            i_length = int(s_length)
-            current, packed_buffer = buf[:i_length], buf[i_length:]
-            deserialized = self.deserialize(current)
-            unpacked.extend([deserialized])
+        unpacked = [self.deserialize(buf) for buf in _iter_buffers(packed_buffer)]
 
         assert len(unpacked) == 3, "Unpack expects 3 buffers, got {}".format(
             len(unpacked)
         )
 
         return unpacked
+
+
+def _iter_buffers(packed_buffer):
+    """Yield the buffers framed in packed_buffer, without re-slicing its tail"""
+    if isinstance(packed_buffer, str):
+        searchable, view, newline = packed_buffer, packed_buffer, "\n"
+    else:
+        view = memoryview(packed_buffer).cast("B")
+        # memoryview has no .find(); bytes and bytearray do
+        if isinstance(packed_buffer, (bytes, bytearray)):
+            searchable = packed_buffer
+        else:
+            searchable = view.tobytes()
+        newline = b"\n"
+
+    offset, end = 0, len(view)
+    while offset < end:
+        newline_at = searchable.find(newline, offset)
+        if newline_at < 0:
+            raise ValueError(f"Malformed packed buffer: no length at offset {offset}")
+        start = newline_at + 1
+        stop = start + int(searchable[offset:newline_at])
+        if stop > end:
+            raise ValueError(
+                f"Malformed packed buffer: buffer at offset {offset} is truncated"
+            )
+        yield view[start:stop]
+        offset = stop
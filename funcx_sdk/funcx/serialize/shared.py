@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import typing as t
+from collections import OrderedDict
+
+from funcx.serialize.base import DeserializationError, SerializeBase
+
+logger = logging.getLogger(__name__)
+
+# Only arguments whose payload is at least this large are shared
+SHARED_ARGUMENT_THRESHOLD = 64 * 1024
+
+# How many shared arguments a deserializing side keeps
+DEFAULT_SHARED_CACHE_SIZE = 16
+
+
+def payload_digest(payload: str) -> str:
+    return hashlib.sha256(payload.encode("ascii")).hexdigest()
+
+
+class SharedArguments(SerializeBase):
+    """The positional (a tuple) or keyword (a dict) arguments of a task,
+    serialized one by one, with some of them marked as shared by the digest of
+    their payload.
+
+    Like CompressedPayload, this does not serialize objects itself: the
+    submitter serializes each argument (once for all the tasks that share it;
+    see Batch), and this stage packs the argument payloads together.  On
+    deserialization, a shared argument is deserialized only the first time its
+    digest is seen, and the same object is returned for later tasks (up to
+    ``cache_size`` shared arguments are kept).  Tasks must therefore not modify
+    shared arguments.
+
+    Every task still carries the payloads of all its arguments: tasks are
+    delivered independently, so none can rely on another having arrived first.
+
+    Payloads are text: ``12\\n``, "t" (tuple) or "d" (dict), a JSON header line
+    with the payload lengths, the digests of the shared payloads (or null), and
+    the keys (for dicts), followed by the payloads.
+    """
+
+    identifier = "12\n"
+    _for_code = False
+
+    _TUPLE = "t"
+    _DICT = "d"
+
+    def __init__(self, cache_size: int = DEFAULT_SHARED_CACHE_SIZE):
+        super().__init__()
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, t.Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def serialize(
+        self,
+        payloads: t.Sequence[tuple[str, str | None]],
+        keys: t.Sequence[str] | None = None,
+    ) -> str:
+        """Pack already serialized arguments
+
+        Parameters
+        ----------
+        payloads : sequence of (payload, digest) pairs
+            The payload of each argument, in order, and its digest if shared
+            (see ``payload_digest``), else None
+        keys : sequence of str
+            The keyword of each argument, for keyword arguments; else None
+        """
+        header = {
+            "lengths": [len(payload) for payload, _ in payloads],
+            "shared": [digest for _, digest in payloads],
+        }
+        kind = self._TUPLE
+        if keys is not None:
+            kind = self._DICT
+            header["keys"] = list(keys)
+        return "".join(
+            [self.identifier, kind, json.dumps(header, separators=(",", ":")), "\n"]
+            + [payload for payload, _ in payloads]
+        )
+
+    def deserialize(
+        self, payload: str, deserialize: t.Callable[[str], t.Any] | None = None
+    ):
+        """Unpack the arguments, deserializing each with ``deserialize``"""
+        if deserialize is None:
+            raise DeserializationError("shared arguments require a deserializer")
+
+        chomped = self.chomp(payload)
+        kind = chomped[:1]
+        s_header, packed = chomped[1:].split("\n", 1)
+        header = json.loads(s_header)
+        if sum(header["lengths"]) != len(packed):
+            raise DeserializationError("shared arguments payload is malformed")
+
+        values = []
+        offset = 0
+        for length, digest in zip(header["lengths"], header["shared"]):
+            item = packed[offset : offset + length]
+            offset += length
+            if digest is None:
+                values.append(deserialize(item))
+            else:
+                values.append(self._get_shared(digest, item, deserialize))
+
+        if kind == self._TUPLE:
+            return tuple(values)
+        if kind == self._DICT:
+            return dict(zip(header["keys"], values))
+        raise DeserializationError(f"unknown shared arguments kind {kind!r}")
+
+    def _get_shared(self, digest: str, item: str, deserialize: t.Callable):
+        if digest in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(digest)
+            return self._cache[digest]
+
+        self.misses += 1
+        # verified, so that no payload can be cached under another's digest
+        if payload_digest(item) != digest:
+            raise DeserializationError("shared argument does not match its digest")
+        value = deserialize(item)
+        if self.cache_size > 0:
+            self._cache[digest] = value
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
@@ -1,8 +1,13 @@
+import gc
 import inspect
+import os
 import sys
+from collections import OrderedDict
+from unittest import mock
 
 import pytest
 
+import funcx.serialize.compression as compression
 import funcx.serialize.concretes as concretes
 
 
@@ -107,6 +112,72 @@ def test_base64_data():
     assert kwargs["y"] == 10
 
 
+@pytest.mark.parametrize(
+    "data",
+    (
+        None,
+        True,
+        -(2**70),
+        0.1,
+        -0.0,
+        "héllo\n\ud800",
+        [1, "2", [3.0, None]],
+        {"a": {"b": [False]}, "": 1},
+        (1, [2], {"x": "y"}),
+        (),
+    ),
+)
+def test_json_data(data):
+    jd = concretes.JSONData()
+
+    d = jd.serialize(data)
+    assert d.startswith("11\n")
+    assert d.isascii()
+    result = jd.deserialize(d)
+    assert result == data
+    assert type(result) is type(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        [(1, 2)],
+        ((1, 2),),
+        {1: "a"},
+        {"a": {1, 2}},
+        OrderedDict(a=1),
+        float("nan"),
+        [float("inf")],
+        b"bytes",
+        foo,
+    ),
+)
+def test_json_data_rejects_inexact(data):
+    with pytest.raises(TypeError):
+        concretes.JSONData().serialize(data)
+
+
+def test_json_fast_path():
+    from funcx.serialize.facade import FuncXSerializer
+
+    fast = (
+        FuncXSerializer(fast_path=True),
+        FuncXSerializer(binary=True, fast_path=True),
+    )
+    for fxs in fast:
+        x = fxs.serialize(([1, 2], {"y": 10}))
+        assert x.startswith("11\n")
+        assert fxs.deserialize(x) == ([1, 2], {"y": 10})
+
+        # not JSON, so pickled; that is remembered for lists, but JSON stays first
+        assert fxs.deserialize(fxs.serialize([(1, 2)])) == [(1, 2)]
+        assert fxs.serialize([3]).startswith("11\n")
+
+    # opt-in: older endpoints cannot deserialize JSON payloads
+    x = FuncXSerializer().serialize(([1, 2], {"y": 10}))
+    assert x.startswith("00\n")
+
+
 def test_pickle_deserialize():
     jb = concretes.PickleCode()
 
@@ -270,3 +341,347 @@ def test_serialize_deserialize_combined():
 
     alternate_deserialized = combined.deserialize(combined_serialized_func, variation=2)
     assert alternate_deserialized != deserialized
+
+
+def test_binary_data():
+    db = concretes.DillDataBinary()
+
+    d = db.serialize(([2], {"y": 10}))
+    assert isinstance(d, bytes)
+    assert d.startswith(b"05\n")
+    args, kwargs = db.deserialize(d)
+    assert args[0] == 2
+    assert kwargs["y"] == 10
+
+
+def test_code_binary():
+    check_serialize_deserialize_foo(concretes.DillCodeBinary())
+
+
+def test_binary_serializer_produces_bytes():
+    from funcx.serialize.facade import FuncXSerializer
+
+    text_fxs, binary_fxs = FuncXSerializer(), FuncXSerializer(binary=True)
+    data = {"a": [1, 2, 3], "b": b"\x00\x01\n" * 100}
+
+    assert isinstance(text_fxs.serialize(data), str), "Default must remain text"
+    assert isinstance(text_fxs.serialize(foo), str), "Default must remain text"
+    assert isinstance(binary_fxs.serialize(data), bytes)
+    assert isinstance(binary_fxs.serialize(foo), bytes)
+
+    # either serializer reads either format
+    for fxs in (text_fxs, binary_fxs):
+        assert fxs.deserialize(binary_fxs.serialize(data)) == data
+        assert fxs.deserialize(text_fxs.serialize(data)) == data
+    check_deserialized_foo(text_fxs.deserialize(binary_fxs.serialize(foo)))
+
+
+def test_pack_buffers_bytes():
+    from funcx.serialize.facade import FuncXSerializer
+
+    fxs = FuncXSerializer(binary=True, fast_path=False)
+    text_fxs = FuncXSerializer(fast_path=False)
+    buffers = [fxs.serialize(foo), fxs.serialize((5,)), text_fxs.serialize({})]
+
+    packed = fxs.pack_buffers(buffers)
+    assert isinstance(packed, bytes), "any bytes buffer implies a bytes packing"
+    unpacked = fxs.unpack_buffers(packed)
+    assert unpacked[:2] == buffers[:2]
+    assert unpacked[2] == buffers[2].encode()
+
+    f, args, kwargs = fxs.unpack_and_deserialize(packed)
+    assert f(*args, **kwargs) == 15
+
+    # a text packing, transported as bytes, is still readable
+    text_packed = text_fxs.pack_buffers(
+        [text_fxs.serialize(x) for x in (foo, (5,), {})]
+    )
+    assert isinstance(text_packed, str)
+    f, args, kwargs = fxs.unpack_and_deserialize(text_packed.encode())
+    assert f(*args, **kwargs) == 15
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="requires pickle protocol 5")
+def test_out_of_band_data():
+    from funcx.serialize.facade import FuncXSerializer
+
+    fxs = FuncXSerializer(binary=True)
+    big, small = bytearray(b"x" * 1024 * 1024), b"y" * 16
+    data = {"big": big, "also_big": bytes(big), "small": small}
+
+    buffers = []
+    x = fxs.serialize(data, buffers=buffers)
+    assert x.startswith(concretes.DillDataOutOfBand.identifier.encode())
+    assert len(buffers) == 2, "only the large buffers travel out-of-band"
+    assert len(x) < len(small) * 100
+
+    assert fxs.deserialize(x, buffers=iter(buffers)) == data
+
+    # without somewhere to put the buffers, in-band methods are used
+    assert not fxs.serialize(data).startswith(
+        concretes.DillDataOutOfBand.identifier.encode()
+    )
+    assert isinstance(FuncXSerializer().serialize(data, buffers=[]), str)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason="requires pickle protocol 5")
+def test_out_of_band_shared_buffers():
+    from funcx.serialize.facade import FuncXSerializer
+
+    fxs = FuncXSerializer(binary=True)
+    args, kwargs = (bytes(100 * 1024),), {"b": bytearray(200 * 1024)}
+
+    buffers = []
+    s_args = fxs.serialize(args, buffers=buffers)
+    s_kwargs = fxs.serialize(kwargs, buffers=buffers)
+    assert len(buffers) == 2
+
+    # consecutive payloads consume buffers, in order, from a shared iterator
+    received = iter([memoryview(bytes(b)) for b in buffers])
+    assert fxs.deserialize(s_args, buffers=received) == args
+    assert fxs.deserialize(s_kwargs, buffers=received) == kwargs
+
+    with pytest.raises(concretes.DeserializationError):
+        fxs.deserialize(s_args)
+
+
+@pytest.mark.parametrize("codec", list(compression.CODECS))
+@pytest.mark.parametrize("binary", (False, True))
+def test_compressed_payload(codec, binary):
+    from funcx.serialize.facade import FuncXSerializer
+
+    fxs = FuncXSerializer(binary=binary, compression_threshold=1024, fast_path=False)
+    fxs_codec = FuncXSerializer(
+        binary=binary,
+        compression_threshold=1024,
+        compression_codec=codec,
+        fast_path=False,
+    )
+    data = {"csv": "1,2,3,4,5\n" * 10_000}
+
+    x = fxs_codec.serialize(data)
+    if binary:
+        assert x.startswith(compression.CompressedPayloadBinary.identifier.encode())
+    else:
+        assert x.startswith(compression.CompressedPayload.identifier)
+    assert isinstance(x, bytes) == binary
+    assert len(x) < len(fxs.serialize("")) + len(data["csv"]) // 10
+
+    # decompression is transparent, and needs no configuration
+    assert FuncXSerializer().deserialize(x) == data
+
+
+def test_compression_only_when_worthwhile():
+    from funcx.serialize.facade import FuncXSerializer
+
+    fxs = FuncXSerializer(compression_threshold=1024)
+    small = "a" * 100
+    assert fxs.serialize(small) == FuncXSerializer().serialize(small)
+
+    for binary in (False, True):
+        fxs = FuncXSerializer(binary=binary, compression_threshold=1024)
+        incompressible = os.urandom(512 * 1024)
+        x = fxs.serialize(incompressible)
+        header = x[:3] if isinstance(x, str) else x[:3].decode()
+        assert header in concretes.METHODS_MAP_DATA, "payload is not compressed"
+        assert fxs.deserialize(x) == incompressible
+
+
+def test_compression_unavailable_codec():
+    from funcx.serialize.facade import FuncXSerializer
+
+    with pytest.raises(ValueError):
+        FuncXSerializer(compression_threshold=0, compression_codec="nonexistent")
+
+    payload = compression.CompressedPayload.identifier + "nonexistent\nabc"
+    with pytest.raises(concretes.DeserializationError):
+        FuncXSerializer().deserialize(payload)
+
+
+def test_unpack_buffers_legacy_format():
+    from funcx.serialize.facade import FuncXSerializer
+
+    # as built by the original string-concatenation implementation
+    legacy = "5\nabcde0\n3\n\n\n\n"
+    assert FuncXSerializer.unpack_buffers(legacy) == ["abcde", "", "\n\n\n"]
+    assert FuncXSerializer.unpack_buffers(legacy.encode()) == [
+        b"abcde",
+        b"",
+        b"\n\n\n",
+    ]
+    assert FuncXSerializer.pack_buffers(["abcde", "", "\n\n\n"]) == legacy
+
+
+@pytest.mark.parametrize("wrap", (bytes, bytearray, memoryview, str))
+def test_unpack_buffers_many(wrap):
+    from funcx.serialize.facade import FuncXSerializer
+
+    buffers = [("x" * (i % 17)) + "\n" for i in range(10_000)]
+    if wrap is not str:
+        buffers = [wrap(buf.encode()) for buf in buffers]
+
+    packed = FuncXSerializer.pack_buffers(buffers)
+    assert isinstance(packed, str if wrap is str else bytes)
+    unpacked = FuncXSerializer.unpack_buffers(packed if wrap is str else wrap(packed))
+    assert unpacked == buffers
+
+
+def test_unpack_buffers_zero_copy():
+    from funcx.serialize.facade import FuncXSerializer
+
+    packed = FuncXSerializer.pack_buffers([b"abc", b"defgh"])
+    unpacked = FuncXSerializer.unpack_buffers(packed)
+    assert all(isinstance(buf, memoryview) for buf in unpacked)
+    assert all(buf.obj is packed for buf in unpacked)
+
+
+@pytest.mark.parametrize("packed", ("5\nabc", "abc", b"10\nabc", "3\nabc4"))
+def test_unpack_buffers_malformed(packed):
+    from funcx.serialize.facade import FuncXSerializer
+
+    with pytest.raises(ValueError):
+        FuncXSerializer.unpack_buffers(packed)
+
+
+def test_serialize_remembers_strategy():
+    from funcx.serialize.facade import FuncXSerializer
+
+    fxs = FuncXSerializer()
+    failing, working = (
+        mock.Mock(_out_of_band=False, _fast_path=False) for _ in range(2)
+    )
+    failing.serialize.side_effect = Exception("no source")
+    working.serialize.return_value = "01\nabc"
+    fxs._code_strategies = [failing, working]
+
+    for _ in range(3):
+        assert fxs.serialize(foo) == "01\nabc"
+    assert failing.serialize.call_count == 1, "failed method not re-attempted"
+    assert working.serialize.call_count == 3
+    assert fxs.strategy_stats() == {"hits": 2, "misses": 1, "size": 1}
+
+    # memoized per callable identity
+    fxs.serialize(decorated_add)
+    assert failing.serialize.call_count == 2
+
+
+def test_serialize_does_not_remember_fast_path():
+    from funcx.serialize.facade import FuncXSerializer
+
+    fxs = FuncXSerializer(fast_path=True)
+    json_method = fxs._data_strategies[0]
+    json_method.serialize = mock.Mock(wraps=json_method.serialize)
+
+    for i in range(3):
+        assert fxs.serialize([i]).startswith("11\n")
+    assert json_method.serialize.call_count == 3
+    assert fxs.strategy_stats() == {"hits": 0, "misses": 0, "size": 0}
+
+    # remembered fast paths (e.g., from before) are not attempted twice
+    fxs._data_strategy[(list, False)] = json_method
+    json_method.serialize.reset_mock()
+    assert fxs.serialize([(1, 2)]).startswith("00\n")
+    assert json_method.serialize.call_count == 1
+
+
+def test_serialize_remembered_strategy_falls_back():
+    from funcx.serialize.facade import FuncXSerializer
+
+    fxs = FuncXSerializer(binary=True, fast_path=False)
+    assert fxs.serialize((1,)).startswith(b"05\n")
+
+    # the remembered (binary) method fails for this tuple; text is tried next
+    with mock.patch.object(concretes.dill, "dumps", side_effect=[Exception, b"x"]):
+        x = fxs.serialize((2,))
+    assert x.startswith("00\n")
+    assert fxs.strategy_stats()["misses"] == 2
+
+    assert fxs.serialize((3,)).startswith("00\n"), "remembers the last success"
+    assert fxs.strategy_stats()["hits"] == 1
+
+    # data strategies are memoized by type; unhashable or not, all work
+    assert fxs.deserialize(fxs.serialize([1, 2])) == [1, 2]
+    assert fxs.deserialize(fxs.serialize({"a": [1]})) == {"a": [1]}
+
+
+def test_combined_code_caches_encoding():
+    combined = concretes.CombinedCode()
+    with mock.patch.object(
+        concretes.DillCodeSource, "serialize", wraps=combined._methods["04\n"].serialize
+    ) as mock_serialize:
+        serialized = combined.serialize(foo)
+        assert combined.serialize(foo) is serialized
+        assert mock_serialize.call_count == 1
+
+    check_deserialized_foo(combined.deserialize(serialized))
+
+
+def test_combined_code_cache_invalidated_by_new_defaults():
+    def local_foo(x, y=3):
+        return x * y
+
+    combined = concretes.CombinedCode()
+    with mock.patch.object(concretes.DillCode, "serialize", return_value="01\nabc"):
+        serialized = combined.serialize(local_foo)
+        local_foo.__defaults__ = (4,)
+        assert combined.serialize(local_foo) is not serialized
+        assert len(combined._cache) == 1
+
+    del local_foo
+    gc.collect()  # the mock's call records are collected with it
+    assert len(combined._cache) == 0, "cache does not keep functions alive"
+
+
+def test_combined_code_reads_lazily():
+    combined = concretes.CombinedCode()
+    serialized = combined.serialize(foo)
+    payloads = list(combined.iter_payloads(serialized))
+    assert payloads == list(combined.get_multiple_payloads(serialized))
+
+    # the first variant works; later variants are never parsed or decoded
+    (serial_id, encoded), *_ = payloads
+    truncated = combined.identifier + serial_id + ":" + encoded + ":01\n:!!"
+    check_deserialized_foo(combined.deserialize(truncated))
+
+
+def test_shared_arguments():
+    from funcx.serialize.facade import FuncXSerializer
+    from funcx.serialize.shared import payload_digest
+
+    fxs = FuncXSerializer()
+    big, small = fxs.serialize([0] * 1000), fxs.serialize((1, 2))
+    shared = [(big, payload_digest(big)), (small, None)]
+
+    x = fxs.shared_arguments.serialize(shared)
+    assert x.startswith("12\n")
+    first = fxs.deserialize(x)
+    assert first == ([0] * 1000, (1, 2))
+
+    second = FuncXSerializer.deserialize(fxs, x.encode())  # bytes are fine too
+    assert second[0] is first[0], "shared arguments are deserialized once"
+    assert second[1] is not first[1]
+
+    kw = fxs.deserialize(fxs.shared_arguments.serialize(shared, keys=["a", "b"]))
+    assert kw == {"a": [0] * 1000, "b": (1, 2)}
+    assert fxs.shared_arguments.stats() == {"hits": 2, "misses": 1, "size": 1}
+
+    with pytest.raises(concretes.DeserializationError):
+        fxs.deserialize(x[:-1])
+
+    forged = fxs.shared_arguments.serialize([(small, payload_digest(big))])
+    with pytest.raises(concretes.DeserializationError):
+        FuncXSerializer().deserialize(forged)
+
+
+def test_shared_arguments_cache_is_bounded():
+    from funcx.serialize.facade import FuncXSerializer
+    from funcx.serialize.shared import SharedArguments, payload_digest
+
+    fxs = FuncXSerializer()
+    fxs.shared_arguments = SharedArguments(cache_size=2)
+    for i in range(5):
+        payload = fxs.serialize(i)
+        fxs.deserialize(
+            fxs.shared_arguments.serialize([(payload, payload_digest(payload))])
+        )
+    assert fxs.shared_arguments.stats() == {"hits": 0, "misses": 5, "size": 2}
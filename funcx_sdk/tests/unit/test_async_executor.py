@@ -0,0 +1,276 @@
+import asyncio
+import uuid
+from unittest import mock
+
+import pytest
+from funcx_common import messagepack
+from funcx_common.messagepack.message_types import Result, ResultErrorDetails
+
+from funcx import AsyncFuncXExecutor
+from funcx.errors import FuncxTaskExecutionFailed
+from funcx.sdk.async_executor import AsyncFuncXFuture, _AsyncResultWatcher
+from funcx.serialize import FuncXSerializer
+
+
+def noop():
+    return 1
+
+
+def _mock_client():
+    fxc = mock.MagicMock()
+    fxc.session_task_group_id = str(uuid.uuid4())
+    fxc.fx_serializer = FuncXSerializer()
+    fxc.register_function.return_value = "some-fn-id"
+    fxc.create_batch.side_effect = lambda **kwargs: mock.MagicMock()
+    fxc.batch_run.side_effect = lambda batch: [
+        str(uuid.uuid4()) for _ in range(batch.add.call_count)
+    ]
+    return fxc
+
+
+@pytest.fixture
+def async_fxexecutor(mocker):
+    # no AMQP connection; results are delivered by the tests
+    mocker.patch.object(_AsyncResultWatcher, "_connect", mock.AsyncMock())
+    fxc = _mock_client()
+    return fxc, AsyncFuncXExecutor(endpoint_id="some-ep-id", funcx_client=fxc)
+
+
+def _deliver(watcher, fut, data=None, error=None, tag=1):
+    if error is not None:
+        res = Result(task_id=fut.task_id, error_details=error, data=data)
+    else:
+        res = Result(task_id=fut.task_id, data=FuncXSerializer().serialize(data))
+    watcher._on_message(
+        watcher._channel, mock.Mock(delivery_tag=tag), None, messagepack.pack(res)
+    )
+
+
+def _run(coro):
+    # a private loop, leaving the thread's current event loop alone
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _until(predicate, timeout=5):
+    async def _wait():
+        while not predicate():
+            await asyncio.sleep(0.001)
+
+    await asyncio.wait_for(_wait(), timeout)
+
+
+def test_submit_batches_tasks_and_registers_once(async_fxexecutor):
+    fxc, fxe = async_fxexecutor
+
+    async def main():
+        futs = [fxe.submit(noop) for _ in range(10)]
+        assert all(isinstance(f, AsyncFuncXFuture) for f in futs)
+        await _until(lambda: all(f.task_id for f in futs))
+        await fxe.shutdown(wait=False, cancel_futures=True)
+        return futs
+
+    futs = _run(main())
+    assert fxc.register_function.call_count == 1
+    assert fxc.batch_run.call_count == 1, "Submitted together, sent together"
+    assert fxe.task_count_submitted == 10
+    assert len({f.task_id for f in futs}) == 10
+
+
+def test_submit_respects_batch_size(async_fxexecutor):
+    fxc, fxe = async_fxexecutor
+    fxe.batch_size = 3
+
+    async def main():
+        futs = [fxe.submit_to_registered_function("fn-id") for _ in range(10)]
+        await _until(lambda: all(f.task_id for f in futs))
+        await fxe.shutdown(wait=False, cancel_futures=True)
+
+    _run(main())
+    assert not fxc.register_function.called
+    assert fxc.batch_run.call_count == 4
+
+
+def test_results_complete_futures(async_fxexecutor):
+    fxc, fxe = async_fxexecutor
+
+    async def main():
+        futs = [fxe.submit(noop) for _ in range(3)]
+        await _until(lambda: all(f.task_id for f in futs))
+        watcher = fxe._result_watcher
+        watcher._channel = mock.Mock(is_open=True)
+
+        _deliver(watcher, futs[0], data="abc", tag=1)
+        err = ResultErrorDetails(code="1234", user_message="some_user_message")
+        _deliver(watcher, futs[2], data="doh!", error=err, tag=2)
+        assert futs[0].result() == "abc", "Completed as the result arrived"
+
+        completed = []
+        async for fut in fxe.as_completed(futs[1:]):
+            completed.append(fut)
+            if len(completed) == 1:
+                _deliver(watcher, futs[1], data=[1, 2], tag=3)
+
+        assert completed == [futs[2], futs[1]]
+        assert futs[1].result() == [1, 2]
+        with pytest.raises(FuncxTaskExecutionFailed) as excinfo:
+            futs[2].result()
+        assert "doh!" in str(excinfo.value)
+        await fxe.shutdown()
+        return watcher
+
+    watcher = _run(main())
+    watcher._channel.basic_ack.assert_called_with(3, multiple=True)
+
+
+def test_result_before_future_is_watched():
+    async def main():
+        watcher = _AsyncResultWatcher(mock.Mock(funcx_client=_mock_client()))
+        watcher._connector = mock.Mock()  # as if connected
+        fut = AsyncFuncXFuture()
+        fut.task_id = str(uuid.uuid4())
+        _deliver(watcher, fut, data="abc")
+        assert watcher.watch_for_task_results([fut]) == 1
+        assert fut.result() == "abc"
+        assert not watcher._received_results
+
+    _run(main())
+
+
+def test_unmatched_results_spill_to_disk(tmp_path):
+    nbytes = len(FuncXSerializer().serialize("0" * 60))
+
+    async def main():
+        watcher = _AsyncResultWatcher(
+            mock.Mock(funcx_client=_mock_client()),
+            max_unmatched_bytes=nbytes * 3 // 2,
+            spill_dir=str(tmp_path),
+        )
+        watcher._connector = mock.Mock()  # as if connected
+        futs = [AsyncFuncXFuture() for _ in range(3)]
+        for i, fut in enumerate(futs):
+            fut.task_id = str(uuid.uuid4())
+            _deliver(watcher, fut, data=str(i) * 60, tag=i + 1)
+
+        # the first fits in memory; the others wait on disk
+        assert list(watcher._received_results) == [futs[0].task_id]
+        assert len(watcher._spilled) == 2
+        assert watcher._received_bytes == nbytes
+
+        assert watcher.watch_for_task_results(futs) == 3
+        assert [fut.result() for fut in futs] == [str(i) * 60 for i in range(3)]
+        assert not watcher._received_results and not watcher._spilled
+        assert watcher._received_bytes == 0
+        await watcher.close()
+
+    _run(main())
+
+
+def test_connect_sets_qos(mocker):
+    async def main():
+        fxc = _mock_client()
+        fxc.get_result_amqp_url.return_value = {
+            "queue_prefix": "q-",
+            "connection_url": "amqp://localhost",
+        }
+        channel = mock.Mock()
+
+        def connect(*args, on_open_callback, **kwargs):
+            conn = mock.Mock(is_open=False, is_closed=True)
+            conn.channel.side_effect = lambda on_open_callback: (
+                on_open_callback(channel)
+            )
+            on_open_callback(conn)
+            return conn
+
+        mocker.patch("funcx.sdk.async_executor.AsyncioConnection", side_effect=connect)
+        watcher = _AsyncResultWatcher(
+            mock.Mock(funcx_client=fxc), prefetch_count=10, prefetch_size=4096
+        )
+        await watcher._connect()
+        channel.basic_qos.assert_called_once_with(prefetch_size=4096, prefetch_count=10)
+        channel.basic_consume.assert_called_once()
+        await watcher.close()
+
+    _run(main())
+
+
+def test_resultwatcher_acks_by_count():
+    async def main():
+        watcher = _AsyncResultWatcher(
+            mock.Mock(funcx_client=_mock_client()), ack_batch_size=2
+        )
+        watcher._channel = mock.Mock(is_open=True)
+        for tag in (1, 2, 3):
+            fut = AsyncFuncXFuture()
+            fut.task_id = str(uuid.uuid4())
+            _deliver(watcher, fut, data=tag, tag=tag)
+        watcher._channel.basic_ack.assert_called_once_with(2, multiple=True)
+        assert watcher._to_ack == [3]
+        await watcher.close()
+
+    _run(main())
+
+
+def test_connection_failure_fails_futures():
+    async def main():
+        fxc = _mock_client()
+        fxc.get_result_amqp_url.side_effect = Exception("no AMQP for you")
+        watcher = _AsyncResultWatcher(mock.Mock(funcx_client=fxc))
+        futs = [AsyncFuncXFuture() for _ in range(2)]
+        futs[0].task_id = str(uuid.uuid4())
+        watcher.watch_for_task_results(futs[:1])
+        with pytest.raises(Exception) as excinfo:
+            await futs[0]
+        assert "no AMQP" in str(excinfo.value)
+
+        futs[1].task_id = str(uuid.uuid4())
+        watcher.watch_for_task_results(futs[1:])
+        assert "no AMQP" in str(futs[1].exception())
+
+    _run(main())
+
+
+def test_registration_failure_fails_futures(async_fxexecutor):
+    fxc, fxe = async_fxexecutor
+    fxc.register_function.side_effect = Exception("bad function")
+
+    async def main():
+        fut = fxe.submit(noop)
+        with pytest.raises(Exception) as excinfo:
+            await fut
+        assert "bad function" in str(excinfo.value)
+        await fxe.shutdown()
+
+    _run(main())
+    assert not fxc.batch_run.called
+
+
+def test_shutdown_refuses_new_tasks(async_fxexecutor):
+    fxc, fxe = async_fxexecutor
+
+    async def main():
+        fut = fxe.submit(noop)
+        await fxe.shutdown(wait=False, cancel_futures=True)
+        assert fut.cancelled() or fut.task_id
+        with pytest.raises(RuntimeError):
+            fxe.submit(noop)
+
+    _run(main())
+
+
+def test_submit_requires_endpoint_and_running_loop():
+    fxe = AsyncFuncXExecutor(funcx_client=_mock_client())
+
+    async def main():
+        with pytest.raises(ValueError):
+            fxe.submit(noop)
+
+    _run(main())
+
+    fxe.endpoint_id = "some-ep-id"
+    with pytest.raises(RuntimeError):
+        fxe.submit(noop)  # not on an event loop
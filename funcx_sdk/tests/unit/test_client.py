@@ -1,3 +1,5 @@
+import json
+import threading
 import uuid
 from unittest import mock
 
@@ -6,6 +8,7 @@ import pytest
 import funcx
 from funcx import ContainerSpec
 from funcx.errors import FuncxTaskExecutionFailed
+from funcx.sdk.task_status_cache import TaskStatusCache
 from funcx.serialize import FuncXSerializer
 
 
@@ -114,7 +117,10 @@ def test_pending_tasks_always_fetched():
     fxc = funcx.FuncXClient(do_version_check=False, login_manager=mock.Mock())
     fxc.web_client = mock.MagicMock()
     fxc._task_status_table.update(
-        {should_fetch_01: {"pending": True}, no_fetch: {"pending": False}}
+        {
+            should_fetch_01: {"pending": True},
+            no_fetch: {"pending": False, "status": "success", "result": None},
+        }
     )
     task_id_list = [no_fetch, should_fetch_01, should_fetch_02]
 
@@ -140,6 +146,154 @@ def test_pending_tasks_always_fetched():
             assert sf == args[0]
 
 
+def test_completed_tasks_cache_is_bounded():
+    serde = FuncXSerializer()
+    fxc = funcx.FuncXClient(
+        do_version_check=False, login_manager=mock.Mock(), task_cache_size=2
+    )
+    fxc.web_client = mock.MagicMock()
+    task_ids = [str(uuid.uuid4()) for _ in range(3)]
+    fxc.web_client.get_batch_status.return_value = {
+        "results": {
+            task_id: {
+                "status": "success",
+                "result": serde.serialize(i),
+                "completion_t": "1.1",
+            }
+            for i, task_id in enumerate(task_ids)
+        }
+    }
+
+    results = fxc.get_batch_result(task_ids)
+    assert list(results) == task_ids
+    assert [r["result"] for r in results.values()] == [0, 1, 2]
+
+    # the oldest was evicted, and is the only one fetched again
+    fxc.web_client.get_batch_status.reset_mock()
+    assert [r["result"] for r in fxc.get_batch_result(task_ids).values()] == [0, 1, 2]
+    args, _ = fxc.web_client.get_batch_status.call_args
+    assert args[0] == [task_ids[0]]
+
+    stats = fxc.task_cache_stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] >= 2
+    assert stats["hits"] == 2
+
+
+def test_completed_tasks_cache_drops_results_once_read():
+    serde = FuncXSerializer()
+    fxc = funcx.FuncXClient(do_version_check=False, login_manager=mock.Mock())
+    fxc.web_client = mock.MagicMock()
+    task_id = str(uuid.uuid4())
+    fxc.web_client.get_task.return_value.text = json.dumps(
+        {"status": "success", "result": serde.serialize("abc"), "completion_t": "1"}
+    )
+
+    assert fxc.get_result(task_id) == "abc"  # fetched, and cached
+    assert fxc.task_cache_stats()["bytes"] > 0
+    assert fxc.get_result(task_id) == "abc"  # read from the cache, then dropped
+    assert fxc.web_client.get_task.call_count == 1
+    assert fxc.task_cache_stats()["bytes"] == 0
+
+    # only the status is still known; the result is fetched again
+    assert fxc.get_result(task_id) == "abc"
+    assert fxc.web_client.get_task.call_count == 2
+
+
+def test_get_task_keeps_returning_the_result():
+    serde = FuncXSerializer()
+    fxc = funcx.FuncXClient(do_version_check=False, login_manager=mock.Mock())
+    fxc.web_client = mock.MagicMock()
+    task_id = str(uuid.uuid4())
+    fxc.web_client.get_task.return_value.text = json.dumps(
+        {"status": "success", "result": serde.serialize("abc"), "completion_t": "1"}
+    )
+
+    assert fxc.get_task(task_id)["result"] == "abc"
+    assert fxc.get_task(task_id)["result"] == "abc"
+    assert fxc.web_client.get_task.call_count == 1, "Second read is cached"
+
+    assert fxc.get_result(task_id) == "abc"  # takes the cached result
+    assert fxc.get_task(task_id)["result"] == "abc", "Fetched again"
+    assert fxc.web_client.get_task.call_count == 2
+
+
+def test_batch_result_fetched_in_concurrent_chunks():
+    serde = FuncXSerializer()
+    fxc = funcx.FuncXClient(do_version_check=False, login_manager=mock.Mock())
+    fxc.web_client = mock.MagicMock()
+    task_ids = [str(uuid.uuid4()) for _ in range(5)]
+
+    threads = set()
+
+    def get_batch_status(id_chunk):
+        threads.add(threading.get_ident())
+        return {
+            "results": {
+                task_id: {
+                    "status": "success",
+                    "result": serde.serialize(task_id),
+                    "completion_t": "1.1",
+                }
+                for task_id in id_chunk
+            }
+        }
+
+    fxc.web_client.get_batch_status.side_effect = get_batch_status
+
+    chunks = list(fxc.iter_batch_result(task_ids, chunk_size=2, max_workers=3))
+    assert sorted(len(chunk) for chunk in chunks) == [1, 2, 2]
+    assert threading.get_ident() not in threads
+
+    # completed tasks come from the cache, in one chunk
+    fxc.web_client.get_batch_status.reset_mock()
+    results = fxc.get_batch_result(task_ids, chunk_size=2)
+    assert not fxc.web_client.get_batch_status.called
+    assert list(results) == task_ids
+    assert all(results[task_id]["result"] == task_id for task_id in task_ids)
+
+
+def test_task_status_cache_limits(monkeypatch):
+    done = {"pending": False, "status": "success", "result": None}
+    cache = TaskStatusCache(max_entries=None, max_bytes=100)
+    cache.put("a", done, 60)
+    cache.put("pending", {"pending": True, "status": "waiting-for-ep"})
+    assert "pending" not in cache
+    assert cache.stats()["bytes"] == 60
+    assert cache.get("a") is done
+    assert cache.get("a") is done, "Kept, unless the result is taken"
+
+    # a taken result is handed out once; then only the status is kept
+    assert cache.get("a", drop_result=True) is done
+    assert cache.get("a") == {"pending": False, "status": "success"}
+    assert cache.stats()["bytes"] == 0
+    cache.put("a", done, 60)
+
+    cache.put("b", done, 60)  # over the byte limit: "a" goes
+    assert "a" not in cache and "b" in cache
+    assert cache.stats()["bytes"] == 60
+
+    # the most recent entry is kept, however large
+    cache.put("c", done, 1000)
+    assert len(cache) == 1 and "c" in cache
+
+    now = [0.0]
+    monkeypatch.setattr("funcx.sdk.task_status_cache.time.monotonic", lambda: now[0])
+    cache = TaskStatusCache(ttl=10)
+    cache.put("a", done)
+    now[0] = 5
+    assert cache.get("a") is done  # reading resets the clock
+    now[0] = 14
+    assert cache.get("a")["status"] == "success"
+    now[0] = 30
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+    cache = TaskStatusCache(max_entries=0)
+    cache.put("a", done)
+    assert len(cache) == 0
+
+
 @pytest.mark.parametrize("create_ws_queue", [True, False, None])
 def test_batch_created_websocket_queue(create_ws_queue):
     eid = str(uuid.uuid4())
@@ -166,6 +320,201 @@ def test_batch_created_websocket_queue(create_ws_queue):
         assert submit_data["create_websocket_queue"] is False
 
 
+def test_batches_share_client_serializer():
+    fxc = funcx.FuncXClient(do_version_check=False, login_manager=mock.Mock())
+
+    batch1, batch2 = fxc.create_batch(), fxc.create_batch()
+    assert batch1.fx_serializer is fxc.fx_serializer
+    assert batch2.fx_serializer is fxc.fx_serializer
+
+    batch1.add("fid1", "eid1", (1,))
+    batch2.add("fid2", "eid2", (2,))
+    assert fxc.fx_serializer.strategy_stats()["hits"] >= 2
+
+
+def test_batch_shares_large_arguments():
+    fxc = funcx.FuncXClient(do_version_check=False, login_manager=mock.Mock())
+    fxs = fxc.fx_serializer
+    table = list(range(50_000))
+
+    with mock.patch.object(fxs, "serialize", wraps=fxs.serialize) as mock_serialize:
+        batch = fxc.create_batch(share_arguments=True)
+        for i in range(5):
+            batch.add("fid", "eid", (table, i), {"lookup": table, "flag": True})
+    assert [c.args[0] is table for c in mock_serialize.call_args_list].count(True) == 1
+
+    # an identical copy serializes identically, so is shared too
+    batch.add("fid", "eid", (list(table), 5))
+
+    worker_fxs = FuncXSerializer()
+    for i, (_, _, payload) in enumerate(batch.tasks):
+        ser_args, ser_kwargs = worker_fxs.unpack_buffers(payload)
+        assert ser_args.startswith("12\n")
+        args = worker_fxs.deserialize(ser_args)
+        assert args == (table, i)
+        if i < 5:
+            assert worker_fxs.deserialize(ser_kwargs) == {"lookup": table, "flag": True}
+    assert worker_fxs.shared_arguments.stats() == {"hits": 10, "misses": 1, "size": 1}
+
+
+def test_batch_does_not_share_by_default_or_small_arguments():
+    fxc = funcx.FuncXClient(do_version_check=False, login_manager=mock.Mock())
+    table = list(range(50_000))
+
+    batch = fxc.create_batch()
+    batch.add("fid", "eid", (table, 1))
+    small = fxc.create_batch(share_arguments=True)
+    small.add("fid", "eid", ([1, 2, 3], 1))
+
+    for b in (batch, small):
+        ser_args, _ = fxc.fx_serializer.unpack_buffers(b.tasks[0][2])
+        assert not ser_args.startswith("12\n")
+
+
+def _double(x):
+    return 2 * x
+
+
+def _triple(x):
+    return 3 * x
+
+
+def _make_caching_client(funcx_home, identity_id="some-identity"):
+    login_manager = mock.Mock()
+    auth_client = login_manager.get_auth_client.return_value
+    auth_client.oauth2_userinfo.return_value = {"sub": identity_id}
+    fxc = funcx.FuncXClient(
+        do_version_check=False,
+        login_manager=login_manager,
+        funcx_home=funcx_home,
+        use_registration_cache=True,
+    )
+    fxc.web_client = mock.Mock()
+    fxc.web_client.register_function.side_effect = lambda _data: mock.Mock(
+        data={"function_uuid": str(uuid.uuid4())}
+    )
+    return fxc
+
+
+def test_register_function_uses_persistent_cache(tmp_path):
+    def make_client():
+        return _make_caching_client(tmp_path)
+
+    fxc = make_client()
+    fid = fxc.register_function(_double)
+    assert fxc.web_client.register_function.call_count == 1
+    assert (tmp_path / "function_registrations.db").exists()
+
+    # e.g., the next run of a script: the registration is reused
+    fxc = make_client()
+    assert fxc.register_function(_double) == fid
+    assert fxc.web_client.register_function.call_count == 0
+    assert fxc.registration_cache.stats() == {"hits": 1, "misses": 0}
+
+    # other functions, and other registration arguments, are registered anew
+    assert fxc.register_function(_triple) != fid
+    assert fxc.register_function(_double, container_uuid=str(uuid.uuid4())) != fid
+    assert fxc.web_client.register_function.call_count == 2
+
+    fxc.registration_cache.clear(fid)
+    fxc.register_function(_double)
+    assert fxc.web_client.register_function.call_count == 3
+
+
+def test_register_function_cache_is_per_identity(tmp_path):
+    fid = _make_caching_client(tmp_path).register_function(_double)
+
+    fxc = _make_caching_client(tmp_path, identity_id="another-identity")
+    assert fxc.register_function(_double) != fid
+    assert fxc.web_client.register_function.call_count == 1
+
+    # if the identity is unknown, registrations are not cached
+    fxc = _make_caching_client(tmp_path)
+    fxc.login_manager.get_auth_client.side_effect = Exception("logged out")
+    assert fxc.register_function(_double) != fid
+    assert fxc.register_function(_double) != fid
+    assert fxc.web_client.register_function.call_count == 2
+
+
+def test_cached_function_not_found_is_registered_again(tmp_path):
+    stale_fid = _make_caching_client(tmp_path).register_function(_double)
+
+    fxc = _make_caching_client(tmp_path)
+    assert fxc.register_function(_double) == stale_fid
+    other_fid = fxc.register_function(_triple)
+
+    def submit(data):
+        return {
+            "task_group_id": "tg",
+            "results": [
+                {
+                    "task_uuid": str(uuid.uuid4()),
+                    "http_status_code": 404 if fn_id == stale_fid else 200,
+                    "reason": "Function not found",
+                }
+                for fn_id, _, _ in data["tasks"]
+            ],
+        }
+
+    fxc.web_client.submit.side_effect = submit
+    batch = fxc.create_batch()
+    batch.add(stale_fid, "ep", (1,))
+    batch.add(other_fid, "ep", (2,))
+    batch.add(stale_fid, "ep", (3,))
+    assert len(fxc.batch_run(batch)) == 3
+
+    # the stale id is evicted, the function registered once more, and only the
+    # rejected tasks resubmitted, with the new id
+    assert fxc.web_client.register_function.call_count == 2
+    (resubmitted,) = fxc.web_client.submit.call_args_list[1:]
+    new_fids = {fn_id for fn_id, _, _ in resubmitted[0][0]["tasks"]}
+    assert len(resubmitted[0][0]["tasks"]) == 2
+    assert new_fids.isdisjoint({stale_fid, other_fid})
+    assert fxc.register_function(_double) in new_fids
+
+    # later submissions with the stale id (e.g., remembered by an executor)
+    # use the new one
+    batch = fxc.create_batch()
+    batch.add(stale_fid, "ep", (4,))
+    fxc.batch_run(batch)
+    assert fxc.web_client.submit.call_args[0][0]["tasks"][0][0] in new_fids
+    assert fxc.web_client.register_function.call_count == 2
+
+    # functions not from the cache fail as before
+    fxc.web_client.submit.side_effect = None
+    fxc.web_client.submit.return_value = submit({"tasks": [(stale_fid, 0, 0)]})
+    batch = fxc.create_batch()
+    batch.add(str(uuid.uuid4()), "ep", (5,))
+    with pytest.raises(FuncxTaskExecutionFailed):
+        fxc.batch_run(batch)
+
+
+def test_register_function_without_cache(tmp_path):
+    login_manager = mock.Mock()
+    fxc = funcx.FuncXClient(
+        do_version_check=False, login_manager=login_manager, funcx_home=tmp_path
+    )
+    fxc.web_client = mock.Mock()
+    fxc.web_client.register_function.return_value.data = {"function_uuid": "abc"}
+
+    assert fxc.registration_cache is None, "Opt-in"
+    assert fxc.register_function(_double) == "abc"
+    assert fxc.register_function(_double) == "abc"
+    assert fxc.web_client.register_function.call_count == 2
+    assert not list(tmp_path.iterdir())
+    login_manager.get_auth_client.assert_not_called()
+
+
+def test_register_function_cache_failure_is_not_fatal(tmp_path):
+    (tmp_path / "function_registrations.db").write_text("not a database")
+    fxc = _make_caching_client(tmp_path)
+
+    fid = fxc.register_function(_double)
+    assert fxc.web_client.register_function.call_count == 1
+    fxc.registration_cache.clear(fid)
+    fxc.registration_cache.clear()
+
+
 def test_batch_error():
     fxc = funcx.FuncXClient(do_version_check=False, login_manager=mock.Mock())
     fxc.web_client = mock.MagicMock()
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import gc
+import json
 import random
 import threading
+import time
 import typing as t
 import uuid
 from unittest import mock
@@ -9,13 +14,28 @@ from unittest import mock
 import pika
 import pytest
 from funcx_common import messagepack
-from funcx_common.messagepack.message_types import Result, ResultErrorDetails
+from funcx_common.messagepack.message_types import (
+    Result,
+    ResultErrorDetails,
+    TaskTransition,
+)
+from funcx_common.tasks import ActorName, TaskState
 from tests.utils import try_assert, try_for_timeout
 
 from funcx import FuncXClient, FuncXExecutor
-from funcx.errors import FuncxTaskExecutionFailed
+from funcx.errors import FuncxTaskExecutionFailed, InFlightLimitExceeded
 from funcx.sdk.asynchronous.funcx_future import FuncXFuture
-from funcx.sdk.executor import TaskSubmissionInfo, _ResultWatcher
+from funcx.sdk.batch import Batch
+from funcx.sdk.completion_stream import CompletionStream
+from funcx.sdk.executor import (
+    BatchSizePolicy,
+    InFlightLimit,
+    TaskSubmissionInfo,
+    _ResultWatcher,
+    _run_map_chunk,
+)
+from funcx.sdk.result_cache import DiskResultCache, MemoryResultCache, result_key
+from funcx.sdk.task_timeline import LatencyHistogram, LatencyRecorder, TaskTimeline
 from funcx.serialize.facade import FuncXSerializer
 
 
@@ -255,11 +275,99 @@ def test_same_function_different_containers_allowed(fxexecutor):
         fxe.register_function(noop)
 
 
-def test_map_raises(fxexecutor):
+def divide(a, b):
+    return a / b
+
+
+def _run_locally(fxe, submitted: list):
+    # stand-in for the endpoint: complete each task by running it here
+    def submit_to_registered_function(function_id, args=None, kwargs=None):
+        fut = FuncXFuture(str(uuid.uuid4()))
+        submitted.append((function_id, args))
+        fut.set_result(_run_map_chunk(*args))
+        return fut
+
+    return mock.patch.object(
+        fxe, "submit_to_registered_function", side_effect=submit_to_registered_function
+    )
+
+
+@pytest.mark.parametrize("chunksize", (2, 3, 10, 100))
+def test_map_chunks_invocations(fxexecutor, chunksize):
+    fxc, fxe = fxexecutor
+    fxc.register_function.return_value = "runner_id"
+    fxc.fx_serializer = FuncXSerializer()
+
+    submitted: list = []
+    with _run_locally(fxe, submitted):
+        results = fxe.map(divide, range(10), [2] * 10, chunksize=chunksize)
+        assert len(submitted) == -(-10 // chunksize), "Expect one task per chunk"
+        assert list(results) == [a / 2 for a in range(10)]
+
+    assert all(fn_id == "runner_id" for fn_id, _ in submitted)
+    assert fxc.register_function.call_count == 1
+
+
+def test_map_preserves_per_item_exceptions(fxexecutor):
+    fxc, fxe = fxexecutor
+    fxc.register_function.return_value = "runner_id"
+    fxc.fx_serializer = FuncXSerializer()
+
+    with _run_locally(fxe, []):
+        results = fxe.map(divide, [1, 2, 3], [1, 0, 1], chunksize=3)
+        assert next(results) == 1
+        with pytest.raises(FuncxTaskExecutionFailed) as pyt_exc:
+            next(results)
+    assert "ZeroDivisionError" in str(pyt_exc.value)
+
+    # the rest of the chunk still ran
+    assert _run_map_chunk(FuncXSerializer().serialize(divide), [[1, 0], [3, 1]]) == [
+        [False, mock.ANY],
+        [True, 3],
+    ]
+
+
+def test_map_chunksize_one_submits_directly(fxexecutor):
     fxc, fxe = fxexecutor
 
-    with pytest.raises(NotImplementedError):
-        fxe.map(noop)
+    futs = [FuncXFuture() for _ in range(3)]
+    with mock.patch.object(fxe, "submit", side_effect=futs) as mock_submit:
+        results = fxe.map(divide, [1, 2, 3], [1, 1, 1])
+    assert [c.args for c in mock_submit.call_args_list] == [
+        (divide, 1, 1),
+        (divide, 2, 1),
+        (divide, 3, 1),
+    ]
+
+    for i, fut in enumerate(futs):
+        fut.set_result(i)
+    assert list(results) == [0, 1, 2]
+
+
+def test_map_timeout_cancels_remaining(fxexecutor):
+    fxc, fxe = fxexecutor
+
+    futs = [FuncXFuture() for _ in range(3)]
+    futs[0].set_result(0)
+    with mock.patch.object(fxe, "submit", side_effect=futs):
+        results = fxe.map(divide, [1, 2, 3], [1, 1, 1], timeout=0.01)
+    assert next(results) == 0
+    with pytest.raises(concurrent.futures.TimeoutError):
+        next(results)
+    assert futs[2].cancelled()
+
+
+def test_map_invalid_chunksize(fxexecutor):
+    fxc, fxe = fxexecutor
+
+    with pytest.raises(ValueError):
+        fxe.map(divide, [1], [1], chunksize=0)
+
+
+def test_map_runner_is_self_contained():
+    fxs = FuncXSerializer()
+    runner = fxs.deserialize(fxs.serialize(_run_map_chunk))
+    assert runner(fxs.serialize(divide), [[4, 2]]) == [[True, 2]]
 
 
 @pytest.mark.parametrize("num_tasks", [0, 1, 2, 10])
@@ -474,6 +582,85 @@ def test_reload_handles_deseralization_error_gracefully(fxexecutor):
     assert all("Failed to set " in str(fut.exception()) for fut in futs)
 
 
+def test_reload_lazy_results(fxexecutor):
+    fxc, fxe = fxexecutor
+    fxe.lazy_results = True
+    fxc.fx_serializer.deserialize = mock.Mock(side_effect=FuncXSerializer().deserialize)
+
+    payload = FuncXSerializer().serialize("abc")
+    task = {
+        "id": uuid.uuid4(),
+        "completion_t": 1,
+        "status": "success",
+        "result": payload,
+    }
+    fxc.web_client.get_taskgroup_tasks.return_value = {
+        "taskgroup_id": fxe.task_group_id,
+        "tasks": [task],
+    }
+    fxc.web_client.get_batch_status.return_value = mock.MagicMock(
+        data={"results": {task["id"]: task}}
+    )
+
+    (fut,) = fxe.reload_tasks()
+    assert fut.result_bytes() == payload
+    assert not fxc.fx_serializer.deserialize.called
+    assert fut.result() == "abc"
+
+
+def test_reload_fetches_chunks_concurrently_and_streams(fxexecutor):
+    fxc, fxe = fxexecutor
+    fxc.fx_serializer = FuncXSerializer()
+
+    task_ids = [str(uuid.uuid4()) for _ in range(5)]
+    fxc.web_client.get_taskgroup_tasks.return_value = {
+        "taskgroup_id": fxe.task_group_id,
+        "tasks": [{"id": task_id} for task_id in task_ids],
+    }
+
+    last_chunk_requested = threading.Event()
+    release_last_chunk = threading.Event()
+
+    def get_batch_status(id_chunk):
+        if task_ids[-1] in id_chunk:
+            last_chunk_requested.set()
+            release_last_chunk.wait(5)
+        results = {
+            task_id: {
+                "completion_t": "1",
+                "status": "success",
+                "result": fxc.fx_serializer.serialize(task_id),
+            }
+            for task_id in id_chunk
+        }
+        results[id_chunk[0]] = {"status": "waiting-for-ep"}
+        return mock.MagicMock(data={"results": results})
+
+    fxc.web_client.get_batch_status.side_effect = get_batch_status
+
+    futures = fxe.iter_reload_tasks(chunk_size=2, max_workers=3)
+    # the first chunks arrive while the last is still being fetched
+    assert last_chunk_requested.wait(5)
+    first = [next(futures) for _ in range(4)]
+    release_last_chunk.set()
+    reloaded = first + list(futures)
+
+    assert fxc.web_client.get_batch_status.call_count == 3
+    assert sorted(f.task_id for f in reloaded) == sorted(task_ids)
+    pending = {task_ids[0], task_ids[2], task_ids[4]}
+    for fut in reloaded:
+        if fut.task_id in pending:
+            assert not fut.done()
+        else:
+            assert fut.result() == fut.task_id
+    try_assert(lambda: set(fxe._result_watcher._open_futures) == pending)
+
+    # as a list, in Task Group order
+    reloaded = fxe.reload_tasks(chunk_size=2, max_workers=3)
+    assert isinstance(reloaded, list)
+    assert [fut.task_id for fut in reloaded] == task_ids
+
+
 @pytest.mark.parametrize("batch_size", tuple(range(1, 11)))
 def test_task_submitter_respects_batch_size(fxexecutor, batch_size: int):
     fxc, fxe = fxexecutor
@@ -493,6 +680,132 @@ def test_task_submitter_respects_batch_size(fxexecutor, batch_size: int):
         assert batch.add.call_count <= batch_size
 
 
+def test_task_submitter_pipelines_batches(fxexecutor):
+    fxc, fxe = fxexecutor
+
+    release = threading.Event()
+    in_flight = []
+
+    def batch_run(batch):
+        in_flight.append(batch)
+        release.wait()
+        return [str(uuid.uuid4())]
+
+    fxc.create_batch.side_effect = mock.MagicMock
+    fxc.batch_run.side_effect = batch_run
+    fxc.register_function.return_value = "abc"
+
+    # the concurrency is read when the submission thread starts
+    fxe.shutdown()
+    fxe = FuncXExecutor(funcx_client=fxc, batch_size=1, max_concurrent_submissions=2)
+    fxe.endpoint_id = "some_ep_id"
+    futs = [fxe.submit(noop) for _ in range(4)]
+
+    try_assert(lambda: len(in_flight) == 2, "Expect two batches in flight")
+    # the next batch is serialized while the others are in flight
+    try_assert(lambda: fxc.create_batch.call_count == 3)
+    assert len(in_flight) == 2, "Expect no more than two batches in flight"
+
+    release.set()
+    try_assert(lambda: len(in_flight) == 4)
+    try_assert(lambda: all(f.task_id for f in futs))
+    fxe.shutdown(cancel_futures=True)
+    assert fxe.task_count_submitted == 4
+
+
+def test_task_submitter_concurrent_batches_keep_task_ids(fxexecutor):
+    fxc, fxe = fxexecutor
+
+    def batch_run(batch):
+        time.sleep(random.random() / 100)  # complete out of order
+        fxs = FuncXSerializer()
+        return [
+            f"tid-{fxs.deserialize(fxs.unpack_buffers(payload)[0])[0]}"
+            for *_, payload in batch.tasks
+        ]
+
+    fxc.create_batch.side_effect = lambda **_: Batch(serializer=FuncXSerializer())
+    fxc.batch_run.side_effect = batch_run
+    fxc.register_function.return_value = "abc"
+    fxe.endpoint_id = "some_ep_id"
+    fxe.batch_size = 3
+
+    futs = [fxe.submit(noop, i) for i in range(30)]
+    try_assert(lambda: all(f.task_id for f in futs))
+    assert [f.task_id for f in futs] == [f"tid-{i}" for i in range(30)]
+
+
+def test_task_submitter_cancels_futures_of_failed_batch(mocker):
+    mocker.patch("funcx.sdk.executor._ResultWatcher")
+    fxe = MockedFuncXExecutor(endpoint_id="abc", batch_size=1)
+    fxe.funcx_client.batch_run.side_effect = [["tid-1"], Exception("upstream")]
+    fxe.funcx_client.register_function.return_value = "abc"
+
+    futs = [fxe.submit(noop), fxe.submit(noop)]
+    try_assert(lambda: fxe._stopped)
+    try_assert(lambda: str(fxe._task_submitter_exception) == "upstream")
+    assert futs[0].task_id == "tid-1"
+    try_assert(lambda: futs[1].cancelled())
+
+
+def test_batch_size_policy_adapts_to_latency_and_errors():
+    policy = BatchSizePolicy(max_bytes=1024**2, min_bytes=1024, target_latency_s=1)
+    assert policy.target_count(128) == 128
+    assert policy.target_bytes == 1024**2
+
+    policy.record(128, 1024**2, elapsed_s=5)
+    assert policy.target_count(128) == 64
+    assert policy.target_bytes == 1024**2 // 2
+
+    policy.record(64, 1024, elapsed_s=0.1, error=True)
+    assert policy.target_count(128) == 32
+
+    for _ in range(20):
+        policy.record(1, 1, elapsed_s=5)
+    assert policy.target_count(128) == 1, "At least one task per batch"
+    assert policy.target_bytes == 1024, "No less than min_bytes"
+
+    for _ in range(30):
+        policy.record(1, 1, elapsed_s=0.1)
+    assert policy.target_count(128) == 128
+    assert policy.target_bytes == 1024**2
+
+    stats = policy.stats(128)
+    assert stats["batches"] == 52
+    assert stats["errors"] == 1
+    assert len(stats["recent_batches"]) == 32
+    assert stats["recent_batches"][-1] == {"tasks": 1, "bytes": 1, "latency_s": 0.1}
+
+
+def test_batch_size_policy_is_full():
+    policy = BatchSizePolicy(max_bytes=1000)
+    assert not policy.is_full(1, 999, max_count=2)
+    assert policy.is_full(2, 10, max_count=2)
+    assert policy.is_full(1, 1000, max_count=2)
+
+
+def test_task_submitter_caps_batch_bytes(fxexecutor):
+    fxc, fxe = fxexecutor
+    fxc.create_batch.side_effect = lambda **_: Batch(serializer=FuncXSerializer())
+    fxc.batch_run.side_effect = lambda batch: [str(uuid.uuid4()) for _ in batch.tasks]
+    fxc.register_function.return_value = "abc"
+
+    fxe.shutdown()
+    fxe = FuncXExecutor(funcx_client=fxc, batch_size=100, max_batch_bytes=1000)
+    fxe.endpoint_id = "some_ep_id"
+    futs = [fxe.submit(noop, "x" * 2000) for _ in range(5)]
+    try_assert(lambda: all(f.task_id for f in futs))
+    fxe.shutdown(cancel_futures=True)
+
+    batches = [args[0] for args, _ in fxc.batch_run.call_args_list]
+    assert [len(b.tasks) for b in batches] == [1] * 5, "Each task exceeds the budget"
+    stats = fxe.submission_stats()
+    assert stats["batches"] == 5
+    assert stats["tasks"] == 5
+    assert stats["bytes"] == sum(b.payload_size for b in batches)
+    assert stats["target_count"] == 100
+
+
 def test_task_submitter_stops_executor_on_exception():
     fxe = MockedFuncXExecutor()
     fxe._tasks_to_send.put(("too", "much", "destructuring", "!!"))
@@ -540,10 +853,23 @@ def test_task_submitter_sets_future_task_ids(fxexecutor):
     futs = [FuncXFuture() for _ in range(num_tasks)]
     batch_ids = [uuid.uuid4() for _ in range(num_tasks)]
 
+    tasks = [
+        TaskSubmissionInfo(
+            task_num=i, function_id="fn", endpoint_id="ep", args=(i,), kwargs={}
+        )
+        for i in range(num_tasks)
+    ]
+    batch = Batch(serializer=FuncXSerializer())
+    for task in tasks:
+        fxe._add_to_batch(batch, task)
+
     fxc.batch_run.return_value = batch_ids
-    fxe._submit_tasks(futs, [])
+    fxe._send_batch(futs, tasks, batch)
 
+    fxc.batch_run.assert_called_once_with(batch)
     assert all(f.task_id == task_id for f, task_id in zip(futs, batch_ids))
+    assert fxe.task_count_submitted == num_tasks
+    assert fxe.batch_policy.stats(1)["batches"] == 1
 
 
 def test_resultwatcher_stops_if_unable_to_connect(mocker):
@@ -700,6 +1026,133 @@ def test_resultwatcher_match_sets_result(randomstring):
     mrw.shutdown()
 
 
+def test_resultwatcher_match_decompresses_result():
+    payload = "abc," * 100_000
+    fxs = FuncXSerializer(compression_threshold=1024)
+    fut = FuncXFuture(task_id=uuid.uuid4())
+    res = Result(task_id=fut.task_id, data=fxs.serialize(payload))
+    assert len(res.data) < len(payload), "Test prerequisite: compressed result"
+
+    mrw = MockedResultWatcher(mock.Mock())
+    mrw.funcx_executor.funcx_client.fx_serializer.deserialize = (
+        FuncXSerializer().deserialize
+    )
+    mrw._received_results[fut.task_id] = (None, res)
+    mrw.watch_for_task_results([fut])
+    mrw.start()
+    mrw._event_watcher()
+
+    assert fut.result() == payload
+    mrw.shutdown()
+
+
+def test_resultwatcher_decodes_large_results_off_the_ioloop(randomstring):
+    payload = randomstring()
+    fxs = FuncXSerializer()
+    small_fut = FuncXFuture(task_id=uuid.uuid4())
+    large_fut = FuncXFuture(task_id=uuid.uuid4())
+    small = Result(task_id=small_fut.task_id, data=fxs.serialize("small"))
+    large = Result(task_id=large_fut.task_id, data=fxs.serialize(payload))
+
+    decoding = threading.Event()
+    release = threading.Event()
+
+    def slow_deserialize(data):
+        if data == large.data:
+            decoding.set()
+            release.wait(5)
+        return fxs.deserialize(data)
+
+    mrw = MockedResultWatcher(mock.Mock(), inline_decode_bytes=len(large.data))
+    mrw.funcx_executor.funcx_client.fx_serializer.deserialize = slow_deserialize
+    mrw._received_results[small_fut.task_id] = (None, small)
+    mrw._received_results[large_fut.task_id] = (None, large)
+    mrw.watch_for_task_results([small_fut, large_fut])
+    mrw.start()
+    mrw._event_watcher()
+
+    assert decoding.wait(5)
+    assert small_fut.result(timeout=0) == "small", "Small results decoded inline"
+    assert not large_fut.done()
+    assert mrw.decode_stats()["queue_depth"] == 1
+
+    release.set()
+    assert large_fut.result(timeout=5) == payload
+    try_assert(lambda: mrw.decode_stats()["queue_depth"] == 0)
+    stats = mrw.decode_stats()
+    assert stats["decoded"] == 2
+    assert stats["bytes"] == len(small.data) + len(large.data)
+    assert stats["max_decode_s"] >= stats["mean_decode_s"] > 0
+    mrw.shutdown()
+
+
+def test_future_deserializes_lazily_once():
+    fxs = FuncXSerializer()
+    payload = fxs.serialize({"a": 1})
+    deserialize = mock.Mock(side_effect=fxs.deserialize)
+    callback = mock.Mock()
+
+    fut = FuncXFuture(task_id=str(uuid.uuid4()))
+    fut.add_done_callback(callback)
+    fut.set_serialized_result(payload, deserialize)
+
+    assert fut.done()
+    callback.assert_called_once_with(fut)
+    assert fut.result_bytes() == payload
+    assert not deserialize.called, "Not deserialized until read"
+
+    assert fut.result() == {"a": 1}
+    assert fut.result() == {"a": 1}
+    assert deserialize.call_count == 1
+    with pytest.raises(ValueError):
+        fut.result_bytes()  # payload released once deserialized
+
+
+def test_future_lazy_deserialization_error():
+    fut = FuncXFuture()
+    fut.set_serialized_result("invalidly serialized", FuncXSerializer().deserialize)
+    errors = []
+    for _ in range(2):
+        with pytest.raises(Exception) as excinfo:
+            fut.result()
+        errors.append(excinfo.value)
+    assert errors[0] is errors[1], "Deserialized (and failed) only once"
+    assert fut.exception() is None, "Task itself succeeded"
+
+
+def test_future_result_bytes_without_serialized_result():
+    fut = FuncXFuture()
+    fut.set_result(1)
+    with pytest.raises(ValueError):
+        fut.result_bytes()
+
+    fut = FuncXFuture()
+    fut.set_exception(FuncxTaskExecutionFailed("doh!", "0"))
+    with pytest.raises(FuncxTaskExecutionFailed):
+        fut.result_bytes()
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        FuncXFuture().result_bytes(timeout=0)
+
+
+def test_resultwatcher_lazy_results():
+    fxs = FuncXSerializer()
+    fut = FuncXFuture(task_id=str(uuid.uuid4()))
+    res = Result(task_id=fut.task_id, data=fxs.serialize("abc"))
+
+    mrw = MockedResultWatcher(mock.Mock(), lazy_results=True, inline_decode_bytes=0)
+    mrw.funcx_executor.funcx_client.fx_serializer.deserialize = fxs.deserialize
+    mrw.watch_for_task_results([fut])
+    mrw.start()
+    mrw._on_message(mrw._channel, mock.Mock(), mock.Mock(), messagepack.pack(res))
+
+    assert fut.result_bytes(timeout=0) == res.data
+    assert mrw.decode_stats()["decoded"] == 0
+    assert mrw._decoder is None, "No decoding threads needed"
+    assert fut.result() == "abc"
+    mrw.shutdown()
+
+
 def test_resultwatcher_match_handles_deserialization_error():
     invalid_payload = "invalidly serialized"
     fxs = FuncXSerializer()
@@ -746,6 +1199,71 @@ def test_resultwatcher_onmessage_sets_check_results_flag():
     assert mrw._time_to_check_results.is_set()
 
 
+def test_resultwatcher_onmessage_completes_watched_future():
+    fxs = FuncXSerializer()
+    fut = FuncXFuture(task_id=str(uuid.uuid4()))
+    res = Result(task_id=fut.task_id, data=fxs.serialize("abc"))
+
+    mrw = MockedResultWatcher(mock.Mock())
+    mrw.funcx_executor.funcx_client.fx_serializer.deserialize = fxs.deserialize
+    mrw.watch_for_task_results([fut])
+    mrw.start()
+    mrw._on_message(mrw._channel, mock.Mock(), mock.Mock(), messagepack.pack(res))
+
+    assert fut.result(timeout=0) == "abc", "Expect no wait for the next poll"
+    assert not mrw._received_results
+    assert not mrw._time_to_check_results.is_set()
+    mrw.shutdown()
+
+
+def test_resultwatcher_watch_wakes_ioloop_if_result_waiting():
+    fxs = FuncXSerializer()
+    fut = FuncXFuture(task_id=str(uuid.uuid4()))
+    res = Result(task_id=fut.task_id, data=fxs.serialize("abc"))
+
+    mrw = MockedResultWatcher(mock.Mock())
+    mrw.funcx_executor.funcx_client.fx_serializer.deserialize = fxs.deserialize
+    mrw.start()
+    mrw.watch_for_task_results([FuncXFuture(task_id=str(uuid.uuid4()))])
+    assert not mrw._connection.ioloop.add_callback_threadsafe.called
+
+    mrw._received_results[fut.task_id] = (None, res)
+    mrw.watch_for_task_results([fut])
+    (callback,), _ = mrw._connection.ioloop.add_callback_threadsafe.call_args
+    callback()  # as the ioloop would
+    assert fut.result(timeout=0) == "abc"
+    mrw.shutdown(cancel_futures=True)
+
+
+def test_resultwatcher_coalesces_acks_by_count_and_time():
+    mrw = MockedResultWatcher(mock.Mock(), ack_batch_size=3, ack_interval_s=0.05)
+    mrw.start()
+    ioloop, channel = mrw._connection.ioloop, mrw._channel
+
+    def deliver(tag):
+        res = Result(task_id=uuid.uuid4(), data="abc")
+        mrw._on_message(
+            channel, mock.Mock(delivery_tag=tag), None, messagepack.pack(res)
+        )
+
+    deliver(1)
+    deliver(2)
+    assert not channel.basic_ack.called
+    assert ioloop.call_later.call_count == 1, "One timer for the outstanding acks"
+    delay, on_timer = ioloop.call_later.call_args[0]
+    assert delay == 0.05
+
+    deliver(3)
+    channel.basic_ack.assert_called_once_with(3, multiple=True)
+
+    deliver(4)
+    assert channel.basic_ack.call_count == 1
+    on_timer()  # as the ioloop would
+    channel.basic_ack.assert_called_with(4, multiple=True)
+    assert not mrw._to_ack
+    mrw.shutdown()
+
+
 @pytest.mark.parametrize("exc", (MemoryError("some description"), "some description"))
 def test_resultwatcher_stops_loop_on_open_failure(mocker, exc):
     mock_log = mocker.patch("funcx.sdk.executor.log", autospec=True)
@@ -821,6 +1339,79 @@ def test_resultwatcher_channel_opened_starts_consuming():
     mrw.shutdown()
 
 
+@pytest.mark.parametrize("prefetch_count", (0, 5, None))
+def test_resultwatcher_sets_prefetch(prefetch_count):
+    kwargs = {} if prefetch_count is None else {"prefetch_count": prefetch_count}
+    mock_channel = mock.Mock()
+    mrw = MockedResultWatcher(mock.Mock(), **kwargs)
+    mrw.start()
+    mrw._on_channel_open(mock_channel)
+    if prefetch_count == 0:
+        assert not mock_channel.basic_qos.called
+    else:
+        _, qos_kwargs = mock_channel.basic_qos.call_args
+        assert qos_kwargs["prefetch_count"] == (prefetch_count or 1024)
+    mrw.shutdown()
+
+
+def test_executor_configures_resultwatcher_flow_control(fxexecutor, mocker):
+    fxc, fxe = fxexecutor
+    watcher = mocker.patch("funcx.sdk.executor._ResultWatcher")
+    fxe.result_prefetch_count = 7
+    fxe.max_unmatched_result_bytes = 1024
+    fxe._new_result_watcher()
+    _, kwargs = watcher.call_args
+    assert kwargs["prefetch_count"] == 7
+    assert kwargs["max_unmatched_bytes"] == 1024
+
+
+def test_resultwatcher_spills_unmatched_results_to_disk(tmp_path):
+    fxs = FuncXSerializer()
+    futs = [FuncXFuture(task_id=str(uuid.uuid4())) for _ in range(4)]
+    results = [
+        Result(task_id=f.task_id, data=fxs.serialize(i)) for i, f in enumerate(futs)
+    ]
+    err_details = ResultErrorDetails(code="1234", user_message="some_user_message")
+    results[-1] = Result(
+        task_id=futs[-1].task_id, error_details=err_details, data="doh!"
+    )
+
+    mrw = MockedResultWatcher(
+        mock.Mock(),
+        max_unmatched_bytes=len(results[0].data),
+        spill_dir=str(tmp_path),
+    )
+    mrw.funcx_executor.funcx_client.fx_serializer.deserialize = fxs.deserialize
+    mrw.start()
+    for tag, res in enumerate(results, start=1):
+        props = pika.BasicProperties(timestamp=tag)
+        mrw._on_message(
+            mrw._channel, mock.Mock(delivery_tag=tag), props, messagepack.pack(res)
+        )
+
+    stats = mrw.buffer_stats()
+    assert stats["received"] == 1, "Only the first result fits in memory"
+    assert stats["spilled"] == 3
+    assert stats["spilled_bytes"] > 0
+    assert mrw._to_ack, "Spilled results are acknowledged as usual"
+
+    mrw.watch_for_task_results(futs[:2])
+    mrw._match_results_to_futures()
+    assert [f.result(timeout=0) for f in futs[:2]] == [0, 1]
+
+    mrw.watch_for_task_results(futs[2:])
+    mrw._match_results_to_futures()
+    assert futs[2].result(timeout=0) == 2
+    assert "doh!" in str(futs[3].exception(timeout=0))
+    assert mrw.buffer_stats() == {
+        "received": 0,
+        "received_bytes": 0,
+        "spilled": 0,
+        "spilled_bytes": 0,
+    }
+    mrw.shutdown()
+
+
 def test_resultwatcher_amqp_acks_in_bulk():
     mrw = MockedResultWatcher(mock.Mock())
     mrw.start()
@@ -830,3 +1421,556 @@ def test_resultwatcher_amqp_acks_in_bulk():
     assert not mrw._to_ack
     assert mrw._channel.basic_ack.call_count == 1
     mrw.shutdown()
+
+
+def _deliver_results(mrw, futs, start_tag=1):
+    fxs = FuncXSerializer()
+    for tag, fut in enumerate(futs, start=start_tag):
+        res = Result(task_id=fut.task_id, data=fxs.serialize(tag))
+        mrw._on_message(
+            mrw._channel, mock.Mock(delivery_tag=tag), None, messagepack.pack(res)
+        )
+
+
+def test_as_completed_yields_in_arrival_order_in_batches(fxexecutor):
+    _, fxe = fxexecutor
+    mrw = MockedResultWatcher(mock.Mock())
+    mrw.funcx_executor.funcx_client.fx_serializer = FuncXSerializer()
+    mrw.start()
+    futs = [FuncXFuture(task_id=str(uuid.uuid4())) for _ in range(4)]
+    mrw.watch_for_task_results(futs)
+
+    stream = fxe.as_completed(futs)
+    assert isinstance(stream, CompletionStream)
+    _deliver_results(mrw, [futs[2], futs[0]])
+
+    batches = []
+    for batch in stream.batches():
+        batches.append(batch)
+        if len(batches) == 1:
+            _deliver_results(mrw, [futs[3], futs[1]], start_tag=3)
+
+    assert batches == [[futs[2], futs[0]], [futs[3], futs[1]]]
+    assert stream.delivered == 4
+    assert not stream._pending, "Futures are not held once yielded"
+    mrw.shutdown()
+
+
+def test_as_completed_includes_already_completed_futures():
+    futs = [FuncXFuture(task_id=str(uuid.uuid4())) for _ in range(3)]
+    futs[1].set_result(1)
+    stream = CompletionStream(futs, timeout=0.1)
+
+    completed = []
+    with pytest.raises(concurrent.futures.TimeoutError) as pyt_exc:
+        for fut in stream:
+            completed.append(fut)
+    assert completed == [futs[1]]
+    assert "2 (of 3) futures unfinished" in str(pyt_exc.value)
+
+
+def test_as_completed_finds_undelivered_futures(mocker):
+    mocker.patch("funcx.sdk.completion_stream._SWEEP_INTERVAL_S", 0.01)
+    fut = FuncXFuture(task_id=str(uuid.uuid4()))
+    stream = CompletionStream([fut])
+    fut.cancel()  # e.g., by the user; nothing delivers it
+    assert list(stream) == [fut]
+
+
+def test_as_completed_delivers_cancelled_futures():
+    mrw = MockedResultWatcher(mock.Mock())
+    mrw.start()
+    futs = [FuncXFuture(task_id=str(uuid.uuid4())) for _ in range(3)]
+    mrw.watch_for_task_results(futs)
+    stream = CompletionStream(futs, timeout=5)
+
+    mrw.shutdown(cancel_futures=True)
+    completed = list(stream)
+    assert len(completed) == 3
+    assert all(f.cancelled() for f in completed)
+
+
+def test_as_completed_holds_acks_while_consumer_behind():
+    mrw = MockedResultWatcher(mock.Mock(), ack_batch_size=1)
+    mrw.funcx_executor.funcx_client.fx_serializer = FuncXSerializer()
+    mrw.start()
+    futs = [FuncXFuture(task_id=str(uuid.uuid4())) for _ in range(4)]
+    mrw.watch_for_task_results(futs)
+    stream = CompletionStream(futs, max_buffered=2)
+    channel = mrw._channel
+
+    _deliver_results(mrw, futs[:1])
+    channel.basic_ack.assert_called_once_with(1, multiple=True)
+
+    _deliver_results(mrw, futs[1:3], start_tag=2)
+    assert channel.basic_ack.call_count == 1, "Consumer is behind; ack held"
+    assert mrw._to_ack == [2, 3]
+    assert id(stream) in mrw._ack_holds
+
+    batches = stream.batches()
+    assert next(batches) == futs[:3]
+    assert not mrw._ack_holds
+    wake = mrw._connection.ioloop.add_callback_threadsafe
+    wake.assert_called_with(mrw._ack_received)
+    mrw._ack_received()
+    channel.basic_ack.assert_called_with(3, multiple=True)
+
+    stream.close()
+    _deliver_results(mrw, futs[3:], start_tag=4)
+    channel.basic_ack.assert_called_with(4, multiple=True)
+    mrw.shutdown()
+
+
+@pytest.mark.parametrize("release", ("stream dropped", "watcher shut down"))
+def test_as_completed_hold_released_without_consumer(release):
+    mrw = MockedResultWatcher(mock.Mock(), ack_batch_size=1)
+    mrw.funcx_executor.funcx_client.fx_serializer = FuncXSerializer()
+    mrw.start()
+    futs = [FuncXFuture(task_id=str(uuid.uuid4())) for _ in range(3)]
+    mrw.watch_for_task_results(futs)
+    stream = CompletionStream(futs, max_buffered=1)
+    channel = mrw._channel
+
+    _deliver_results(mrw, futs[:2])
+    assert id(stream) in mrw._ack_holds, "Consumer is behind"
+    assert channel.basic_ack.call_count == 0
+
+    wake = mrw._connection.ioloop.add_callback_threadsafe
+    if release == "stream dropped":
+        del stream
+        gc.collect()
+    else:
+        mrw.shutdown(cancel_futures=True)
+    assert not mrw._ack_holds
+    wake.assert_called_with(mrw._ack_received)
+    mrw._ack_received()
+    channel.basic_ack.assert_called_with(2, multiple=True)
+    mrw.shutdown(cancel_futures=True)
+
+
+def test_result_cache_completes_repeated_invocations_locally(fxexecutor):
+    fxc, fxe = fxexecutor
+    fxc.fx_serializer = FuncXSerializer()
+    fxc.create_batch.side_effect = lambda **_: Batch(serializer=fxc.fx_serializer)
+    fxc.batch_run.side_effect = lambda batch: [str(uuid.uuid4()) for _ in batch.tasks]
+    fxe.endpoint_id = "some_ep_id"
+    fxe.result_cache = MemoryResultCache()
+
+    fut = fxe.submit_to_registered_function("fn_id", args=(1,), kwargs={"a": 2})
+    try_assert(lambda: fut.task_id is not None)
+    assert fut._result_cache_key
+    fxe.result_cache.put(fut._result_cache_key, fxc.fx_serializer.serialize("x"))
+
+    same = fxe.submit_to_registered_function("fn_id", args=(1,), kwargs={"a": 2})
+    assert same.result(timeout=5) == "x"
+    assert same.task_id is None, "Not submitted"
+    assert same._result_cache_key == fut._result_cache_key
+
+    other = fxe.submit_to_registered_function("fn_id", args=(2,), kwargs={"a": 2})
+    try_assert(lambda: other.task_id is not None)
+    assert not other.done()
+    assert other._result_cache_key != fut._result_cache_key
+    assert fxe.result_cache.stats()["hits"] == 1
+
+    with fxe.bypass_result_cache():
+        bypassed = fxe.submit_to_registered_function(
+            "fn_id", args=(1,), kwargs={"a": 2}
+        )
+    try_assert(lambda: bypassed.task_id is not None)
+    assert not bypassed.done()
+    assert bypassed._result_cache_key == fut._result_cache_key, "Refreshes entry"
+
+    sent = sum(len(args[0].tasks) for args, _ in fxc.batch_run.call_args_list)
+    assert sent == 3
+
+
+def test_result_cache_key_derives_from_the_submitted_payload(fxexecutor, mocker):
+    fxc, fxe = fxexecutor
+    fxc.fx_serializer = FuncXSerializer()
+    serialize = mocker.spy(fxc.fx_serializer, "serialize")
+    fxc.create_batch.side_effect = lambda **_: Batch(serializer=fxc.fx_serializer)
+    fxc.batch_run.side_effect = lambda batch: [str(uuid.uuid4()) for _ in batch.tasks]
+    fxe.endpoint_id = "some_ep_id"
+    fxe.result_cache = MemoryResultCache()
+
+    fut = fxe.submit_to_registered_function("fn_id", args=(1,), kwargs={"a": 2})
+    try_assert(lambda: fut.task_id is not None)
+    assert serialize.call_count == 2, "Arguments are serialized once, for the batch"
+
+    (batch,), _ = fxc.batch_run.call_args
+    function_id, endpoint_id, payload = batch.tasks[0]
+    assert fut._result_cache_key == result_key(function_id, endpoint_id, payload)
+    assert fut._result_cache_key != result_key("other_fn_id", endpoint_id, payload)
+    assert fut._result_cache_key != result_key(function_id, "other_ep_id", payload)
+
+
+def test_resultwatcher_stores_successful_results_in_cache():
+    fxs = FuncXSerializer()
+    cache = MemoryResultCache()
+    futs = [FuncXFuture(task_id=str(uuid.uuid4())) for _ in range(2)]
+    futs[0]._result_cache_key, futs[1]._result_cache_key = "ok", "failed"
+    results = [
+        Result(task_id=futs[0].task_id, data=fxs.serialize(1)),
+        Result(
+            task_id=futs[1].task_id,
+            data="some error",
+            error_details=ResultErrorDetails(code="1234", user_message="failed"),
+        ),
+    ]
+
+    mrw = MockedResultWatcher(mock.Mock(), result_cache=cache)
+    mrw.funcx_executor.funcx_client.fx_serializer.deserialize = fxs.deserialize
+    for fut, res in zip(futs, results):
+        mrw._received_results[fut.task_id] = (mock.Mock(timestamp=None), res)
+    mrw.watch_for_task_results(futs)
+    mrw.start()
+    mrw._match_results_to_futures()
+
+    assert futs[0].result() == 1
+    try_assert(lambda: len(cache) == 1)  # stored by the cache writer thread
+    assert cache.get("ok") == results[0].data
+    assert cache.get("failed") is None, "Only successful results are memoized"
+    mrw.shutdown()
+
+
+@pytest.mark.parametrize("backend", ("memory", "disk"))
+def test_result_cache_evicts_by_size_and_ttl(tmp_path, monkeypatch, backend):
+    now = [1000.0]
+    monkeypatch.setattr("funcx.sdk.result_cache.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("funcx.sdk.result_cache.time.time", lambda: now[0])
+    if backend == "memory":
+        cache = MemoryResultCache(max_entries=2, max_bytes=10, ttl=60)
+    else:
+        cache = DiskResultCache(
+            str(tmp_path / "results.db"), max_entries=2, max_bytes=10, ttl=60
+        )
+
+    cache.put("a", "1234")
+    now[0] += 1
+    cache.put("b", "1234")
+    now[0] += 1
+    assert cache.get("a") == "1234"  # now the most recently read
+    now[0] += 1
+    cache.put("c", "1234")
+    assert cache.get("b") is None, "Least recently read is evicted"
+    assert cache.get("a") == "1234"
+
+    now[0] += 61
+    assert cache.get("c") is None, "Expired"
+
+    cache.put("big", "x" * 11)
+    assert cache.get("big") is None, "Larger than max_bytes on its own"
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["evictions"] >= 2
+
+
+def test_disk_result_cache_persists(tmp_path):
+    fname = str(tmp_path / "results.db")
+    cache = DiskResultCache(fname)
+    cache.put("key", b"some bytes")
+    cache.put("text", "some text")
+    cache.close()
+
+    cache = DiskResultCache(fname)
+    assert cache.get("key") == b"some bytes"
+    assert cache.get("text") == "some text"
+    stats = cache.stats()
+    assert (stats["size"], stats["bytes"]) == (2, 19), "Counted when opened"
+    cache.put("text", "more text")
+    assert cache.stats()["bytes"] == 19, "Replaced, not added"
+    cache.clear()
+    assert cache.get("key") is None
+    assert (cache.stats()["size"], cache.stats()["bytes"]) == (0, 0)
+    cache.close()
+
+
+def test_disk_result_cache_never_raises(tmp_path):
+    fname = tmp_path / "results.db"
+    fname.write_text("not a database")
+    cache = DiskResultCache(str(fname))
+    cache.put("key", b"some bytes")
+    assert cache.get("key") is None
+    cache.clear()
+    assert cache.stats()["misses"] == 1
+    cache.close()
+
+
+def test_in_flight_limit_counts_tasks_until_done_and_bytes_until_sent():
+    limit = InFlightLimit(max_tasks=2, max_bytes=100)
+    futs = [FuncXFuture() for _ in range(2)]
+    for fut in futs:
+        limit.acquire(fut, timeout=0)
+    assert not limit.wait(timeout=0)
+    with pytest.raises(InFlightLimitExceeded) as pyt_exc:
+        limit.acquire(FuncXFuture(), timeout=0.01)
+    assert "2 tasks (max: 2)" in str(pyt_exc.value)
+
+    futs[0].set_result(None)
+    assert limit.wait(timeout=0)
+
+    limit.charge(100)
+    assert not limit.wait(timeout=0), "Serialized bytes not yet sent"
+    limit.discharge(100)
+    assert limit.wait(timeout=0)
+
+    stats = limit.stats()
+    assert stats["tasks"] == 1
+    assert stats["bytes"] == 0
+    assert stats["waits"] == 3
+
+
+def test_in_flight_limit_release_wakes_acquire_behind_a_waiter():
+    limit = InFlightLimit(max_tasks=1)
+    fut = FuncXFuture()
+    limit.acquire(fut)
+
+    waiter = threading.Thread(target=limit.wait, daemon=True)  # takes no slot
+    waiter.start()
+    try_assert(lambda: limit.stats()["waits"] == 1)
+    acquired = []
+    acquirer = threading.Thread(
+        target=lambda: acquired.append(limit.acquire(FuncXFuture())), daemon=True
+    )
+    acquirer.start()
+    try_assert(lambda: limit.stats()["waits"] == 2)
+
+    fut.set_result(None)
+    acquirer.join(timeout=5)
+    waiter.join(timeout=5)
+    assert acquired, "The release is not lost on the wait()er"
+    assert limit.stats()["tasks"] == 1
+
+
+def test_submit_waits_for_in_flight_tasks(fxexecutor):
+    fxc, fxe = fxexecutor
+    fxc.register_function.return_value = "abc"
+    fxe.endpoint_id = "some_ep_id"
+    fxe.in_flight = InFlightLimit(max_tasks=2)
+    fxe.submit_timeout = 0
+
+    futs = [fxe.submit(noop), fxe.submit(noop)]
+    with pytest.raises(InFlightLimitExceeded):
+        fxe.submit(noop)
+
+    fxe.submit_timeout = None
+    blocked = []
+    submitter = threading.Thread(target=lambda: blocked.append(fxe.submit(noop)))
+    submitter.start()
+    time.sleep(0.05)
+    assert not blocked, "Waits for an in-flight task to complete"
+
+    futs[0].set_result(None)
+    submitter.join(timeout=5)
+    assert len(blocked) == 1
+    assert fxe.submission_stats()["in_flight"]["tasks"] == 2
+
+
+def test_shutdown_releases_waiting_submit(fxexecutor):
+    fxc, fxe = fxexecutor
+    fxc.register_function.return_value = "abc"
+    fxe.endpoint_id = "some_ep_id"
+    fxe.in_flight = InFlightLimit(max_tasks=1)
+    fxe.submit(noop)
+
+    errors = []
+
+    def submit():
+        try:
+            fxe.submit(noop)
+        except RuntimeError as e:
+            errors.append(e)
+
+    submitter = threading.Thread(target=submit)
+    submitter.start()
+    time.sleep(0.05)
+    fxe.shutdown(wait=False, cancel_futures=True)
+    submitter.join(timeout=5)
+    assert "is shutdown" in str(errors[0])
+
+
+def test_submitter_charges_bytes_until_batch_sent(fxexecutor):
+    fxc, fxe = fxexecutor
+    sent = threading.Event()
+    charged = []
+
+    def batch_run(batch):
+        charged.append(fxe.in_flight.bytes)
+        sent.wait(5)
+        return [str(uuid.uuid4()) for _ in batch.tasks]
+
+    fxc.create_batch.side_effect = lambda **_: Batch(serializer=FuncXSerializer())
+    fxc.batch_run.side_effect = batch_run
+    fxc.register_function.return_value = "abc"
+    fxe.endpoint_id = "some_ep_id"
+
+    fut = fxe.submit(noop, "x" * 1000)
+    try_assert(lambda: charged)
+    assert charged[0] > 1000
+    sent.set()
+    try_assert(lambda: fut.task_id)
+    try_assert(lambda: fxe.in_flight.bytes == 0)
+
+
+def test_wait_for_capacity_async(fxexecutor):
+    _, fxe = fxexecutor
+    fxe.in_flight = InFlightLimit(max_tasks=1)
+    fut = FuncXFuture()
+    fxe.in_flight.acquire(fut)
+
+    async def produce():
+        assert not await fxe.wait_for_capacity_async(timeout=0.01)
+        waiter = asyncio.ensure_future(fxe.wait_for_capacity_async())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        fut.set_result(None)
+        return await asyncio.wait_for(waiter, 5)
+
+    assert asyncio.run(produce())
+
+
+def _transition(state: TaskState, when_s: float, actor=ActorName.WORKER):
+    return TaskTransition(timestamp=int(when_s * 1e9), state=state, actor=actor)
+
+
+def test_task_timeline_merges_sdk_stages_and_transitions():
+    tl = TaskTimeline()
+    tl.stamp("submitted", 100.0)
+    tl.stamp("batch-posted", 100.5)
+    tl.stamp("submitted", 200.0)  # only the first stamp counts
+    tl.stamp("task-id-assigned", 101.0)
+    tl.add_transitions(
+        [
+            _transition(TaskState.EXEC_END, 104.0),
+            _transition(TaskState.EXEC_START, 103.0),
+            _transition(
+                TaskState.WAITING_FOR_NODES, 100.9, ActorName.INTERCHANGE
+            ),  # clock skew
+        ]
+    )
+    tl.stamp("result-arrived", 104.25)
+
+    assert [stage for stage, _ in tl.ordered()] == [
+        "submitted",
+        "batch-posted",
+        "task-id-assigned",
+        "waiting-for-nodes",
+        "execution-start",
+        "execution-end",
+        "result-arrived",
+    ]
+    durations = tl.durations()
+    assert durations["task-id-assigned->waiting-for-nodes"] == 0, "Skew clipped"
+    assert durations["execution-start->execution-end"] == pytest.approx(1.0)
+    assert durations["execution-end->result-arrived"] == pytest.approx(0.25)
+    assert durations["total"] == pytest.approx(4.25)
+    assert len(tl.to_dict()["transitions"]) == 3
+
+
+def test_latency_histogram_estimates_percentiles():
+    hist = LatencyHistogram()
+    for _ in range(90):
+        hist.record(0.001)
+    for _ in range(10):
+        hist.record(1.5)
+
+    stats = hist.stats()
+    assert stats["count"] == 100
+    assert stats["min_s"] == 0.001
+    assert stats["max_s"] == 1.5
+    assert 0.001 <= stats["p50_s"] < 0.002
+    assert 1.5 == stats["p99_s"], "No more than the maximum seen"
+    assert sum(n for _, n in stats["buckets"]) == 100
+
+    hist.record(1e6)
+    assert hist.stats()["buckets"][-1] == ("+Inf", 1), "Beyond the largest bound"
+    json.dumps(hist.stats())
+
+    empty = LatencyHistogram().stats()
+    assert empty["count"] == 0
+    assert empty["min_s"] is None and empty["mean_s"] is None
+    assert empty["p50_s"] is None
+    json.dumps(empty, allow_nan=False)
+
+
+def test_executor_records_task_timelines(fxexecutor):
+    fxc, fxe = fxexecutor
+    fxs = FuncXSerializer()
+    fxc.fx_serializer = fxs
+    fxc.batch_run.side_effect = lambda batch: [str(uuid.uuid4()) for _ in batch.tasks]
+    fxc.create_batch.side_effect = lambda **_: Batch(serializer=fxs)
+    fxc.register_function.return_value = "abc"
+    fxe.endpoint_id = "some_ep_id"
+    fxe.latency = LatencyRecorder()
+
+    fut = fxe.submit(noop)
+    try_assert(lambda: fut.task_id and fxe._result_watcher)
+    now = time.time()
+    res = Result(
+        task_id=fut.task_id,
+        data=fxs.serialize("ok"),
+        task_statuses=[
+            _transition(TaskState.EXEC_START, now),
+            _transition(TaskState.EXEC_END, now),
+        ],
+    )
+    mrw = fxe._result_watcher
+    mrw.latency = fxe.latency  # as passed by _new_result_watcher()
+    mrw._received_results[fut.task_id] = (None, res)
+    mrw._match_results_to_futures()
+
+    assert fut.result(timeout=5) == "ok"
+    assert [stage for stage, _ in fut.timeline.ordered()] == [
+        "submitted",
+        "batch-posted",
+        "task-id-assigned",
+        "execution-start",
+        "execution-end",
+        "result-arrived",
+        "deserialized",
+    ]
+    stats = fxe.latency_stats()
+    assert stats["total"]["count"] == 1
+    assert stats["result-arrived->deserialized"]["count"] == 1
+
+
+@pytest.mark.parametrize("spilled", (False, True))
+def test_resultwatcher_stamps_results_when_their_messages_arrive(spilled):
+    fxs = FuncXSerializer()
+    fut = FuncXFuture(task_id=str(uuid.uuid4()))
+    fut.timeline = TaskTimeline()
+    max_unmatched_bytes = 0 if spilled else 1024 * 1024
+    mrw = MockedResultWatcher(
+        mock.Mock(), latency=LatencyRecorder(), max_unmatched_bytes=max_unmatched_bytes
+    )
+    mrw.funcx_executor.funcx_client.fx_serializer.deserialize = fxs.deserialize
+    mrw.start()
+
+    before = time.time()
+    res = Result(task_id=fut.task_id, data=fxs.serialize("ok"))
+    unknown = Result(task_id=str(uuid.uuid4()), data=fxs.serialize("?"))
+    for tag, r in enumerate((res, unknown), start=1):
+        mrw._on_message(
+            mrw._channel, mock.Mock(delivery_tag=tag), None, messagepack.pack(r)
+        )
+    assert len(mrw._spilled) == (2 if spilled else 0)
+    assert len(mrw._arrived) == (0 if spilled else 2), "Only with held results"
+
+    time.sleep(0.05)
+    watched = time.time()
+    mrw.watch_for_task_results([fut])  # the result arrived before its future
+    mrw._match_results_to_futures()
+
+    assert fut.result(timeout=5) == "ok"
+    assert before <= fut.timeline.stages["result-arrived"] < watched
+    assert fut.task_id not in mrw._arrived
+    mrw.shutdown()
+
+
+def test_executor_does_not_track_latency_by_default(fxexecutor):
+    fxc, fxe = fxexecutor
+    fxc.register_function.return_value = "abc"
+    fxe.endpoint_id = "some_ep_id"
+
+    assert fxe.submit(noop).timeline is None
+    assert fxe.latency_stats() == {}